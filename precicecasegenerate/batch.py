@@ -0,0 +1,191 @@
+"""
+This file contains methods to generate many preCICE cases in one process.
+All cases share the imported modules and the compiled topology schema, so only the first case pays their setup cost.
+Since the cases are independent, they can also be spread across several worker processes.
+"""
+
+import glob
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from precicecasegenerate import cli_helper
+
+if TYPE_CHECKING:
+    from precicecasegenerate.case_cache import CaseCache
+
+logger = logging.getLogger(__name__)
+
+
+class CaseResult:
+    """
+    A class to represent the outcome of generating a single case of a batch.
+    """
+
+    def __init__(self, name: str, input_file: Path, output_directory: Path, return_value: int, duration: float,
+                 process_id: int):
+        """
+        Initialize a CaseResult.
+        :param name: The name of the case, which is also the name of its output subfolder.
+        :param input_file: The path to the topology file of the case.
+        :param output_directory: The directory the case was generated in.
+        :param return_value: 0 if the case was generated successfully, 1 otherwise.
+        :param duration: The wall time needed to generate the case in seconds.
+        :param process_id: The ID of the process that generated the case.
+        """
+        self.name = name
+        self.input_file = input_file
+        self.output_directory = output_directory
+        self.return_value = return_value
+        self.duration = duration
+        self.process_id = process_id
+
+
+def collect_topology_files(source: str) -> list[Path]:
+    """
+    Collect the topology files of a batch.
+    The source can be one of the following:
+
+    - A directory, which is searched recursively for YAML and JSON files. Adapter configs and hidden files,
+      e.g., of cases generated in the directory, are skipped.
+    - A manifest file, which lists one topology file per line. Relative paths are relative to the manifest,
+      empty lines and lines starting with "#" are ignored.
+    - A glob pattern, such as "cases/**/topology.yaml".
+    :param source: The directory, manifest file or glob pattern.
+    :return: A sorted list of paths to topology files.
+    """
+    source_path: Path = Path(source)
+    if source_path.is_dir():
+        topology_files = [path for path in source_path.rglob("*")
+                          if path.suffix.lower() in cli_helper.TOPOLOGY_FILE_SUFFIXES
+                          and path.name != cli_helper.ADAPTER_CONFIG_FILE_NAME and not path.name.startswith(".")]
+    elif source_path.is_file() and source_path.suffix.lower() not in cli_helper.TOPOLOGY_FILE_SUFFIXES:
+        topology_files = []
+        for line in source_path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                topology_files.append(source_path.parent / line)
+    else:
+        topology_files = [Path(path) for path in glob.glob(source, recursive=True)]
+    topology_files = sorted(path.resolve() for path in topology_files)
+    logger.debug(f"Found {len(topology_files)} topology files in {source}.")
+    return topology_files
+
+
+def get_case_names(topology_files: list[Path]) -> dict[Path, str]:
+    """
+    Determine a unique name for each case, which is used as its output subfolder.
+    The name is the path of the topology file relative to the common parent directory of all topology files,
+    without the suffix. If the file is named like the default topology file, only its directory is used,
+    e.g., "tutorial1/topology.yaml" becomes "tutorial1".
+    :param topology_files: The paths to the topology files.
+    :return: A dict mapping topology files to case names.
+    """
+    if not topology_files:
+        return {}
+    common_parent: Path = topology_files[0].parent
+    for topology_file in topology_files:
+        while common_parent not in topology_file.parents:
+            common_parent = common_parent.parent
+
+    default_stem: str = Path(cli_helper.DEFAULT_TOPOLOGY_NAME).stem
+    case_names: dict[Path, str] = {}
+    for topology_file in topology_files:
+        relative_path: Path = topology_file.relative_to(common_parent).with_suffix("")
+        if relative_path.name == default_stem and len(relative_path.parts) > 1:
+            relative_path = relative_path.parent
+        case_names[topology_file] = relative_path.as_posix()
+    return case_names
+
+
+def generate_batch(topology_files: list[Path], output_root: Path, jobs: int = 1,
+                   cache: "CaseCache | None" = None, validate_adapter_configs: bool = True) -> list[CaseResult]:
+    """
+    Generate a case for each topology file, each in its own subfolder of the output root.
+    A failing case does not abort the batch.
+    With more than one job, the cases are distributed across a pool of worker processes.
+    The workers send their log records to this process, which writes them to its log file and console.
+    :param topology_files: The paths to the topology files.
+    :param output_root: The root directory for the generated cases.
+    :param jobs: The number of worker processes. With one job, all cases are generated in the current process.
+    :param cache: A CaseCache to restore and store the cases, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :return: A list with the result of each case, in the order of the topology files.
+    """
+    case_names: dict[Path, str] = get_case_names(topology_files)
+    output_directories: list[Path] = [output_root / case_name for case_name in case_names.values()]
+    caches: list["CaseCache | None"] = [cache] * len(case_names)
+    validations: list[bool] = [validate_adapter_configs] * len(case_names)
+    jobs = min(jobs, len(case_names))
+    if jobs <= 1:
+        return list(map(_generate_case, case_names.keys(), case_names.values(), output_directories, caches,
+                        validations))
+
+    # Imported here, since importing multiprocessing noticeably slows down the startup of the CLI
+    from concurrent.futures import ProcessPoolExecutor
+    from precicecasegenerate.logging_setup import start_worker_logging, setup_worker_logging, stop_worker_logging
+
+    logger.info(f"Generating {len(case_names)} cases with {jobs} worker processes.")
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=setup_worker_logging,
+                                 initargs=start_worker_logging()) as executor:
+            # Hand out cases one at a time, since their durations may differ a lot
+            return list(executor.map(_generate_case, case_names.keys(), case_names.values(), output_directories,
+                                     caches, validations))
+    finally:
+        # Write all records of the workers before the summary is logged
+        stop_worker_logging()
+
+
+def _generate_case(topology_file: Path, case_name: str, output_directory: Path,
+                   cache: "CaseCache | None" = None, validate_adapter_configs: bool = True) -> CaseResult:
+    """
+    Generate a single case of a batch and measure the time needed.
+    Exceptions are logged instead of raised, such that they do not abort the batch.
+    :param topology_file: The path to the topology file.
+    :param case_name: The name of the case.
+    :param output_directory: The directory to generate the case in.
+    :param cache: A CaseCache to restore and store the case, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :return: The result of the case.
+    """
+    # Imported here, since the CLI module imports this module
+    from precicecasegenerate.cli import generate_case
+
+    logger.info(f"Generating case {case_name} from {topology_file}.")
+    start: float = time.perf_counter()
+    try:
+        return_value: int = generate_case(topology_file, output_directory, cache=cache,
+                                          validate_adapter_configs=validate_adapter_configs)
+    except Exception as e:
+        logger.exception(f"Generating case {case_name} failed: {e}")
+        return_value = 1
+    return CaseResult(case_name, topology_file, output_directory, return_value, time.perf_counter() - start,
+                      os.getpid())
+
+
+def log_batch_summary(results: list[CaseResult], wall_time: float | None = None) -> int:
+    """
+    Log the status and timing of every case of a batch, followed by a summary.
+    :param results: The results of the cases.
+    :param wall_time: The wall time needed for the whole batch in seconds, if known.
+    :return: 0 if all cases were generated successfully, 1 otherwise.
+    """
+    processes: set[int] = {result.process_id for result in results}
+    for result in results:
+        status: str = "ok" if result.return_value == 0 else "FAILED"
+        # Only name the process if cases were generated by several processes
+        process: str = f"  [process {result.process_id}]" if len(processes) > 1 else ""
+        logger.info(f"{status:>6}  {result.duration:8.3f}s  {result.name}{process}")
+    failed: int = sum(1 for result in results if result.return_value != 0)
+    total_duration: float = sum(result.duration for result in results)
+    summary: str = f"Generated {len(results) - failed} of {len(results)} cases in {total_duration:.3f}s"
+    if wall_time is not None:
+        summary += f" ({wall_time:.3f}s wall time)"
+    logger.info(f"{summary}.")
+    if failed:
+        logger.error(f"{failed} cases failed: {', '.join(r.name for r in results if r.return_value != 0)}.")
+        return 1
+    return 0
@@ -0,0 +1,257 @@
+"""
+This file contains a benchmark measuring how each stage of the case generation scales with the size of the topology.
+Topologies of increasing size are synthesized, every stage is timed separately and the results are checked against
+regression thresholds, such that a stage that suddenly scales quadratically is noticed.
+
+Run it with "python -m precicecasegenerate.benchmark.scaling_benchmark --help".
+"""
+
+import argparse
+import json
+import logging
+import math
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from precicecasegenerate import cli_helper
+from precicecasegenerate.benchmark.synthetic_topology import generate_topology, topology_to_yaml
+
+logger = logging.getLogger(__name__)
+
+# The stages of the case generation, in the order they are run
+STAGES: list[str] = [
+    "read",
+    "validate",
+    "check",
+    "node_creation",
+    "config_file",
+    "adapter_configs",
+    "utility_files",
+    "write",
+]
+# Key of the sum of all stages in the results
+TOTAL: str = "total"
+
+DEFAULT_PARTICIPANTS: list[int] = [4, 8, 16, 32, 64]
+DEFAULT_EXCHANGES_PER_PARTICIPANT: int = 4
+DEFAULT_REPETITIONS: int = 3
+# Stages faster than this in seconds are dominated by noise, so their scaling is not checked
+MIN_MEASURABLE_TIME: float = 0.002
+# All stages are expected to scale about linearly with the number of exchanges
+DEFAULT_THRESHOLDS: dict[str, dict[str, float]] = {
+    "max_scaling_exponent": {stage: 1.5 for stage in STAGES + [TOTAL]},
+    "max_seconds_per_exchange": {},
+}
+
+
+def time_stages(topology_str: str) -> dict[str, float]:
+    """
+    Generate a case from the given topology and measure the wall time of every stage.
+    The stages are run like in cli.create_case, without the cache, and the files are written to a temporary directory.
+    :param topology_str: The content of a topology file.
+    :return: A dict mapping the stages to their duration in seconds.
+    """
+    from precicecasegenerate import helper
+    from precicecasegenerate.input_handler.topology_reader import TopologyReader
+    from precicecasegenerate.node_creator import NodeCreator
+    from precicecasegenerate.file_creators.case_writer import CaseWriter, DirectoryWriter
+    from precicecasegenerate.file_creators.config_creator import ConfigCreator
+    from precicecasegenerate.file_creators.adapter_config_creator import AdapterConfigCreator
+    from precicecasegenerate.file_creators.utility_file_creator import UtilityFileCreator
+
+    durations: dict[str, float] = {}
+
+    def timed(stage: str, function: Callable):
+        start: float = time.perf_counter()
+        result = function()
+        durations[stage] = time.perf_counter() - start
+        return result
+
+    helper.reset_uniquifiers()
+    topology_reader: TopologyReader = timed("read", lambda: TopologyReader(topology_str=topology_str))
+    if timed("validate", topology_reader.validate_topology) != 0 or timed("check", topology_reader.check_topology):
+        raise ValueError("The topology is invalid.")
+    node_creator: NodeCreator = timed("node_creation", lambda: NodeCreator(topology_reader.get_topology()))
+
+    writer: CaseWriter = CaseWriter()
+    timed("config_file", lambda: ConfigCreator(node_creator.get_nodes()).create_config_file(
+        writer, filename=cli_helper.PRECICE_CONFIG_FILE_NAME))
+    participant_solver_map: dict = node_creator.get_participant_solver_map()
+    timed("adapter_configs", lambda: AdapterConfigCreator(
+        participant_solver_map, node_creator.get_mesh_patch_map(),
+        precice_config_filename=cli_helper.PRECICE_CONFIG_FILE_NAME).create_adapter_configs(writer))
+    timed("utility_files", lambda: UtilityFileCreator(participant_solver_map).create_utility_files(writer))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        def write_files() -> None:
+            directory_writer: DirectoryWriter = DirectoryWriter(Path(temp_dir))
+            for relative_path, content in writer.contents.items():
+                directory_writer.write_file(relative_path, content,
+                                            executable=relative_path in writer.executable_files)
+            directory_writer.close()
+
+        timed("write", write_files)
+    return durations
+
+
+def run_benchmark(participant_counts: list[int], exchanges_per_participant: int = DEFAULT_EXCHANGES_PER_PARTICIPANT,
+                  repetitions: int = DEFAULT_REPETITIONS, strong_ratio: float = 0.3, patch_reuse: float = 0.5,
+                  duplicate_data: float = 0.3, seed: int = 0) -> dict:
+    """
+    Time every stage of the case generation for synthetic topologies of the given sizes.
+    The minimum of all repetitions is reported, since it is least affected by other processes.
+    :param participant_counts: The numbers of participants of the topologies, in increasing order.
+    :param exchanges_per_participant: The number of exchanges per participant.
+    :param repetitions: The number of times each topology is generated.
+    :param strong_ratio: The fraction of exchanges that are strong.
+    :param patch_reuse: The probability that an exchange reuses a patch of a participant.
+    :param duplicate_data: The probability that an exchange reuses a data name.
+    :param seed: The seed of the synthetic topologies.
+    :return: The results as a JSON-serializable dict.
+    """
+    from precicecasegenerate.case_cache import get_package_version
+
+    results: dict = {
+        "version": get_package_version(),
+        "python": platform.python_version(),
+        "parameters": {
+            "exchanges_per_participant": exchanges_per_participant,
+            "repetitions": repetitions,
+            "strong_ratio": strong_ratio,
+            "patch_reuse": patch_reuse,
+            "duplicate_data": duplicate_data,
+            "seed": seed,
+        },
+        "scenarios": [],
+    }
+    # The generation logs a lot for large topologies, which would distort the timings
+    logging.disable(logging.WARNING)
+    try:
+        # Import all modules and compile the schema before measuring
+        time_stages(topology_to_yaml(generate_topology(2, 2, seed=seed)))
+        for participants in participant_counts:
+            exchanges: int = participants * exchanges_per_participant
+            topology_str: str = topology_to_yaml(generate_topology(
+                participants, exchanges, strong_ratio=strong_ratio, patch_reuse=patch_reuse,
+                duplicate_data=duplicate_data, seed=seed))
+            runs: list[dict[str, float]] = [time_stages(topology_str) for _ in range(repetitions)]
+            durations: dict[str, float] = {stage: min(run[stage] for run in runs) for stage in STAGES}
+            durations[TOTAL] = min(sum(run.values()) for run in runs)
+            results["scenarios"].append({"participants": participants, "exchanges": exchanges, "seconds": durations})
+    finally:
+        logging.disable(logging.NOTSET)
+    results["scaling_exponents"] = get_scaling_exponents(results["scenarios"])
+    return results
+
+
+def get_scaling_exponents(scenarios: list[dict]) -> dict[str, float | None]:
+    """
+    Estimate how each stage scales with the number of exchanges.
+    The exponent k of time ~ exchanges^k is computed between every two consecutive scenarios, and the largest one is
+    reported. Linear stages have an exponent of about 1, quadratic stages of about 2.
+    :param scenarios: The scenarios of the results of run_benchmark(), in increasing size.
+    :return: A dict mapping the stages to their largest exponent, or to None if the stage was too fast to measure.
+    """
+    exponents: dict[str, float | None] = {}
+    for stage in STAGES + [TOTAL]:
+        stage_exponents: list[float] = []
+        for smaller, larger in zip(scenarios, scenarios[1:]):
+            smaller_time: float = smaller["seconds"][stage]
+            larger_time: float = larger["seconds"][stage]
+            if (smaller_time < MIN_MEASURABLE_TIME or larger_time < MIN_MEASURABLE_TIME
+                    or larger["exchanges"] <= smaller["exchanges"]):
+                continue
+            stage_exponents.append(math.log(larger_time / smaller_time)
+                                   / math.log(larger["exchanges"] / smaller["exchanges"]))
+        exponents[stage] = round(max(stage_exponents), 3) if stage_exponents else None
+    return exponents
+
+
+def check_thresholds(results: dict, thresholds: dict[str, dict[str, float]]) -> list[str]:
+    """
+    Check the results of run_benchmark() against regression thresholds.
+    :param results: The results of run_benchmark().
+    :param thresholds: A dict with the optional keys "max_scaling_exponent", which maps stages to the largest allowed
+        scaling exponent, and "max_seconds_per_exchange", which maps stages to the largest allowed time per exchange.
+    :return: A message for every violated threshold.
+    """
+    violations: list[str] = []
+    for stage, max_exponent in thresholds.get("max_scaling_exponent", {}).items():
+        exponent: float | None = results["scaling_exponents"].get(stage)
+        if exponent is not None and exponent > max_exponent:
+            violations.append(f"Stage {stage} scales with exchanges^{exponent:.2f}, "
+                              f"which exceeds the threshold of {max_exponent}.")
+    for stage, max_seconds in thresholds.get("max_seconds_per_exchange", {}).items():
+        for scenario in results["scenarios"]:
+            seconds: float = scenario["seconds"][stage] / scenario["exchanges"]
+            if seconds > max_seconds:
+                violations.append(f"Stage {stage} takes {seconds * 1000:.3f} ms per exchange with "
+                                  f"{scenario['exchanges']} exchanges, which exceeds the threshold of "
+                                  f"{max_seconds * 1000:.3f} ms.")
+    return violations
+
+
+def log_results(results: dict) -> None:
+    """
+    Log a table with the duration of every stage for every scenario, followed by the scaling exponents.
+    :param results: The results of run_benchmark().
+    :return: None
+    """
+    columns: list[str] = STAGES + [TOTAL]
+    logger.info(f"{'participants':>12} {'exchanges':>9} " + " ".join(f"{column:>15}" for column in columns))
+    for scenario in results["scenarios"]:
+        logger.info(f"{scenario['participants']:>12} {scenario['exchanges']:>9} "
+                    + " ".join(f"{scenario['seconds'][column] * 1000:>13.2f}ms" for column in columns))
+    exponents: list[str] = [f"{exponent:>15.2f}" if exponent is not None else f"{'-':>15}"
+                            for exponent in (results["scaling_exponents"][column] for column in columns)]
+    logger.info(f"{'scaling exponent':>22} " + " ".join(exponents))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure how the stages of the case generation scale with the size "
+                                                 "of synthetic topologies.")
+    parser.add_argument("--participants", type=cli_helper.positive_integer, nargs="+", default=DEFAULT_PARTICIPANTS,
+                        help="The numbers of participants of the synthetic topologies.")
+    parser.add_argument("--exchanges-per-participant", type=cli_helper.positive_integer,
+                        default=DEFAULT_EXCHANGES_PER_PARTICIPANT, help="The number of exchanges per participant.")
+    parser.add_argument("--repetitions", type=cli_helper.positive_integer, default=DEFAULT_REPETITIONS,
+                        help="The number of times each topology is generated. The fastest time is reported.")
+    parser.add_argument("--strong-ratio", type=float, default=0.3, help="The fraction of strong exchanges.")
+    parser.add_argument("--patch-reuse", type=float, default=0.5,
+                        help="The probability that an exchange reuses a patch of a participant.")
+    parser.add_argument("--duplicate-data", type=float, default=0.3,
+                        help="The probability that an exchange reuses a data name.")
+    parser.add_argument("--seed", type=int, default=0, help="The seed of the synthetic topologies.")
+    parser.add_argument("--thresholds", type=Path, default=None,
+                        help="A JSON file with the keys max_scaling_exponent and max_seconds_per_exchange, "
+                             "each mapping stages to thresholds. Defaults to a scaling exponent of 1.5 for all stages.")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    from precicecasegenerate.logging_setup import setup_logging
+
+    setup_logging(log_file=False)
+    thresholds: dict[str, dict[str, float]] = DEFAULT_THRESHOLDS
+    if args.thresholds is not None:
+        thresholds = json.loads(args.thresholds.read_text(encoding="utf-8"))
+
+    results: dict = run_benchmark(sorted(set(args.participants)), args.exchanges_per_participant, args.repetitions,
+                                  args.strong_ratio, args.patch_reuse, args.duplicate_data, args.seed)
+    results["thresholds"] = thresholds
+    results["violations"] = check_thresholds(results, thresholds)
+    log_results(results)
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=4), encoding="utf-8")
+        logger.info(f"Results written to {args.output}.")
+
+    for violation in results["violations"]:
+        logger.error(violation)
+    return 1 if results["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+This file contains methods to synthesize topologies of arbitrary size, e.g., to measure how the case generation scales.
+The topologies are valid and deterministic for a given seed, such that benchmark results are comparable between runs.
+"""
+
+import io
+import random
+
+from ruamel.yaml import YAML
+
+# Solvers are assigned to the participants in turn
+SOLVERS: list[str] = ["Fluid-Solver", "Solid-Solver", "Heat-Solver"]
+# Data names with a known kind and type, see helper.EXTENSIVE_DATA and helper.INTENSIVE_DATA
+DATA_NAMES: list[str] = ["Force", "Displacement", "Temperature", "Heat-Flux", "Pressure", "Velocity"]
+DATA_TYPES: list[str] = ["scalar", "vector"]
+
+
+def generate_topology(participants: int, exchanges: int, strong_ratio: float = 0.3, patch_reuse: float = 0.5,
+                      duplicate_data: float = 0.3, dimensionality: int = 3, seed: int = 0) -> dict:
+    """
+    Synthesize a valid topology with the given number of participants and exchanges.
+    Exchanges are spread randomly across pairs of participants, such that some pairs exchange several data,
+    possibly in both directions.
+    :param participants: The number of participants, at least two.
+    :param exchanges: The number of exchanges.
+    :param strong_ratio: The fraction of exchanges that are strong. Strong exchanges in both directions between
+        two participants lead to implicit coupling-schemes.
+    :param patch_reuse: The probability that an exchange uses an existing patch of a participant instead of a new one.
+    :param duplicate_data: The probability that an exchange uses a data name of a previous exchange instead of a new one.
+        Data names are only reused in the same direction between participants and with the same data type,
+        since the topology would be ambiguous otherwise.
+    :param dimensionality: The dimensionality of all participants.
+    :param seed: The seed of the random numbers, such that the same arguments always result in the same topology.
+    :return: The topology as a dict, as read by the TopologyReader.
+    """
+    if participants < 2:
+        raise ValueError(f"A topology needs at least two participants, but {participants} were requested.")
+    rng: random.Random = random.Random(seed)
+
+    participant_names: list[str] = [f"Participant{index}" for index in range(participants)]
+    topology: dict = {
+        "participants": [{"name": name, "solver": SOLVERS[index % len(SOLVERS)], "dimensionality": dimensionality}
+                         for index, name in enumerate(participant_names)],
+        "exchanges": [],
+    }
+
+    patches: dict[str, list[str]] = {name: [] for name in participant_names}
+    # The type of every data name used so far
+    data_name_types: dict[str, str] = {}
+    # Data names used in each direction between two participants
+    directed_data_names: dict[tuple[str, str], set[str]] = {}
+    # Exchanges are unique by their participants, data name and type. New data names are always unique,
+    # so only reused data names can be rejected and any number of exchanges can be generated
+    exchange_keys: set[tuple[str, str, str, str]] = set()
+
+    while len(topology["exchanges"]) < exchanges:
+        from_participant, to_participant = rng.sample(participant_names, 2)
+        reverse_data_names: set[str] = directed_data_names.get((to_participant, from_participant), set())
+        reusable_data_names: list[str] = [data_name for data_name in data_name_types
+                                          if data_name not in reverse_data_names]
+        if reusable_data_names and rng.random() < duplicate_data:
+            data_name: str = rng.choice(reusable_data_names)
+        else:
+            data_name = f"{rng.choice(DATA_NAMES)}{len(data_name_types)}"
+        data_type: str = data_name_types.setdefault(data_name, rng.choice(DATA_TYPES))
+        exchange_type: str = "strong" if rng.random() < strong_ratio else "weak"
+        exchange_key: tuple[str, str, str, str] = (from_participant, to_participant, data_name, data_type)
+        if exchange_key in exchange_keys:
+            continue
+        exchange_keys.add(exchange_key)
+        directed_data_names.setdefault((from_participant, to_participant), set()).add(data_name)
+
+        topology["exchanges"].append({
+            "from": from_participant,
+            "from-patch": _choose_patch(rng, patches[from_participant], patch_reuse),
+            "to": to_participant,
+            "to-patch": _choose_patch(rng, patches[to_participant], patch_reuse),
+            "data": data_name,
+            "data-type": data_type,
+            "type": exchange_type,
+        })
+    return topology
+
+
+def _choose_patch(rng: random.Random, patches: list[str], patch_reuse: float) -> str:
+    """
+    Choose an existing patch of a participant or add a new one.
+    :param rng: The random number generator.
+    :param patches: The patches of the participant, which is extended by new patches.
+    :param patch_reuse: The probability that an existing patch is chosen.
+    :return: The name of the patch.
+    """
+    if patches and rng.random() < patch_reuse:
+        return rng.choice(patches)
+    patches.append(f"interface-{len(patches)}")
+    return patches[-1]
+
+
+def topology_to_yaml(topology: dict) -> str:
+    """
+    Serialize a topology in the block style of hand-written topology files.
+    :param topology: The topology as a dict.
+    :return: The content of a topology file.
+    """
+    yaml = YAML(typ="safe")
+    yaml.default_flow_style = False
+    yaml.sort_base_mapping_type_on_output = False
+    stream: io.StringIO = io.StringIO()
+    yaml.dump(topology, stream)
+    return stream.getvalue()
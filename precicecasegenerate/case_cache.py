@@ -0,0 +1,192 @@
+"""
+This file contains an on-disk cache for generated cases.
+A cache entry holds all files of a case and is keyed by a hash of the normalized topology, the version of this
+program and of the dependencies shaping its output, and the content of its source files, such that regenerating the same topology skips the node creation and
+file creation entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from functools import cache
+from importlib import metadata
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Name of the package whose version is part of every cache key
+PACKAGE_NAME: str = "precice-case-generate"
+# Runtime dependencies whose versions are part of every cache key, since they define the nodes, enums and schemas
+# the generated files are created from
+DEPENDENCY_NAMES: tuple[str, ...] = ("precice-config-graph", "precice-adapter-schema")
+# Directory of the package whose files are part of every cache key
+PACKAGE_DIRECTORY: Path = Path(__file__).parent
+# Files that are not part of the package fingerprint, since they are derived from the source files
+FINGERPRINT_IGNORED_SUFFIXES: tuple[str, ...] = (".pyc", ".pyo")
+# Suffix of the files holding the cache entries
+CACHE_ENTRY_SUFFIX: str = ".zip"
+# Maximum total size of all cache entries in bytes
+DEFAULT_MAX_CACHE_SIZE: int = 100 * 1024 * 1024
+
+
+def get_package_version(package_name: str = PACKAGE_NAME) -> str:
+    """
+    Return the version of an installed package.
+    :param package_name: The name of the package, this program by default.
+    :return: The version as a string, or "unknown" if the package is not installed.
+    """
+    try:
+        return metadata.version(package_name)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def get_package_fingerprint() -> str:
+    """
+    Return a hash of all source files, templates and schemas of the package.
+    The version alone does not identify the generator in a development install, where it stays the same while the
+    code changes. The fingerprint is computed once per process.
+    :return: A hex digest of the relative paths and contents of all files in the package directory.
+    """
+    fingerprint = hashlib.sha256()
+    for path in sorted(PACKAGE_DIRECTORY.rglob("*")):
+        if not path.is_file() or "__pycache__" in path.parts or path.suffix in FINGERPRINT_IGNORED_SUFFIXES:
+            continue
+        fingerprint.update(path.relative_to(PACKAGE_DIRECTORY).as_posix().encode("utf-8"))
+        fingerprint.update(b"\0")
+        fingerprint.update(path.read_bytes())
+        fingerprint.update(b"\0")
+    return fingerprint.hexdigest()
+
+
+class CaseCache:
+    """
+    A class to represent a directory of cached cases.
+    Each entry is a single zip file named after its key, which is replaced atomically when it is stored.
+    The modification time of an entry is updated whenever it is loaded, such that the least recently used entries
+    are evicted first once the total size of all entries exceeds the maximum size.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_CACHE_SIZE):
+        """
+        Initialize a CaseCache object.
+        :param directory: The directory holding the cache entries. It is created when the first entry is stored.
+        :param max_size: The maximum total size of all cache entries in bytes.
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    def get_key(self, topology: dict) -> str:
+        """
+        Return the cache key of the given topology.
+        The topology is normalized by serializing it with sorted keys, such that formatting, comments and the order
+        of keys in the topology file do not change the key.
+        :param topology: The validated topology dict, before it is modified by the NodeCreator.
+        :return: A hex digest identifying the topology, the version and source files of this program and the versions
+            of its dependencies.
+        """
+        normalized_topology: str = json.dumps(topology, sort_keys=True, separators=(",", ":"), default=str)
+        key_hash = hashlib.sha256()
+        key_hash.update(get_package_version().encode("utf-8"))
+        key_hash.update(b"\0")
+        key_hash.update(get_package_fingerprint().encode("utf-8"))
+        key_hash.update(b"\0")
+        for dependency_name in DEPENDENCY_NAMES:
+            key_hash.update(f"{dependency_name}=={get_package_version(dependency_name)}".encode("utf-8"))
+            key_hash.update(b"\0")
+        key_hash.update(normalized_topology.encode("utf-8"))
+        return key_hash.hexdigest()
+
+    def _get_entry_path(self, key: str) -> Path:
+        """
+        Return the path of the cache entry with the given key.
+        :param key: The key of the entry.
+        :return: The path of the zip file holding the entry.
+        """
+        return self.directory / f"{key}{CACHE_ENTRY_SUFFIX}"
+
+    def load(self, key: str) -> tuple[dict[str, bytes], set[str]] | None:
+        """
+        Load the files of the cache entry with the given key and mark the entry as recently used.
+        :param key: The key of the entry.
+        :return: A dict mapping relative file paths to their content and the set of paths of executable files,
+            or None if there is no valid entry.
+        """
+        entry_path: Path = self._get_entry_path(key)
+        try:
+            with zipfile.ZipFile(entry_path) as archive:
+                files: dict[str, bytes] = {}
+                executable_files: set[str] = set()
+                for info in archive.infolist():
+                    files[info.filename] = archive.read(info)
+                    # The upper 16 bits hold the Unix file permissions
+                    if info.external_attr >> 16 & 0o111:
+                        executable_files.add(info.filename)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            logger.debug("No cache entry for key %s.", key)
+            return None
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.warning(f"Removing corrupt cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+        logger.debug("Loaded %d files from cache entry %s.", len(files), entry_path)
+        return files, executable_files
+
+    def store(self, key: str, files: dict[str, bytes], executable_files: set[str] = frozenset()) -> None:
+        """
+        Store the given files under the given key and evict the least recently used entries if the cache is too large.
+        Failing to store an entry is logged, but does not raise an error, since the cache is only an optimization.
+        :param key: The key of the entry.
+        :param files: A dict mapping relative file paths to their content.
+        :param executable_files: The paths of the files that are executable.
+        :return: None
+        """
+        entry_path: Path = self._get_entry_path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, such that concurrent readers never see a partial entry
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as archive:
+                    for relative_path, content in sorted(files.items()):
+                        info = zipfile.ZipInfo(relative_path)
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        info.external_attr = (0o755 if relative_path in executable_files else 0o644) << 16
+                        archive.writestr(info, content)
+                os.replace(temp_path, entry_path)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not store cache entry {entry_path}: {e}")
+            return
+        logger.debug("Stored %d files in cache entry %s.", len(files), entry_path)
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used entries until the total size of all entries is at most the maximum size.
+        :return: None
+        """
+        entries: list[tuple[int, int, Path]] = []
+        for entry_path in self.directory.glob(f"*{CACHE_ENTRY_SUFFIX}"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                # Evicted by another process in the meantime
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry_path))
+
+        total_size: int = sum(size for _, size, _ in entries)
+        # Oldest entries first
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_size -= size
+            logger.debug("Evicted cache entry %s.", entry_path)
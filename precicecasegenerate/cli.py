@@ -1,17 +1,20 @@
 import sys
-import shutil
+import time
 import logging
 import argparse
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from precicecasegenerate import helper
 from precicecasegenerate import cli_helper
-from precicecasegenerate.logging_setup import setup_logging
-from precicecasegenerate.input_handler.topology_reader import TopologyReader
-from precicecasegenerate.node_creator import NodeCreator
-from precicecasegenerate.file_creators.config_creator import ConfigCreator
-from precicecasegenerate.file_creators.adapter_config_creator import AdapterConfigCreator
-from precicecasegenerate.file_creators.utility_file_creator import UtilityFileCreator
+from precicecasegenerate import batch
+
+if TYPE_CHECKING:
+    from precicecasegenerate.case_cache import CaseCache
+    from precicecasegenerate.file_creators.case_writer import CaseWriter
+    from precicecasegenerate.input_handler.topology_reader import TopologyReader
+
+# The modules generating a case depend on heavy packages like precice-config-graph, jsonschema and ruamel.yaml.
+# They are imported where they are used, such that "--help" or invalid arguments do not pay for importing them.
 
 logger = logging.getLogger(__name__)
 
@@ -20,92 +23,427 @@ def makeGenerateParser(add_help: bool = True) -> argparse.ArgumentParser:
         description="Initialize a preCICE case given a topology file",
         add_help=add_help,
     )
-    parser.add_argument(
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument(
         "input_file",
         type=cli_helper.yaml_file,
         nargs="?",
-        help="Path to the input YAML topology file.",
-        default=cli_helper.DEFAULT_TOPOLOGY_NAME # Needs to be a string to cover the case no input is given
+        help=f"Path to the input YAML or JSON topology file. Defaults to {cli_helper.DEFAULT_TOPOLOGY_NAME}.",
+        default=None  # Resolved in runGenerate, such that no topology file is required in batch mode
+    )
+    input_group.add_argument(
+        "--batch",
+        metavar="SOURCE",
+        help="Generate a case for every topology file found in SOURCE, which is a directory, a manifest file "
+             "listing one topology file per line, or a glob pattern. "
+             "Each case is written to its own subfolder of the output path."
+    )
+    input_group.add_argument(
+        "--serve",
+        metavar="PORT",
+        type=int,
+        nargs="?",
+        const=cli_helper.DEFAULT_SERVER_PORT,
+        default=None,
+        help=f"Run a local HTTP server on 127.0.0.1:PORT (default {cli_helper.DEFAULT_SERVER_PORT}) that generates "
+             f"a case for every topology posted to /generate, instead of generating a single case."
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=cli_helper.positive_integer,
+        default=cli_helper.DEFAULT_MAX_REQUESTS,
+        help="The number of requests the server handles at once. Further requests are rejected until one of them "
+             "is finished."
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate the case whenever the input file changes."
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=cli_helper.number_of_jobs,
+        default=1,
+        help="The number of processes generating cases in parallel in batch mode. Use 0 for one process per CPU."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always generate the case from scratch, without reading or writing the cache of generated cases "
+             f"in {cli_helper.get_cache_directory()}."
+    )
+    parser.add_argument(
+        "--skip-adapter-validation",
+        action="store_true",
+        help="Do not validate the generated adapter configs against the schema of the precice-adapter-schema "
+             "package. This speeds up the generation of large cases from trusted topologies."
+    )
+    parser.add_argument(
+        "--validate-config",
+        action="store_true",
+        help="Check the generated preCICE configuration with the rules of precice-config-check before writing it. "
+             "Exits with 1 for syntactic and 2 for logical errors in the configuration, "
+             "and with 3 if precice-config-check is not installed."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Measure the wall time, CPU time and peak memory of every stage of the generation and log a summary. "
+             "Profiling memory slows down the generation."
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        type=Path,
+        default=None,
+        help="Write the profile to FILE, which implies --profile. Files ending in .prof or .pstats hold cProfile "
+             "statistics, files ending in .speedscope.json a timeline for speedscope, and other files JSON."
     )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging output."
     )
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=None,
+        help=f"The directory of the log files. Defaults to ${cli_helper.LOG_DIR_ENVIRONMENT_VARIABLE} "
+             f"or {cli_helper.LOG_DIR_NAME} in the current working directory."
+    )
+    parser.add_argument(
+        "--no-log-file", action="store_true", help="Do not write a log file."
+    )
     parser.add_argument(
         "-o", "--output_path",
         type=Path,
         default=Path(cli_helper.GENERATED_DIR_NAME),
-        help="A custom output path for the generated folder. Already existing folders and files will be overwritten."
+        help="A custom output path for the generated folder. Existing files are only overwritten if their content "
+             "changed and files generated for participants that no longer exist are removed. "
+             "Paths ending in .tar, .tar.gz, .tgz, .tar.bz2, .tar.xz, .tar.zst or .zip are written as an archive."
     )
     return parser
 
 def runGenerate(args: argparse.Namespace) -> int:
-    setup_logging(verbose=args.verbose)
+    from precicecasegenerate.logging_setup import setup_logging
+
+    setup_logging(verbose=args.verbose, log_file=not args.no_log_file, log_directory=args.log_dir)
     logger.info("Program started.")
 
-    input_file: Path = Path(args.input_file)
     output_root: Path = Path(args.output_path)
+    cache: "CaseCache | None" = None
+    if not args.no_cache:
+        from precicecasegenerate.case_cache import CaseCache
+
+        cache = CaseCache(cli_helper.get_cache_directory())
+    profile: bool = args.profile or args.profile_output is not None
+    if profile and (args.serve is not None or args.batch is not None or args.watch):
+        logger.warning("Profiling is only supported when generating a single case and will be ignored.")
+    validate_adapter_configs: bool = not args.skip_adapter_validation
+    if not validate_adapter_configs and args.serve is not None:
+        logger.warning("The server always validates the adapter configs, so --skip-adapter-validation will be ignored.")
+    if args.validate_config and (args.serve is not None or args.batch is not None):
+        logger.warning("Validating the preCICE configuration is only supported when generating a single case "
+                       "and will be ignored.")
 
-    return_value = generate_case(input_file, output_root)
+    if args.serve is not None:
+        from precicecasegenerate.server import run_server
+
+        return_value = run_server(args.serve, max_requests=args.max_requests, cache=cache)
+        logger.info("Program finished.")
+        return return_value
+    if args.batch is not None:
+        from precicecasegenerate.file_creators.case_writer import get_archive_format
+
+        if args.watch:
+            logger.critical("Watch mode is not supported in batch mode. Aborting program.")
+            return 1
+        if get_archive_format(output_root) is not None:
+            logger.critical("Batches cannot be written to an archive, since each case is written to its own folder. "
+                            "Aborting program.")
+            return 1
+        return_value = run_batch(args.batch, output_root, jobs=args.jobs, cache=cache,
+                                 validate_adapter_configs=validate_adapter_configs)
+        logger.info("Program finished.")
+        return return_value
+    if args.jobs != 1:
+        logger.warning("The number of jobs is only used in batch mode and will be ignored.")
+
+    if args.input_file is None:
+        try:
+            args.input_file = cli_helper.yaml_file(cli_helper.DEFAULT_TOPOLOGY_NAME)
+        except argparse.ArgumentTypeError:
+            # The error has already been logged
+            return 1
+    input_file: Path = Path(args.input_file)
+
+    if args.watch:
+        from precicecasegenerate.file_creators.case_writer import get_archive_format
+        from precicecasegenerate.watch import TopologyWatcher
+
+        if get_archive_format(output_root) is not None:
+            logger.critical("Watch mode cannot write to an archive, since only changed files are rewritten. "
+                            "Aborting program.")
+            return 1
+        return_value = TopologyWatcher(input_file, output_root, cache=cache,
+                                       validate_adapter_configs=validate_adapter_configs,
+                                       validate_config=args.validate_config).watch()
+    elif profile:
+        return_value = profile_case(input_file, output_root, cache=cache, output_file=args.profile_output,
+                                    validate_adapter_configs=validate_adapter_configs,
+                                    validate_config=args.validate_config)
+    else:
+        return_value = generate_case(input_file, output_root, cache=cache,
+                                     validate_adapter_configs=validate_adapter_configs,
+                                     validate_config=args.validate_config)
 
     logger.info("Program finished.")
     return return_value
 
 
-def generate_case(input_file: Path, output_root: Path) -> int:
+def run_batch(source: str, output_root: Path, jobs: int = 1, cache: "CaseCache | None" = None,
+              validate_adapter_configs: bool = True) -> int:
+    """
+    Generate a case for every topology file of a batch and report the status and timing of each case.
+    :param source: A directory, manifest file or glob pattern specifying the topology files.
+    :param output_root: The root directory for the generated cases.
+    :param jobs: The number of processes generating cases in parallel.
+    :param cache: A CaseCache to restore and store the cases, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :return: 0 if all cases were generated successfully, 1 otherwise.
+    """
+    topology_files: list[Path] = batch.collect_topology_files(source)
+    if not topology_files:
+        logger.critical(f"No topology files found in {source}. Aborting program.")
+        return 1
+    start: float = time.perf_counter()
+    results: list[batch.CaseResult] = batch.generate_batch(topology_files, output_root, jobs=jobs, cache=cache,
+                                                           validate_adapter_configs=validate_adapter_configs)
+    return batch.log_batch_summary(results, wall_time=time.perf_counter() - start)
+
+
+def generate_case(input_file: Path, output_root: Path, cache: "CaseCache | None" = None,
+                  validate_adapter_configs: bool = True, validate_config: bool = False) -> int:
     """
     Generate all files for a preCICE case
     This method creates the required directories and calls the respective methods to create the nodes from the topology,
     the preCICE configuration file, the adapter configuration files, and the utility files.
+    If a cache is given and it holds the files generated from the same topology, these files are restored instead.
+    :param input_file: The path to the input file containing the topology.
+    :param output_root: The root directory for the generated files. If it has an archive suffix like ".tar.gz"
+        or ".zip", the files are written into an archive at this path instead, see case_writer.ARCHIVE_FORMATS.
+    :param cache: A CaseCache to restore and store the files, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :param validate_config: Check the generated preCICE configuration with the rules of precice-config-check.
+    :return: 0 if successful, 2 if the generated preCICE configuration has logical errors,
+        3 if it cannot be validated since precice-config-check is not installed, 1 otherwise.
+    """
+    from precicecasegenerate.file_creators import case_writer
+
+    archive_format: str | None = case_writer.get_archive_format(output_root)
+    if archive_format is not None:
+        if not case_writer.is_archive_format_supported(archive_format):
+            logger.critical(f"Writing {output_root} requires Python 3.14 or the zstandard package. Aborting program.")
+            return 1
+        # Files are streamed into the archive, without writing any other files
+        writer: case_writer.CaseWriter = case_writer.ArchiveWriter(output_root)
+    else:
+        # Create a new directory for the generated files
+        output_root.mkdir(parents=True, exist_ok=True)
+        logger.debug(f"Created output directory at {output_root}")
+        # Only files whose content changed since the last run in this directory are written
+        writer: case_writer.CaseWriter = case_writer.DirectoryWriter(output_root)
+    return write_case(input_file, writer, cache=cache, validate_adapter_configs=validate_adapter_configs,
+                      validate_config=validate_config)
+
+
+def profile_case(input_file: Path, output_root: Path, cache: "CaseCache | None" = None,
+                 output_file: Path | None = None, validate_adapter_configs: bool = True,
+                 validate_config: bool = False) -> int:
+    """
+    Generate a case like generate_case while measuring the wall time, CPU time and peak memory of every stage,
+    and log a summary of the measurements.
     :param input_file: The path to the input file containing the topology.
     :param output_root: The root directory for the generated files.
-    :return: 0 if successful, 1 otherwise.
+    :param cache: A CaseCache to restore and store the files, or None to disable caching.
+    :param output_file: A file to write the profile to, see StageProfiler.write(), or None to only log the summary.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :param validate_config: Check the generated preCICE configuration with the rules of precice-config-check.
+    :return: 0 if successful, 2 if the generated preCICE configuration has logical errors,
+        3 if it cannot be validated since precice-config-check is not installed, 1 otherwise.
+    """
+    from precicecasegenerate.profiler import CPROFILE_SUFFIXES, StageProfiler
+
+    cprofile: bool = output_file is not None and output_file.suffix.lower() in CPROFILE_SUFFIXES
+    profiler: StageProfiler = StageProfiler(cprofile=cprofile)
+    with profiler:
+        return_value: int = generate_case(input_file, output_root, cache=cache,
+                                          validate_adapter_configs=validate_adapter_configs,
+                                          validate_config=validate_config)
+    profiler.log_summary()
+    stage_names: set[str] = {record.name for record in profiler.records}
+    if "cache_lookup" in stage_names and "node_creation" not in stage_names:
+        logger.info("The case was restored from the cache. Use --no-cache to profile the generation.")
+    if output_file is not None:
+        try:
+            profiler.write(output_file)
+        except OSError as e:
+            logger.error(f"Could not write profile to {output_file}: {e}")
+            return 1
+    return return_value
+
+
+def write_case(input_file: Path, writer: "CaseWriter", cache: "CaseCache | None" = None,
+               topology_str: str | None = None, validate_adapter_configs: bool = True,
+               validate_config: bool = False) -> int:
+    """
+    Generate all files for a preCICE case from the given topology file and finish the given writer.
+    If generating the case fails, the writer is aborted instead, such that no files are changed.
+    :param input_file: The path to the input file containing the topology.
+    :param writer: The writer to pass the files to.
+    :param cache: A CaseCache to restore and store the files, or None to disable caching.
+    :param topology_str: The content of the input file, if it has already been read.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :param validate_config: Check the generated preCICE configuration with the rules of precice-config-check.
+    :return: 0 if successful, 2 if the generated preCICE configuration has logical errors,
+        3 if it cannot be validated since precice-config-check is not installed, 1 otherwise.
+    """
+    from precicecasegenerate.input_handler.topology_reader import TopologyReader
+    from precicecasegenerate.profiler import profile_stage
+
+    try:
+        logger.debug("Starting topology reader.")
+        with profile_stage("read"):
+            topology_reader: TopologyReader = TopologyReader(input_file.resolve(), topology_str=topology_str)
+        return_value: int = create_case(topology_reader, writer, cache=cache,
+                                        validate_adapter_configs=validate_adapter_configs,
+                                        validate_config=validate_config)
+    except BaseException:
+        # Release the output directory without leaving any partially written files behind
+        writer.abort()
+        raise
+    if return_value != 0:
+        writer.abort()
+        return return_value
+    # Files are only moved into place and directories of participants that no longer exist are removed here
+    with profile_stage("write"):
+        writer.close()
+    return 0
+
+
+def generate_case_files(topology_str: str, cache: "CaseCache | None" = None,
+                        validate_adapter_configs: bool = True) -> dict[str, bytes] | None:
+    """
+    Generate all files for a preCICE case in memory, without reading or writing any files.
+    If a cache is given, it is used as in generate_case.
+    :param topology_str: The content of a topology file.
+    :param cache: A CaseCache to restore and store the files, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :return: A dict mapping the paths of all files of the case, relative to the case directory, to their content,
+        or None if the topology is invalid. The errors have been logged in that case.
     """
-    # Create a new directory for the generated files
-    output_root.mkdir(parents=True, exist_ok=True)
-    logger.debug(f"Created output directory at {output_root}")
+    from precicecasegenerate.input_handler.topology_reader import TopologyReader
+    from precicecasegenerate.file_creators.case_writer import CaseWriter
+    from precicecasegenerate.profiler import profile_stage
 
+    writer: CaseWriter = CaseWriter()
     logger.debug("Starting topology reader.")
-    topology_reader: TopologyReader = TopologyReader(input_file.resolve())
-    return_value: int = topology_reader.validate_topology()
+    with profile_stage("read"):
+        topology_reader: TopologyReader = TopologyReader(topology_str=topology_str)
+    if create_case(topology_reader, writer, cache=cache, validate_adapter_configs=validate_adapter_configs) != 0:
+        return None
+    writer.close()
+    return writer.contents
+
+
+def create_case(topology_reader: "TopologyReader", writer: "CaseWriter", cache: "CaseCache | None" = None,
+                validate_adapter_configs: bool = True, validate_config: bool = False) -> int:
+    """
+    Create all files for a preCICE case from the topology of the given reader and pass them to the given writer.
+    This validates the topology and calls the respective methods to create the nodes from the topology,
+    the preCICE configuration file, the adapter configuration files, and the utility files.
+    If a cache is given and it holds the files generated from the same topology, these files are restored instead.
+    The writer is not closed, such that the caller decides whether to finish the case.
+    :param topology_reader: The topology reader holding the topology.
+    :param writer: The writer to pass the files to.
+    :param cache: A CaseCache to restore and store the files, or None to disable caching.
+    :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+    :param validate_config: Check the generated preCICE configuration with the rules of precice-config-check.
+    :return: 0 if successful, 2 if the generated preCICE configuration has logical errors,
+        3 if it cannot be validated since precice-config-check is not installed, 1 otherwise.
+    """
+    from precicecasegenerate import helper
+    from precicecasegenerate.file_creators.case_writer import RecordingWriter
+    from precicecasegenerate.node_creator import NodeCreator
+    from precicecasegenerate.file_creators.config_creator import ConfigCreator
+    from precicecasegenerate.file_creators.adapter_config_creator import AdapterConfigCreator
+    from precicecasegenerate.file_creators.utility_file_creator import UtilityFileCreator
+    from precicecasegenerate.profiler import profile_stage
+
+    # Every case starts with all uniquifiers, even if other cases were generated in this process before
+    helper.reset_uniquifiers()
+
+    with profile_stage("validate"):
+        return_value: int = topology_reader.validate_topology()
     if return_value != 0:
         return return_value
-    return_value: int = topology_reader.check_topology()
+    with profile_stage("check"):
+        return_value: int = topology_reader.check_topology()
     if return_value != 0:
         return return_value
     topology: dict = topology_reader.get_topology()
     logger.debug("Topology reader finished.")
 
+    if cache is not None:
+        # The key has to be computed before the NodeCreator modifies the topology
+        with profile_stage("cache_lookup"):
+            cache_key: str = cache.get_key(topology)
+            cache_entry: tuple[dict[str, bytes], set[str]] | None = cache.load(cache_key)
+        if cache_entry is not None:
+            cached_files, executable_files = cache_entry
+            for relative_path, content in cached_files.items():
+                writer.write_file(relative_path, content, executable=relative_path in executable_files)
+            logger.info(f"Case restored from cache entry {cache_key}.")
+            return 0
+        # Only keep the content of the files in memory if they are stored in the cache
+        writer = RecordingWriter(writer)
+
     logger.debug("Starting node creator.")
-    node_creator: NodeCreator = NodeCreator(topology)
+    with profile_stage("node_creation"):
+        node_creator: NodeCreator = NodeCreator(topology)
     nodes: dict = node_creator.get_nodes()
     logger.debug("Node creator finished.")
 
     logger.debug("Starting config creator.")
     config_creator: ConfigCreator = ConfigCreator(nodes)
-    config_creator.create_config_file(directory=output_root, filename=cli_helper.PRECICE_CONFIG_FILE_NAME)
+    if validate_config:
+        # An invalid configuration is not written, such that the previous case is kept
+        with profile_stage("config_validation"):
+            return_value: int = config_creator.validate_config()
+        if return_value != 0:
+            return return_value
+    with profile_stage("config_file"):
+        config_creator.create_config_file(writer, filename=cli_helper.PRECICE_CONFIG_FILE_NAME)
     logger.debug("Config creator finished.")
 
-    logger.debug("Creating participant directories.")
+    # Participant directories of the form "_generated/name-solver/" are created by the writer
     participant_solver_map: dict = node_creator.get_participant_solver_map()
-    for participant in participant_solver_map:
-        participant_directory: Path = helper.get_participant_solver_directory(output_root, participant.name,
-                                                                              participant_solver_map[participant])
-        # The directory will be overwritten if it already exists and is of the form "_generated/name-solver/"
-        if participant_directory.exists():
-            shutil.rmtree(participant_directory, ignore_errors=True)
-        participant_directory.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Created participant directory at {participant_directory}")
 
     logger.debug("Starting adapter config creator.")
-    mesh_patch_map: dict = node_creator.get_mesh_patch_map()
-    adapter_config_creator: AdapterConfigCreator = AdapterConfigCreator(participant_solver_map,
-                                                                        mesh_patch_map,
-                                                                        precice_config_filename=cli_helper.PRECICE_CONFIG_FILE_NAME)
-    adapter_config_creator.create_adapter_configs(parent_directory=output_root)
+    with profile_stage("adapter_configs"):
+        mesh_patch_map: dict = node_creator.get_mesh_patch_map()
+        adapter_config_creator: AdapterConfigCreator = AdapterConfigCreator(participant_solver_map,
+                                                                            mesh_patch_map,
+                                                                            precice_config_filename=cli_helper.PRECICE_CONFIG_FILE_NAME,
+                                                                            validate=validate_adapter_configs)
+        adapter_config_creator.create_adapter_configs(writer)
 
     logger.debug("Starting utility file creator.")
-    utility_file_creator: UtilityFileCreator = UtilityFileCreator(participant_solver_map)
-    utility_file_creator.create_utility_files(parent_directory=output_root)
+    with profile_stage("utility_files"):
+        utility_file_creator: UtilityFileCreator = UtilityFileCreator(participant_solver_map)
+        utility_file_creator.create_utility_files(writer)
+
+    if cache is not None:
+        with profile_stage("cache_store"):
+            cache.store(cache_key, writer.contents, writer.executable_files)
     return 0
 
 
@@ -3,20 +3,31 @@ This file contains helper methods and variables for the cli.py file and its main
 """
 
 import argparse
+import os
 import logging
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 PRECICE_CONFIG_FILE_NAME: str = "precice-config.xml"
+ADAPTER_CONFIG_FILE_NAME: str = "adapter-config.json"
 GENERATED_DIR_NAME: str = "_generated"
 LOG_DIR_NAME: str = ".logs"
 DEFAULT_TOPOLOGY_NAME: str = "topology.yaml"
+# Suffixes of topology files. JSON is parsed faster than YAML, which helps with machine-generated topologies
+TOPOLOGY_FILE_SUFFIXES: list[str] = [".yaml", ".yml", ".json"]
+CACHE_DIR_NAME: str = "precice-case-generate"
+# Defaults of the generation server
+DEFAULT_SERVER_PORT: int = 8765
+# Number of requests the server handles at once. Further requests are rejected until one of them is finished
+DEFAULT_MAX_REQUESTS: int = 8
+# Environment variable overriding the directory of the log files
+LOG_DIR_ENVIRONMENT_VARIABLE: str = "PRECICE_CASE_GENERATE_LOG_DIR"
 
 
 def yaml_file(filepath: str) -> Path:
     """
-    Check if the filepath points to an existing YAML file.
+    Check if the filepath points to an existing YAML or JSON file.
     Otherwise, raise an argparse.ArgumentTypeError.
     :param filepath: The path to the input file as a string.
     :return: The path to the input file as a Path object.
@@ -29,10 +40,64 @@ def yaml_file(filepath: str) -> Path:
         raise argparse.ArgumentTypeError(f"File '{input_file.resolve()}' does not exist.")
     logger.debug(f"File {input_file.resolve()} exists.")
 
-    # Check if the file is a YAML file
-    if input_file.suffix.lower() not in [".yaml", ".yml"]:
-        logger.critical(f"File {input_file.resolve()} is not a YAML file. Aborting program.")
-        raise argparse.ArgumentTypeError(f"The file '{input_file}' is not a YAML file.")
-    logger.debug(f"File {input_file.resolve()} is a YAML file.")
+    # Check if the file is a YAML or JSON file
+    if input_file.suffix.lower() not in TOPOLOGY_FILE_SUFFIXES:
+        logger.critical(f"File {input_file.resolve()} is not a YAML or JSON file. Aborting program.")
+        raise argparse.ArgumentTypeError(f"The file '{input_file}' is not a YAML or JSON file.")
+    logger.debug(f"File {input_file.resolve()} is a YAML or JSON file.")
 
     return input_file
+
+
+def get_cache_directory() -> Path:
+    """
+    Return the directory of the case cache.
+    This is "precice-case-generate" in the user cache directory given by $XDG_CACHE_HOME, defaulting to ~/.cache.
+    :return: The path to the cache directory.
+    """
+    cache_home: str = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / CACHE_DIR_NAME
+
+
+def get_log_directory() -> Path:
+    """
+    Return the directory of the log files.
+    This is given by $PRECICE_CASE_GENERATE_LOG_DIR, defaulting to LOG_DIR_NAME in the current working directory.
+    :return: The path to the log directory.
+    """
+    return Path(os.environ.get(LOG_DIR_ENVIRONMENT_VARIABLE) or LOG_DIR_NAME)
+
+
+def positive_integer(value: str) -> int:
+    """
+    Check if the value is a positive integer.
+    Otherwise, raise an argparse.ArgumentTypeError.
+    :param value: The integer as a string.
+    :return: The integer.
+    """
+    try:
+        number: int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer.")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"'{value}' is not positive.")
+    return number
+
+
+def number_of_jobs(value: str) -> int:
+    """
+    Check if the value is a valid number of parallel jobs, i.e., a non-negative integer.
+    Zero is replaced by the number of CPUs of the machine.
+    Otherwise, raise an argparse.ArgumentTypeError.
+    :param value: The number of jobs as a string.
+    :return: The number of jobs as a positive integer.
+    """
+    try:
+        jobs: int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"The number of jobs '{value}' is not an integer.")
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"The number of jobs '{value}' is negative.")
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    return jobs
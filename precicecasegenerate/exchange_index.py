@@ -0,0 +1,100 @@
+import logging
+
+from precice_config_graph import nodes as n
+from precice_config_graph import enums as e
+import precicecasegenerate.helper as helper
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeIndex:
+    """
+    An index over the exchanges of a topology, built in a single pass over the exchanges-tag.
+    Exchanges are referred to by their position in the exchanges-tag.
+    For every exchange, the participant nodes, the data type and the data kind are resolved once.
+    Additionally, exchanges are grouped by participant pair, by (participant, patch) and by
+    (from-participant, to-participant, data name, data type, exchange type),
+    such that the stages of the NodeCreator can query these groups instead of scanning all exchanges.
+    Since the preprocessing of the NodeCreator renames patches and data, such renames have to go through the index
+    to keep the groups consistent with the topology dict.
+    """
+
+    def __init__(self, exchanges: list[dict], participant_map: dict[str, n.ParticipantNode]):
+        """
+        Initialize the index from the exchanges-tag of a topology.
+        :param exchanges: The list of exchange dicts of the topology. These are updated in place on renames.
+        :param participant_map: A dict mapping participant names to participant nodes.
+        """
+        self.exchanges = exchanges
+
+        # Values resolved once per exchange
+        self.from_participants: list[n.ParticipantNode] = []
+        self.to_participants: list[n.ParticipantNode] = []
+        self.data_types: list[e.DataType] = []
+        self.data_kinds: list[helper.DataKind] = []
+
+        # Map (from-participant, to-participant) to the exchanges between them
+        self.participant_pair_map: dict[tuple[n.ParticipantNode, n.ParticipantNode], list[int]] = {}
+        # Map (participant, patch) to the exchanges using this patch on either side
+        self.patch_map: dict[tuple[n.ParticipantNode, str], list[int]] = {}
+        # Map (from-participant, to-participant, data name, data type, exchange type) to the exchanges with these values
+        self.data_map: dict[tuple[n.ParticipantNode, n.ParticipantNode, str, e.DataType, str], list[int]] = {}
+
+        for exchange_id, exchange in enumerate(exchanges):
+            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
+            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
+            self.from_participants.append(from_participant)
+            self.to_participants.append(to_participant)
+            self.data_types.append(helper.get_data_type(exchange["data"], exchange.get("data-type")))
+            self.data_kinds.append(helper.get_data_label(exchange["data"]))
+
+            self.participant_pair_map.setdefault((from_participant, to_participant), []).append(exchange_id)
+            self.patch_map.setdefault((from_participant, exchange["from-patch"]), []).append(exchange_id)
+            self.patch_map.setdefault((to_participant, exchange["to-patch"]), []).append(exchange_id)
+            self.data_map.setdefault(self._data_key(exchange_id), []).append(exchange_id)
+
+        logger.debug(f"Indexed {len(exchanges)} exchanges between {len(self.participant_pair_map)} participant pairs.")
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    def __iter__(self):
+        """
+        Iterate over the exchange IDs in the order of the topology.
+        """
+        return iter(range(len(self.exchanges)))
+
+    def _data_key(self, exchange_id: int) -> tuple[n.ParticipantNode, n.ParticipantNode, str, e.DataType, str]:
+        """
+        Return the key of the given exchange in the data map.
+        :param exchange_id: The ID of the exchange.
+        :return: A tuple (from-participant, to-participant, data name, data type, exchange type).
+        """
+        exchange: dict = self.exchanges[exchange_id]
+        return (self.from_participants[exchange_id], self.to_participants[exchange_id], exchange["data"],
+                self.data_types[exchange_id], exchange["type"])
+
+    def split_patch(self, participant: n.ParticipantNode, patch: str, new_patches: dict[str, str]) -> None:
+        """
+        Split the given patch of the given participant into new patches depending on the data kind of each exchange.
+        All exchanges using the patch are renamed in the topology dict and moved to the groups of the new patches.
+        :param participant: The participant that owns the patch.
+        :param patch: The name of the patch to split.
+        :param new_patches: A dict mapping data kinds ("extensive" or "intensive") to new patch names.
+        """
+        for exchange_id in self.patch_map.pop((participant, patch)):
+            # A participant never exchanges with itself, so the patch is either the from- or the to-patch
+            side: str = "from-patch" if self.from_participants[exchange_id] is participant else "to-patch"
+            new_patch: str = new_patches[self.data_kinds[exchange_id].value]
+            self.exchanges[exchange_id][side] = new_patch
+            self.patch_map.setdefault((participant, new_patch), []).append(exchange_id)
+
+    def rename_data(self, exchange_id: int, new_data_name: str) -> None:
+        """
+        Rename the data of the given exchange in the topology dict and move it to the corresponding group.
+        :param exchange_id: The ID of the exchange.
+        :param new_data_name: The new name of the data.
+        """
+        self.data_map[self._data_key(exchange_id)].remove(exchange_id)
+        self.exchanges[exchange_id]["data"] = new_data_name
+        self.data_map.setdefault(self._data_key(exchange_id), []).append(exchange_id)
@@ -1,14 +1,37 @@
 import json
+import jsonschema
 import logging
+from functools import cache
 from pathlib import Path
-import preciceadapterschema
+from importlib.resources import files
 
 from precice_config_graph import nodes as n
 
 import precicecasegenerate.helper as helper
+from precicecasegenerate.file_creators.case_writer import CaseWriter
 
 logger = logging.getLogger(__name__)
 
+# The schema of adapter configs, shipped with the precice-adapter-schema package
+ADAPTER_SCHEMA_PACKAGE: str = "preciceadapterschema"
+ADAPTER_SCHEMA_NAME: str = "precice_adapter_config.schema.json"
+
+
+@cache
+def get_adapter_config_validator() -> jsonschema.protocols.Validator:
+    """
+    Return a validator for the adapter config schema of the precice-adapter-schema package.
+    preciceadapterschema.validate() checks the schema and creates a new validator for every adapter config;
+    here, the schema is loaded, checked and compiled into a validator only once per process.
+    :return: A jsonschema validator for adapter configs.
+    """
+    schema_path = files(ADAPTER_SCHEMA_PACKAGE) / ADAPTER_SCHEMA_NAME
+    schema: dict = json.loads(schema_path.read_text(encoding="utf-8"))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    logger.debug(f"Compiled adapter config schema {schema_path} with {validator_class.__name__}.")
+    return validator_class(schema)
+
 
 class AdapterConfigCreator:
     """
@@ -16,60 +39,81 @@ class AdapterConfigCreator:
     """
 
     def __init__(self, participant_solver_map: dict[n.ParticipantNode, str],
-                 mesh_patch_map: dict[n.MeshNode, set[str]], precice_config_filename: str = "precice-config.xml"):
+                 mesh_patch_map: dict[n.MeshNode, set[str]], precice_config_filename: str = "precice-config.xml",
+                 validate: bool = True):
         """
         Initialize an AdapterConfigCreator object, which creates adapter configuration files for each participant.
         :param participant_solver_map: A dict mapping participant nodes to their solver names.
         :param mesh_patch_map: A map mapping meshes to sets of patches.
         :param precice_config_filename: The name of the precice-config.xml file.
+        :param validate: Validate the adapter configs against the schema of the precice-adapter-schema package.
         """
         self.participant_solver_map = participant_solver_map
         self.patch_map = mesh_patch_map
         self.precice_config_filename = precice_config_filename
+        self.validate = validate
+        # Index of the interfaces of all participants, built once by _build_interface_index()
+        self.interface_index: dict[tuple[n.ParticipantNode, n.MeshNode], dict[str, list[str]]] | None = None
 
-    def _create_adapter_config_dict(self, participant: n.ParticipantNode,
-                                    mesh_patch_map: dict[n.MeshNode, set[str]]) -> dict[str, str | list[str]]:
+    def _build_interface_index(self) -> dict[tuple[n.ParticipantNode, n.MeshNode], dict[str, list[str]]]:
+        """
+        Group the patches, read-data and write-data of all participants by (participant, mesh) in a single pass,
+        such that the adapter configs do not have to scan all read- and write-data of a participant for every mesh.
+        :return: A dict mapping (participant, mesh) to a dict with the sorted "patches", "read_data_names" and
+            "write_data_names" of the mesh. The entries of each participant are in the order of its provided meshes.
+        """
+        interface_index: dict[tuple[n.ParticipantNode, n.MeshNode], dict[str, list[str]]] = {}
+        for participant in self.participant_solver_map:
+            for mesh in participant.provide_meshes:
+                interface_index[(participant, mesh)] = {"patches": sorted(self.patch_map.get(mesh, [])),
+                                                        "read_data_names": [], "write_data_names": []}
+            # Data on meshes the participant does not provide, i.e., received meshes, is not part of the adapter config
+            for read_data in participant.read_data:
+                interface: dict[str, list[str]] | None = interface_index.get((participant, read_data.mesh))
+                if interface is not None:
+                    interface["read_data_names"].append(read_data.data.name)
+            for write_data in participant.write_data:
+                interface: dict[str, list[str]] | None = interface_index.get((participant, write_data.mesh))
+                if interface is not None:
+                    interface["write_data_names"].append(write_data.data.name)
+
+        for interface in interface_index.values():
+            interface["read_data_names"].sort()
+            interface["write_data_names"].sort()
+        logger.debug("Indexed %d adapter interfaces of %d participants.", len(interface_index),
+                     len(self.participant_solver_map))
+        return interface_index
+
+    def _create_adapter_config_dict(self, participant: n.ParticipantNode) -> dict[str, str | list[str]]:
         """
         Create a dictionary representing the adapter configuration file for the given participant.
         :param participant: The participant for which the adapter configuration is created.
-        :param mesh_patch_map: A map mapping meshes to sets of patches that they use.
         :return: A dict representing the adapter configuration file for the given participant.
         """
+        if self.interface_index is None:
+            self.interface_index = self._build_interface_index()
         interfaces: list[dict[str, str | list[str]]] = []
 
         # Create an entry for each mesh
         for mesh in participant.provide_meshes:
-            # Get the patches used by the current mesh
-            patches: list[str] = sorted(list(mesh_patch_map.get(mesh, [])))
-
-            # Get the read-data of the participant and the current mesh
-            read_data: list[str] = [
-                rd.data.name for rd in participant.read_data
-                if rd.mesh == mesh
-            ]
-
-            # Get the write-data of the participant and the current mesh
-            write_data: list[str] = [
-                wd.data.name for wd in participant.write_data
-                if wd.mesh == mesh
-            ]
+            interface: dict[str, list[str]] = self.interface_index[(participant, mesh)]
 
             # The mesh entry is a dictionary containing the mesh name and the patches used by it
             mesh_entry: dict[str, str | list[str]] = {
                 "mesh_name": mesh.name,
-                "patches": patches
+                "patches": interface["patches"]
             }
 
             # Only add read-/write-data keys if the mesh reads/writes data
-            if read_data:
-                mesh_entry["read_data_names"] = sorted(read_data)
-            if write_data:
-                mesh_entry["write_data_names"] = sorted(write_data)
+            if interface["read_data_names"]:
+                mesh_entry["read_data_names"] = interface["read_data_names"]
+            if interface["write_data_names"]:
+                mesh_entry["write_data_names"] = interface["write_data_names"]
 
             # Add the mesh entry to the list of interfaces
             interfaces.append(mesh_entry)
-            logger.debug(f"Created adapter configuration entry for mesh {mesh.name} "
-                         f"in participant {participant.name}'s adapter-config.")
+            logger.debug("Created adapter configuration entry for mesh %s in participant %s's adapter-config.",
+                         mesh.name, participant.name)
 
         # The adapter-config file is a dictionary containing the participant name,
         # the path to the precice-config.xml file and the list of interfaces
@@ -79,38 +123,66 @@ class AdapterConfigCreator:
             "interfaces": interfaces
         }
 
-    def _create_adapter_config_file(self, adapter_config_dict: dict[str, str | list[str]],
-                                    directory: Path = "./", filename: str = "adapter-config.json"):
+    def _create_adapter_config_file(self, adapter_config_dict: dict[str, str | list[str]], writer: CaseWriter,
+                                    directory: Path = Path(), filename: str = "adapter-config.json"):
         """
         Write an adapter-config.json file for the given participant to the given directory.
         :param adapter_config_dict: The dict representing the adapter configuration file.
-        :param directory: The directory to save the file in.
+        :param writer: The writer to save the file with.
+        :param directory: The directory to save the file in, relative to the output root of the writer.
         :param filename: The name of the file.
         """
-        # Convert to Path object just in case
-        directory = Path(directory)
-        file_path: Path = directory / filename
-        with open(file_path, "w") as f:
-            json.dump(adapter_config_dict, f, indent=4)
-        logger.info(f"Adapter configuration file written to {file_path}")
-
-    def create_adapter_configs(self, parent_directory: Path = "./"):
+        file_path: Path = Path(directory) / filename
+        writer.write_text(file_path, json.dumps(adapter_config_dict, indent=4))
+        logger.info(f"Adapter configuration file written to {writer.output_root / file_path}")
+
+    def validate_adapter_configs(self, adapter_configs: dict[Path, dict[str, str | list[str]]]) -> (
+            dict[Path, list[jsonschema.ValidationError]]):
+        """
+        Validate all given adapter configs with the shared validator and log every violation of the schema.
+        Since the adapter configs are generated, a violation is likely an error within the program.
+        :param adapter_configs: A dict mapping the directories of the adapter configs to the dicts representing them.
+        :return: A dict mapping the directories of all invalid adapter configs to their errors.
         """
-        Create adapter-config.json files for all participants and directly validate them afterward.
-        The files are saved from the given parent-directory, in subdirectories of the form "participant-solver/".
+        validator: jsonschema.protocols.Validator = get_adapter_config_validator()
+        errors: dict[Path, list[jsonschema.ValidationError]] = {}
+        for directory, adapter_config_dict in adapter_configs.items():
+            config_errors: list[jsonschema.ValidationError] = list(validator.iter_errors(adapter_config_dict))
+            if config_errors:
+                errors[directory] = config_errors
+
+        for directory, config_errors in errors.items():
+            for error in config_errors:
+                location: str = "/".join(str(part) for part in error.absolute_path)
+                logger.error(f"Adapter config file {directory} does not adhere to the schema "
+                             f"as specified by the precice-adapter-schema{f' at {location}' if location else ''}: "
+                             f"{error.message}. This is likely an error within the program.")
+        logger.debug("%d of %d adapter config files adhere to the schema.", len(adapter_configs) - len(errors),
+                     len(adapter_configs))
+        return errors
+
+    def create_adapter_configs(self, writer: CaseWriter) -> dict[Path, list[jsonschema.ValidationError]]:
         """
-        # Convert to Path object just in case
-        parent_directory = Path(parent_directory)
+        Create adapter-config.json files for all participants and validate them all at once, unless validation is
+        disabled. Invalid adapter configs are written nonetheless.
+        The files are saved in subdirectories of the form "participant-solver/" of the output root of the writer.
+        :param writer: The writer to save the files with.
+        :return: A dict mapping the directories of all invalid adapter configs to their errors.
+        """
+        # Participant directories are relative to the output root of the writer
+        parent_directory: Path = Path()
+        adapter_configs: dict[Path, dict[str, str | list[str]]] = {}
         for participant in self.participant_solver_map:
-            logger.debug(f"Creating adapter configuration file for participant {participant.name}.")
+            logger.debug("Creating adapter configuration file for participant %s.", participant.name)
             directory: Path = helper.get_participant_solver_directory(parent_directory, participant.name,
                                                                       self.participant_solver_map[participant])
-            adapter_config_dict: dict[str, str | list[str]] = self._create_adapter_config_dict(participant,
-                                                                                               self.patch_map)
-            try:
-                preciceadapterschema.validate(adapter_config_dict)
-                logger.debug(f"Adapter config file {directory} adheres to the schema.")
-            except Exception as e:
-                logger.error(f"Adapter config file {directory} does not adhere to the schema "
-                             f"as specified by the precice-adapter-schema: {e}. This is likely an error within the program.")
-            self._create_adapter_config_file(adapter_config_dict, directory=directory)
+            adapter_configs[directory] = self._create_adapter_config_dict(participant)
+
+        errors: dict[Path, list[jsonschema.ValidationError]] = {}
+        if self.validate:
+            errors = self.validate_adapter_configs(adapter_configs)
+        else:
+            logger.debug("Skipping the validation of %d adapter config files.", len(adapter_configs))
+        for directory, adapter_config_dict in adapter_configs.items():
+            self._create_adapter_config_file(adapter_config_dict, writer, directory=directory)
+        return errors
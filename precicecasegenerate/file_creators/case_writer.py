@@ -0,0 +1,589 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl, but msvcrt instead
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Name of the manifest file in the output root, which records the files written by the previous run
+MANIFEST_FILE_NAME: str = ".precice-case-generate-manifest.json"
+# Name of the lock file in the output root, which serializes writers of the same output root
+LOCK_FILE_NAME: str = ".precice-case-generate.lock"
+# Prefix of the temporary directories in the output root that new files are staged in
+STAGING_DIR_PREFIX: str = ".precice-case-generate-staging-"
+
+# Permissions of generated files in archives
+FILE_MODE: int = 0o644
+EXECUTABLE_FILE_MODE: int = 0o755
+
+# Archive formats by file suffix. Tar formats are given by their compression, as used by tarfile
+ARCHIVE_FORMATS: dict[str, str] = {
+    ".tar": "",
+    ".tar.gz": "gz",
+    ".tgz": "gz",
+    ".tar.bz2": "bz2",
+    ".tar.xz": "xz",
+    ".tar.zst": "zst",
+    ".zip": "zip",
+}
+
+
+def get_archive_format(path: Path) -> str | None:
+    """
+    Return the archive format of the given output path, based on its suffix.
+    :param path: The output path.
+    :return: A value of ARCHIVE_FORMATS, or None if the path is not an archive.
+    """
+    name: str = Path(path).name.lower()
+    # Check longer suffixes first, such that ".tar.gz" is not mistaken for ".gz"
+    for suffix in sorted(ARCHIVE_FORMATS, key=len, reverse=True):
+        if name.endswith(suffix):
+            return ARCHIVE_FORMATS[suffix]
+    return None
+
+
+def is_archive_format_supported(archive_format: str) -> bool:
+    """
+    Check if the given archive format can be written.
+    Zstandard compression requires Python 3.14 or the optional zstandard package.
+    :param archive_format: A value of ARCHIVE_FORMATS.
+    :return: True, if the format can be written. False otherwise.
+    """
+    if archive_format != "zst" or "zst" in tarfile.TarFile.OPEN_METH:
+        return True
+    try:
+        import zstandard
+    except ImportError:
+        return False
+    return True
+
+
+class CaseWriter:
+    """
+    A class that collects the files of a case in memory, without any disk I/O.
+    The file creators only pass the content of each file to a writer, such that subclasses decide where files end up.
+    Subclasses that write the files elsewhere do not keep their content, such that a case is never held in memory
+    as a whole. Use a RecordingWriter to keep the content as well, e.g., to store the case in a cache.
+    """
+
+    def __init__(self):
+        """
+        Initialize a CaseWriter object.
+        """
+        # Paths of files are relative to this directory
+        self.output_root: Path = Path()
+        # The content of all files of the case, keyed by their path relative to the output root
+        self.contents: dict[str, bytes] = {}
+        # The paths of all files that are executable, e.g., scripts
+        self.executable_files: set[str] = set()
+
+    def write_file(self, relative_path: Path | str, content: bytes, executable: bool = False) -> bool:
+        """
+        Add a file with the given content to the case.
+        :param relative_path: The path of the file relative to the output root.
+        :param content: The content of the file.
+        :param executable: If the file should be executable.
+        :return: True, if the file was written. False, if it was unchanged.
+        """
+        relative_path = Path(relative_path).as_posix()
+        self.contents[relative_path] = content
+        if executable:
+            self.executable_files.add(relative_path)
+        return True
+
+    def write_text(self, relative_path: Path | str, text: str) -> bool:
+        """
+        Add a file with the given text UTF-8 encoded to the case.
+        :param relative_path: The path of the file relative to the output root.
+        :param text: The content of the file.
+        :return: True, if the file was written. False, if it was unchanged.
+        """
+        return self.write_file(relative_path, text.encode("utf-8"))
+
+    def close(self) -> None:
+        """
+        Finish writing the case.
+        :return: None
+        """
+        pass
+
+    def abort(self) -> None:
+        """
+        Discard the case, e.g., because its topology is invalid, and release all resources.
+        Files that were already visible before the case was started are left untouched.
+        :return: None
+        """
+        pass
+
+
+class RecordingWriter(CaseWriter):
+    """
+    A class that passes the files of a case on to another writer, while keeping their content in memory.
+    """
+
+    def __init__(self, writer: CaseWriter):
+        """
+        Initialize a RecordingWriter object.
+        :param writer: The writer to pass the files to.
+        """
+        super().__init__()
+        self.writer: CaseWriter = writer
+        self.output_root = writer.output_root
+
+    def write_file(self, relative_path: Path | str, content: bytes, executable: bool = False) -> bool:
+        """
+        Add a file with the given content to the case and pass it on to the other writer.
+        :param relative_path: The path of the file relative to the output root.
+        :param content: The content of the file.
+        :param executable: If the file should be executable.
+        :return: True, if the file was written by the other writer. False, if it was unchanged.
+        """
+        super().write_file(relative_path, content, executable=executable)
+        return self.writer.write_file(relative_path, content, executable=executable)
+
+    def close(self) -> None:
+        """
+        Finish writing the case with the other writer.
+        :return: None
+        """
+        self.writer.close()
+
+    def abort(self) -> None:
+        """
+        Discard the case with the other writer.
+        :return: None
+        """
+        self.writer.abort()
+
+
+def _replace_file(file_path: Path, write) -> None:
+    """
+    Atomically replace the file at the given path.
+    The content is first written to a temporary file in the same directory, which is then renamed to the path,
+    such that readers never see a partially written file.
+    :param file_path: The path of the file.
+    :param write: A function that writes the content to the given temporary path.
+    :return: None
+    """
+    file_descriptor, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    os.close(file_descriptor)
+    try:
+        write(Path(temp_path))
+        # mkstemp creates files only readable by the owner
+        os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+class OutputLock:
+    """
+    A class to represent an exclusive lock on an output directory, which is held via a lock file in the directory.
+    The lock is released by the operating system if the process dies, such that a crash never leaves a stale lock.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Initialize an OutputLock object.
+        :param directory: The directory to lock.
+        """
+        self.path: Path = Path(directory) / LOCK_FILE_NAME
+        self.file = None
+
+    def acquire(self) -> None:
+        """
+        Acquire the lock, waiting for other processes holding it.
+        :return: None
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "a+b")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                logger.info(f"Waiting for another process writing to {self.path.parent}.")
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        else:
+            # Lock the first byte of the file. LK_LOCK only retries for 10 seconds, so keep trying
+            while True:
+                try:
+                    self.file.seek(0)
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    logger.info(f"Waiting for another process writing to {self.path.parent}.")
+
+    def release(self) -> None:
+        """
+        Release the lock, if it is held.
+        The lock file is kept, since removing it would allow two processes to lock different files.
+        :return: None
+        """
+        if self.file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+
+
+class DirectoryWriter(CaseWriter):
+    """
+    A class that writes the files of a case to an output directory incrementally.
+    A manifest in the output directory records the content hash, size and modification time of every written file.
+    On a rerun, files whose content did not change are not touched, such that their modification times are preserved.
+    Files that were written by the previous run but not by the current one are removed,
+    together with directories that become empty, e.g., the directory of a participant that no longer exists.
+    Files that were not written by this program are never removed.
+
+    Changed files are first staged in a temporary directory in the output root and only renamed into place when the
+    writer is closed, such that every file is replaced atomically and an aborted run leaves no partially written files.
+    The manifest is written last, so a crash while renaming is detected and repaired by the next run.
+    The output root is locked from the first written file until the writer is closed, such that concurrent runs on
+    the same output root are serialized instead of interleaving their files. An invalid topology writes no files,
+    so it never touches the output root.
+    """
+
+    def __init__(self, output_root: Path, previous_manifest: dict[str, dict[str, str | int]] | None = None):
+        """
+        Initialize a DirectoryWriter object.
+        :param output_root: The root directory of the case.
+        :param previous_manifest: The manifest of the previous run, if it is still known from a previous writer.
+            Otherwise, it is read from the output root. Since every file is checked against the size and modification
+            time in the manifest, a manifest that is out of date only means that files are compared by content.
+        """
+        super().__init__()
+        self.output_root = Path(output_root)
+        self.lock: OutputLock = OutputLock(self.output_root)
+        # Set once the output root is locked, see _open
+        self.is_open: bool = False
+        self.previous_manifest: dict[str, dict[str, str | int]] | None = previous_manifest
+        self.manifest: dict[str, dict[str, str | int]] = {}
+        # Created when the first changed file is written
+        self.staging_directory: Path | None = None
+        # Changed files in the order they were written, which are renamed into place when the writer is closed
+        self.staged_files: list[str] = []
+        self.written_files: int = 0
+        self.unchanged_files: int = 0
+
+    def _open(self) -> None:
+        """
+        Lock the output root, remove leftovers of crashed runs and read the manifest of the previous run, if any.
+        This is done when the first file is written, such that nothing is written before the topology is valid.
+        :return: None
+        """
+        if self.is_open:
+            return
+        self.lock.acquire()
+        self.is_open = True
+        self._remove_staging_directories()
+        if self.previous_manifest is None:
+            self.previous_manifest = self._read_manifest()
+
+    def _remove_staging_directories(self) -> None:
+        """
+        Remove staging directories left behind by runs that crashed.
+        This is safe, since no other writer can be active while the output root is locked.
+        :return: None
+        """
+        for staging_directory in self.output_root.glob(f"{STAGING_DIR_PREFIX}*"):
+            logger.debug("Removing staging directory %s of an aborted run.", staging_directory)
+            shutil.rmtree(staging_directory, ignore_errors=True)
+
+    def _read_manifest(self) -> dict[str, dict[str, str | int]]:
+        """
+        Read the manifest of the previous run from the output root.
+        :return: A dict mapping relative file paths to their recorded hash, size and modification time.
+        """
+        manifest_path: Path = self.output_root / MANIFEST_FILE_NAME
+        try:
+            with open(manifest_path) as f:
+                return json.load(f)["files"]
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # A broken manifest only means that all files are compared by content
+            logger.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+            return {}
+
+    def _is_unchanged(self, relative_path: str, file_path: Path, content: bytes, content_hash: str) -> bool:
+        """
+        Check if the file at the given path already has the given content.
+        If the file is recorded in the manifest with the same hash and has not been modified since, it is not read.
+        :param relative_path: The path of the file relative to the output root, as used in the manifest.
+        :param file_path: The path of the file.
+        :param content: The new content of the file.
+        :param content_hash: The hash of the new content.
+        :return: True, if the file exists with the given content. False otherwise.
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        if stat.st_size != len(content):
+            return False
+        entry: dict[str, str | int] | None = self.previous_manifest.get(relative_path)
+        if (entry is not None and entry.get("sha256") == content_hash
+                and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns):
+            return True
+        # The file is unknown or was modified after it was written, so compare the actual content
+        return file_path.read_bytes() == content
+
+    def write_file(self, relative_path: Path | str, content: bytes, executable: bool = False) -> bool:
+        """
+        Write the given content to the file at the given path, unless the file already has this content.
+        :param relative_path: The path of the file relative to the output root.
+        :param content: The content of the file.
+        :param executable: If the file should be executable.
+        :return: True, if the file was written. False, if it was unchanged.
+        """
+        self._open()
+        relative_path = Path(relative_path).as_posix()
+        file_path: Path = self.output_root / relative_path
+        content_hash: str = hashlib.sha256(content).hexdigest()
+
+        written: bool = not self._is_unchanged(relative_path, file_path, content, content_hash)
+        if written:
+            if self.staging_directory is None:
+                self.staging_directory = Path(tempfile.mkdtemp(prefix=STAGING_DIR_PREFIX, dir=self.output_root))
+            file_path = self.staging_directory / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(content)
+            self.staged_files.append(relative_path)
+            self.written_files += 1
+        else:
+            logger.debug("File %s is unchanged and was not rewritten.", file_path)
+            self.unchanged_files += 1
+
+        if executable:
+            self._make_executable(file_path)
+        # The size and modification time are recorded once the file is in place
+        self.manifest[relative_path] = {"sha256": content_hash}
+        return written
+
+    def _make_executable(self, file_path: Path) -> None:
+        """
+        Allow everyone who can read the given file to execute it. This does not change its modification time.
+        :param file_path: The path of the file.
+        :return: None
+        """
+        mode: int = file_path.stat().st_mode
+        if mode & 0o111 != 0o111:
+            file_path.chmod(mode | (mode & 0o444) >> 2)
+
+    def _commit_staged_files(self) -> None:
+        """
+        Rename all staged files into place and record the size and modification time of every file in the manifest.
+        :return: None
+        """
+        for relative_path in self.staged_files:
+            file_path: Path = self.output_root / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.staging_directory / relative_path, file_path)
+        for relative_path, entry in self.manifest.items():
+            stat = (self.output_root / relative_path).stat()
+            entry["size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+
+    def _remove_stale_files(self) -> int:
+        """
+        Remove all files that were written by the previous run, but not by the current one.
+        Directories that become empty are removed as well, up to the output root.
+        :return: The number of removed files.
+        """
+        removed_files: int = 0
+        for relative_path in self.previous_manifest.keys() - self.manifest.keys():
+            file_path: Path = self.output_root / relative_path
+            # Never follow paths out of the output root, even if the manifest was tampered with
+            if not file_path.resolve().is_relative_to(self.output_root.resolve()):
+                logger.warning(f"Ignoring path {relative_path} outside of the output root in the manifest.")
+                continue
+            try:
+                file_path.unlink()
+            except FileNotFoundError:
+                continue
+            removed_files += 1
+            logger.debug("Removed stale file %s", file_path)
+
+            directory: Path = file_path.parent
+            while directory != self.output_root and not any(directory.iterdir()):
+                directory.rmdir()
+                logger.debug("Removed empty directory %s", directory)
+                directory = directory.parent
+        return removed_files
+
+    def close(self) -> None:
+        """
+        Finish writing the case: move the changed files into place, remove stale files, write the manifest for the
+        next run and release the lock on the output root.
+        :return: None
+        """
+        self._open()
+        try:
+            self._commit_staged_files()
+            removed_files: int = self._remove_stale_files()
+            manifest_path: Path = self.output_root / MANIFEST_FILE_NAME
+            _replace_file(manifest_path, lambda path: path.write_text(
+                json.dumps({"files": self.manifest}, indent=4, sort_keys=True)))
+            logger.debug("Manifest written to %s", manifest_path)
+        finally:
+            self.abort()
+        logger.info(f"Wrote {self.written_files} files to {self.output_root}, {self.unchanged_files} were unchanged "
+                    f"and {removed_files} stale files were removed.")
+
+    def abort(self) -> None:
+        """
+        Discard all staged files and release the lock on the output root.
+        :return: None
+        """
+        if self.staging_directory is not None:
+            shutil.rmtree(self.staging_directory, ignore_errors=True)
+            self.staging_directory = None
+        self.lock.release()
+        self.is_open = False
+
+
+class ArchiveWriter(CaseWriter):
+    """
+    A class that streams the files of a case into a single tar or zip archive, without writing any other files.
+    All files are placed in a top-level directory named after the archive, e.g., "case/" for "case.tar.gz".
+    The archive is streamed into a temporary file next to it, which only replaces the archive when the writer is closed.
+    This way, an existing archive is replaced atomically and an invalid topology leaves no archive behind.
+    """
+
+    def __init__(self, archive_path: Path):
+        """
+        Initialize an ArchiveWriter object.
+        :param archive_path: The path of the archive. Its suffix determines the format, see ARCHIVE_FORMATS.
+        """
+        super().__init__()
+        self.archive_path = Path(archive_path)
+        self.output_root = self.archive_path
+        self.archive_format: str = get_archive_format(self.archive_path)
+        # The name of the archive without its archive suffix
+        self.root_name: str = self.archive_path.name[:len(self.archive_path.name) - len(self._get_suffix())]
+        # All files get the time the case was generated
+        self.mtime: int = int(time.time())
+        self.archive: tarfile.TarFile | zipfile.ZipFile | None = None
+        # The temporary file the archive is streamed into
+        self.temp_path: Path | None = None
+        # Streams that have to be closed after the archive, e.g., for zstd compression
+        self.streams: list = []
+        self.written_files: int = 0
+
+    def _get_suffix(self) -> str:
+        """
+        Return the archive suffix of the archive path.
+        :return: The suffix, e.g., ".tar.gz".
+        """
+        name: str = self.archive_path.name.lower()
+        return max((suffix for suffix in ARCHIVE_FORMATS if name.endswith(suffix)), key=len)
+
+    def _open_archive(self) -> tarfile.TarFile | zipfile.ZipFile:
+        """
+        Open a temporary file next to the archive path for writing the archive.
+        :return: The opened archive.
+        """
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.archive_path.parent,
+                                                      prefix=f".{self.archive_path.name}.", suffix=".tmp")
+        os.close(file_descriptor)
+        self.temp_path = Path(temp_path)
+        if self.archive_format == "zip":
+            return zipfile.ZipFile(self.temp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        if self.archive_format != "zst" or "zst" in tarfile.TarFile.OPEN_METH:
+            return tarfile.open(self.temp_path, f"w:{self.archive_format}")
+
+        # Before Python 3.14, tarfile has no zstd support, so stream through the zstandard package
+        import zstandard
+
+        file = open(self.temp_path, "wb")
+        stream = zstandard.ZstdCompressor().stream_writer(file)
+        self.streams = [stream, file]
+        return tarfile.open(fileobj=stream, mode="w|")
+
+    def write_file(self, relative_path: Path | str, content: bytes, executable: bool = False) -> bool:
+        """
+        Add a file with the given content to the archive.
+        :param relative_path: The path of the file relative to the top-level directory of the archive.
+        :param content: The content of the file.
+        :param executable: If the file should be executable.
+        :return: True, since files are always written.
+        """
+        if self.archive is None:
+            self.archive = self._open_archive()
+        name: str = f"{self.root_name}/{Path(relative_path).as_posix()}"
+        mode: int = EXECUTABLE_FILE_MODE if executable else FILE_MODE
+
+        if isinstance(self.archive, zipfile.ZipFile):
+            info = zipfile.ZipInfo(name, date_time=time.localtime(self.mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # The upper 16 bits hold the Unix file type and permissions
+            info.external_attr = (0o100000 | mode) << 16
+            self.archive.writestr(info, content)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = mode
+            info.mtime = self.mtime
+            self.archive.addfile(info, io.BytesIO(content))
+        self.written_files += 1
+        return True
+
+    def close(self) -> None:
+        """
+        Finish writing the archive.
+        :return: None
+        """
+        if self.archive is None:
+            self.archive = self._open_archive()
+        try:
+            self._close_archive()
+            # mkstemp creates files only readable by the owner
+            self.temp_path.chmod(FILE_MODE)
+            os.replace(self.temp_path, self.archive_path)
+            self.temp_path = None
+        finally:
+            self.abort()
+        logger.info(f"Wrote {self.written_files} files to archive {self.archive_path}.")
+
+    def _close_archive(self) -> None:
+        """
+        Close the archive and all underlying streams, if they are open.
+        :return: None
+        """
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+        for stream in self.streams:
+            stream.close()
+        self.streams = []
+
+    def abort(self) -> None:
+        """
+        Discard the temporary file of the archive, leaving any existing archive untouched.
+        :return: None
+        """
+        self._close_archive()
+        if self.temp_path is not None:
+            self.temp_path.unlink(missing_ok=True)
+            self.temp_path = None
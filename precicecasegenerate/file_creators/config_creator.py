@@ -1,13 +1,178 @@
+import io
 import logging
-import subprocess
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
 from precice_config_graph import nodes as n
-import precice_config_graph.graph.operations as operations
 
 import precicecasegenerate.helper as helper
+from precicecasegenerate.file_creators import config_serializer
+from precicecasegenerate.file_creators.case_writer import CaseWriter
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 logger = logging.getLogger(__name__)
 
+# Version of precice-config-graph whose graph builder is mirrored by create_config_graph. The dependency is pinned to
+# this version, since new edges or node types of the builder would not be added to the graph otherwise
+CONFIG_GRAPH_VERSION: str = "3.0.0"
+# Return code of the validation if precice-config-check is not installed, such that the configuration cannot be checked
+CONFIG_CHECK_MISSING: int = 3
+
+
+def create_config_graph(config_topology: dict[str, list[n.ParticipantNode] | list[n.DataNode] | list[n.MeshNode]
+                                                   | list[n.CouplingSchemeNode] | list[n.MultiCouplingSchemeNode]
+                                                   | list[n.M2NNode]]) -> "nx.Graph":
+    """
+    Create the graph of a preCICE configuration directly from its nodes.
+    The graph equals the one precice_config_graph.graph.builder.get_graph() creates from the XML of the configuration,
+    but the configuration does not have to be written and parsed again. The library only builds graphs from XML, so
+    its edges are mirrored here for the version CONFIG_GRAPH_VERSION.
+    :param config_topology: A dict that contains participants, data nodes, meshes, coupling-schemes and M2N nodes.
+    :return: An undirected graph of all nodes of the configuration.
+    """
+    # Imported here, since importing networkx noticeably slows down writing the configuration, which needs no graph
+    import networkx as nx
+    from precice_config_graph.edges import Edge
+    from precice_config_graph.graph.builder import add_node_with_attributes
+
+    g: nx.Graph = nx.Graph()
+
+    for data in config_topology["data"]:
+        add_node_with_attributes(g, data)
+
+    for mesh in config_topology["meshes"]:
+        add_node_with_attributes(g, mesh)
+        for data in mesh.use_data:
+            g.add_edge(data, mesh, attr=Edge.USE_DATA)
+
+    for participant in config_topology["participants"]:
+        add_node_with_attributes(g, participant)
+        for mesh in participant.provide_meshes:
+            g.add_edge(participant, mesh, attr=Edge.PROVIDE_MESH__PARTICIPANT_PROVIDES)
+
+    # The other nodes only exist as children of participants and coupling-schemes
+    for participant in config_topology["participants"]:
+        for read_data in participant.read_data:
+            add_node_with_attributes(g, read_data)
+            g.add_edge(read_data, read_data.data, attr=Edge.READ_DATA__DATA_READ_BY)
+            g.add_edge(read_data, read_data.mesh, attr=Edge.READ_DATA__MESH_READ_BY)
+            g.add_edge(read_data, read_data.participant, attr=Edge.READ_DATA__PARTICIPANT__BELONGS_TO)
+
+        for write_data in participant.write_data:
+            add_node_with_attributes(g, write_data)
+            g.add_edge(write_data, write_data.data, attr=Edge.WRITE_DATA__WRITES_TO_DATA)
+            g.add_edge(write_data, write_data.mesh, attr=Edge.WRITE_DATA__WRITES_TO_MESH)
+            g.add_edge(write_data, write_data.participant, attr=Edge.WRITE_DATA__PARTICIPANT__BELONGS_TO)
+
+        for receive_mesh in participant.receive_meshes:
+            add_node_with_attributes(g, receive_mesh)
+            g.add_edge(receive_mesh, receive_mesh.mesh, attr=Edge.RECEIVE_MESH__MESH)
+            g.add_edge(receive_mesh, receive_mesh.from_participant, attr=Edge.RECEIVE_MESH__PARTICIPANT_RECEIVED_FROM)
+            g.add_edge(receive_mesh, receive_mesh.participant, attr=Edge.RECEIVE_MESH__PARTICIPANT__BELONGS_TO)
+
+        for mapping in participant.mappings:
+            add_node_with_attributes(g, mapping)
+            if mapping.from_mesh:
+                g.add_edge(mapping, mapping.from_mesh, attr=Edge.MAPPING__FROM_MESH)
+            if mapping.to_mesh:
+                g.add_edge(mapping, mapping.to_mesh, attr=Edge.MAPPING__TO_MESH)
+            g.add_edge(mapping, mapping.parent_participant, attr=Edge.MAPPING__PARTICIPANT__BELONGS_TO)
+
+        for export in participant.exports:
+            add_node_with_attributes(g, export)
+            g.add_edge(export, export.participant, attr=Edge.EXPORT__PARTICIPANT__BELONGS_TO)
+
+        for action in participant.actions:
+            add_node_with_attributes(g, action)
+            g.add_edge(action, action.participant, attr=Edge.ACTION__PARTICIPANT__BELONGS_TO)
+            g.add_edge(action, action.mesh, attr=Edge.ACTION__MESH)
+            if action.target_data is not None:
+                g.add_edge(action, action.target_data, attr=Edge.ACTION__TARGET_DATA)
+            for source_data in action.source_data:
+                g.add_edge(action, source_data, attr=Edge.ACTION__SOURCE_DATA)
+
+        for watch_point in participant.watchpoints:
+            add_node_with_attributes(g, watch_point)
+            g.add_edge(watch_point, watch_point.participant, attr=Edge.WATCH_POINT__PARTICIPANT__BELONGS_TO)
+            g.add_edge(watch_point, watch_point.mesh, attr=Edge.WATCH_POINT__MESH)
+
+        for watch_integral in participant.watch_integrals:
+            add_node_with_attributes(g, watch_integral)
+            g.add_edge(watch_integral, watch_integral.participant, attr=Edge.WATCH_INTEGRAL__PARTICIPANT__BELONGS_TO)
+            g.add_edge(watch_integral, watch_integral.mesh, attr=Edge.WATCH_INTEGRAL__MESH)
+
+    for coupling_scheme in config_topology["coupling-schemes"]:
+        add_node_with_attributes(g, coupling_scheme)
+        if isinstance(coupling_scheme, n.MultiCouplingSchemeNode):
+            for participant in coupling_scheme.participants:
+                g.add_edge(coupling_scheme, participant, attr=Edge.MULTI_COUPLING_SCHEME__PARTICIPANT)
+            # Overwrites the regular participant edge of the control participant
+            g.add_edge(coupling_scheme, coupling_scheme.control_participant,
+                       attr=Edge.MULTI_COUPLING_SCHEME__PARTICIPANT__CONTROL)
+        else:
+            g.add_edge(coupling_scheme, coupling_scheme.first_participant, attr=Edge.COUPLING_SCHEME__PARTICIPANT_FIRST)
+            g.add_edge(coupling_scheme, coupling_scheme.second_participant,
+                       attr=Edge.COUPLING_SCHEME__PARTICIPANT_SECOND)
+
+    for coupling_scheme in config_topology["coupling-schemes"]:
+        for exchange in coupling_scheme.exchanges:
+            add_node_with_attributes(g, exchange)
+            g.add_edge(exchange, exchange.from_participant, attr=Edge.EXCHANGE__EXCHANGED_FROM)
+            g.add_edge(exchange, exchange.to_participant, attr=Edge.EXCHANGE__EXCHANGES_TO)
+            g.add_edge(exchange, exchange.data, attr=Edge.EXCHANGE__DATA)
+            g.add_edge(exchange, exchange.mesh, attr=Edge.EXCHANGE__MESH)
+            g.add_edge(exchange, exchange.coupling_scheme, attr=Edge.EXCHANGE__COUPLING_SCHEME__BELONGS_TO)
+
+    for coupling_scheme in config_topology["coupling-schemes"]:
+        acceleration: n.AccelerationNode | None = coupling_scheme.acceleration
+        if acceleration is not None:
+            add_node_with_attributes(g, acceleration)
+            g.add_edge(acceleration, acceleration.coupling_scheme, attr=Edge.ACCELERATION__COUPLING_SCHEME__BELONGS_TO)
+            for acceleration_data in acceleration.data:
+                add_node_with_attributes(g, acceleration_data)
+                g.add_edge(acceleration_data, acceleration_data.acceleration,
+                           attr=Edge.ACCELERATION_DATA__ACCELERATION__BELONGS_TO)
+                g.add_edge(acceleration_data, acceleration_data.data, attr=Edge.ACCELERATION_DATA__DATA)
+                g.add_edge(acceleration_data, acceleration_data.mesh, attr=Edge.ACCELERATION_DATA__MESH)
+
+        for convergence_measure in coupling_scheme.convergence_measures:
+            add_node_with_attributes(g, convergence_measure)
+            g.add_edge(convergence_measure, convergence_measure.coupling_scheme,
+                       attr=Edge.CONVERGENCE_MEASURE__COUPLING_SCHEME__BELONGS_TO)
+            g.add_edge(convergence_measure, convergence_measure.data, attr=Edge.CONVERGENCE_MEASURE__DATA)
+            g.add_edge(convergence_measure, convergence_measure.mesh, attr=Edge.CONVERGENCE_MEASURE__MESH)
+
+    for m2n in config_topology["m2n"]:
+        add_node_with_attributes(g, m2n)
+        g.add_edge(m2n, m2n.acceptor, attr=Edge.M2N__PARTICIPANT_ACCEPTOR)
+        g.add_edge(m2n, m2n.connector, attr=Edge.M2N__PARTICIPANT_CONNECTOR)
+
+    return g
+
+
+def check_config_graph(graph: "nx.Graph") -> list[str]:
+    """
+    Check the graph of a preCICE configuration with all rules of precice-config-check.
+    :param graph: The graph of the configuration.
+    :return: A list of the formatted violations of all rules that are not satisfied. Empty if all rules are satisfied.
+    """
+    # precice-config-check is an optional dependency, which also prints its results when importing its CLI
+    from preciceconfigcheck.rules_processing import rules
+
+    violations: list[str] = []
+    for rule in rules:
+        rule_violations = rule.check(graph)
+        if rule.satisfied(rule_violations, False):
+            continue
+        violations.append(rule.name)
+        for violation in rule_violations:
+            formatted_violation: str | None = violation.format(False)
+            if formatted_violation:
+                violations.append(formatted_violation)
+    return violations
+
 
 class ConfigCreator:
     """
@@ -23,45 +188,115 @@ class ConfigCreator:
         """
         self.config_topology = config_topology
 
-    def validate_config_file(self, filepath: Path = "./precice-config.xml") -> None:
+    def validate_config(self) -> int:
+        """
+        Validate the preCICE configuration with the rules of precice-config-check.
+        The rules are checked in-process on a graph created directly from the nodes of the configuration,
+        instead of writing the configuration, starting precice-config-check and parsing the configuration again.
+        The return codes are the same as the ones of precice-config-check.
+        :return: 0 if the configuration is valid, 1 if its graph cannot be created (i.e., there are syntactic errors),
+            2 if it violates a rule (i.e., there are logical errors), CONFIG_CHECK_MISSING if precice-config-check
+            is not installed.
+        """
+        try:
+            graph: nx.Graph = create_config_graph(self.config_topology)
+        except (AttributeError, KeyError, TypeError) as e:
+            return self._log_validation_result(1, [f"Could not create the graph of the configuration: {e!r}"])
+        return self._check_graph(graph)
+
+    def validate_config_file(self, filepath: Path = "./precice-config.xml") -> int:
         """
-        Validate the preCICE configuration file at the given filepath using precice-config-check.
-        The subprocess precice-config-check only checks for logical errors and will crash if there are syntactic errors.
-        This means, however, that to pass this check, the configuration file must be syntactically and logically correct :)
+        Validate the preCICE configuration file at the given filepath with the rules of precice-config-check.
+        The file is parsed and checked in-process instead of starting precice-config-check.
+        To pass this check, the configuration file must be syntactically and logically correct :)
         :param filepath: The path to the preCICE configuration file.
+        :return: 0 if the configuration is valid, 1 if it cannot be parsed (i.e., there are syntactic errors),
+            2 if it violates a rule (i.e., there are logical errors), CONFIG_CHECK_MISSING if precice-config-check
+            is not installed.
         """
-        result = subprocess.run(
-            ["precice-config-check", filepath],
-            capture_output=True,  # capture stdout/stderr
-            text=True  # return strings instead of bytes
-        )
+        from precice_config_graph import xml_processing
+        from precice_config_graph.graph import builder
+
+        try:
+            graph: nx.Graph = builder.get_graph(xml_processing.parse_file(filepath))
+        except SystemExit as e:
+            # The graph builder exits the program if the configuration contains syntactic errors
+            return self._log_validation_result(1, str(e.code).splitlines())
+        except Exception as e:
+            return self._log_validation_result(1, [f"Could not parse {filepath}: {e!r}"])
+        return self._check_graph(graph)
+
+    def _check_graph(self, graph: "nx.Graph") -> int:
+        """
+        Check the graph of the configuration with the rules of precice-config-check and log the result.
+        Since the validation was asked for, a missing precice-config-check is an error instead of a silent success.
+        :param graph: The graph of the configuration.
+        :return: 0 if the configuration is valid, 2 if it violates a rule, CONFIG_CHECK_MISSING if it cannot be checked.
+        """
+        try:
+            violations: list[str] = check_config_graph(graph)
+        except ImportError:
+            logger.error("Validating the preCICE configuration requires precice-config-check, which is not installed. "
+                         "It can be installed with pip install precice-case-generate[validate].")
+            return CONFIG_CHECK_MISSING
+        return self._log_validation_result(2 if violations else 0, violations)
+
+    def _log_validation_result(self, return_code: int, messages: list[str]) -> int:
+        """
+        Log the result of validating the configuration.
+        :param return_code: 0 if the configuration is valid, 1 for syntactic and 2 for logical errors.
+        :param messages: The lines describing the errors.
+        :return: The given return code.
+        """
+        quoted_messages: str = "".join(f"> {line}\n" for line in messages)
         # Output = 0 means everything went fine
-        if result.returncode == 0:
-            logger.debug("preCICE configuration file has been validated with precice-config-check.")
-        # Output = 1 means the file was not parsed correctly
-        elif result.returncode == 1:
+        if return_code == 0:
+            logger.debug("preCICE configuration has been validated with precice-config-check.")
+        # Output = 1 means the configuration was not parsed correctly
+        elif return_code == 1:
             logger.error(
-                f"The generated preCICE configuration file failed to validate with precice-config-check due to syntactic errors:\n"
-                f"{''.join('> ' + line for line in result.stderr.splitlines(keepends=True))}\n"
+                f"The generated preCICE configuration failed to validate with precice-config-check due to syntactic errors:\n"
+                f"{quoted_messages}\n"
                 f"This is likely an error within this program. Please visit {helper.case_generate_repository_url} for more help.")
-        # Output = 2 means the file was parsed correctly but contains logical errors
-        elif result.returncode == 2:
+        # Output = 2 means the configuration was parsed correctly but contains logical errors
+        elif return_code == 2:
             logger.error(
-                f"The generated preCICE configuration file failed to validate with precice-config-check due to logical errors:\n"
-                f"{''.join('> ' + line for line in result.stdout.splitlines(keepends=True))}\n"
+                f"The generated preCICE configuration failed to validate with precice-config-check due to logical errors:\n"
+                f"{quoted_messages}\n"
                 f"This is likely an error within this program. "
                 f"You can either try to fix the configuration file yourself or visit "
                 f"{helper.case_generate_repository_url} for more help.")
+        return return_code
+
+    def write_config(self, stream: TextIO) -> None:
+        """
+        Write the formatted preCICE configuration file to the given stream, one top-level element at a time.
+        The output is the same as the one of precice_config_graph.graph.operations.create_config_file_from_dict,
+        without building the whole document as a string and an XML tree first.
+        :param stream: The text stream to write to.
+        """
+        config_serializer.write_config(self.config_topology, stream)
+
+    def create_config_str(self) -> str:
+        """
+        Create a string representing the formatted preCICE configuration file.
+        :return: A string representing the preCICE configuration file.
+        """
+        buffer: io.StringIO = io.StringIO()
+        self.write_config(buffer)
+        return buffer.getvalue()
 
-    def create_config_file(self, directory: Path = ".", filename: str = "precice-config.xml") -> None:
+    def create_config_file(self, writer: CaseWriter, filename: str = "precice-config.xml") -> None:
         """
         Create a configuration file.
-        The file is saved in the given directory with the given filename.
-        :param directory: The directory to save the file in.
+        The file is saved in the output root of the given writer with the given filename.
+        :param writer: The writer to save the file with.
         :param filename: The filename of the file.
         """
-        # Convert to Path object just in case
-        directory = Path(directory)
-        file_path: Path = directory / filename
-        operations.create_config_file_from_dict(self.config_topology, path=directory, filename=filename)
-        logger.info(f"preCICE configuration file written to {file_path}")
+        # Encode the elements while they are written, instead of encoding the whole document afterwards
+        stream: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\n")
+        self.write_config(stream)
+        stream.flush()
+        buffer: io.BytesIO = stream.detach()
+        writer.write_file(filename, buffer.getvalue())
+        logger.info(f"preCICE configuration file written to {writer.output_root / filename}")
@@ -0,0 +1,336 @@
+"""
+This file contains methods to serialize the nodes of a preCICE configuration directly into a formatted
+precice-config.xml. The output is the same as the one of precice_config_graph.graph.operations._create_config_str(),
+which concatenates the XML strings of all nodes, parses them again with lxml and formats the resulting tree with
+precice-config-format. Here, the elements of one top-level node at a time are formatted and written to a stream.
+"""
+
+import logging
+from itertools import chain
+from typing import Iterable, Iterator, TextIO
+from xml.sax.saxutils import escape
+
+from precice_config_graph import nodes as n
+from precice_config_graph import enums as e
+
+import precicecasegenerate.helper as helper
+
+logger = logging.getLogger(__name__)
+
+# An XML element given by its tag, its attributes in order and its child elements
+Element = tuple[str, list[tuple[str, str]], list["Element"]]
+
+XML_DECLARATION: str = '<?xml version="1.0" encoding="UTF-8" ?>'
+ROOT_TAG: str = "precice-configuration"
+LOG_ELEMENT: Element = ("log", [], [("sink", [("format", "---[precice] %ColorizedSeverity% %Message%")], [])])
+
+# Characters that are escaped in attribute values in addition to "&", "<" and ">", like lxml escapes them
+ATTRIBUTE_ENTITIES: dict[str, str] = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+# Mapping methods that have further attributes or child elements
+RBF_DEAD_AXES_METHODS: tuple[e.MappingMethod, ...] = (e.MappingMethod.RBF, e.MappingMethod.RBF_GLOBAL_DIRECT,
+                                                      e.MappingMethod.RBF_GLOBAL_ITERATIVE)
+RBF_POLYNOMIAL_METHODS: tuple[e.MappingMethod, ...] = (e.MappingMethod.RBF_GLOBAL_DIRECT,
+                                                       e.MappingMethod.RBF_GLOBAL_ITERATIVE,
+                                                       e.MappingMethod.RBF_PUM_DIRECT)
+RBF_METHODS: tuple[e.MappingMethod, ...] = (e.MappingMethod.RBF_GLOBAL_ITERATIVE, e.MappingMethod.RBF_GLOBAL_DIRECT,
+                                            e.MappingMethod.RBF_PUM_DIRECT, e.MappingMethod.RBF)
+MULTISCALE_METHODS: tuple[e.MappingMethod, ...] = (e.MappingMethod.AXIAL_GEOMETRIC_MULTISCALE,
+                                                   e.MappingMethod.RADIAL_GEOMETRIC_MULTISCALE)
+# Basis functions that have a support-radius or shape-parameter attribute
+SUPPORT_RADIUS_BASIS_FUNCTIONS: tuple[e.MappingBasisFunctionType, ...] = (
+    e.MappingBasisFunctionType.COMPACT_POLYNOMIAL_C0, e.MappingBasisFunctionType.COMPACT_POLYNOMIAL_C2,
+    e.MappingBasisFunctionType.COMPACT_POLYNOMIAL_C4, e.MappingBasisFunctionType.COMPACT_POLYNOMIAL_C6,
+    e.MappingBasisFunctionType.COMPACT_POLYNOMIAL_C8, e.MappingBasisFunctionType.COMPACT_TPS_C2,
+    e.MappingBasisFunctionType.GAUSSIAN)
+SHAPE_PARAMETER_BASIS_FUNCTIONS: tuple[e.MappingBasisFunctionType, ...] = (
+    e.MappingBasisFunctionType.MULTIQUADRICS, e.MappingBasisFunctionType.INVERSE_MULTIQUADRICS,
+    e.MappingBasisFunctionType.GAUSSIAN)
+
+
+def write_config(config_topology: dict[str, list[n.ParticipantNode] | list[n.DataNode] | list[n.MeshNode]
+                                                | list[n.CouplingSchemeNode] | list[n.MultiCouplingSchemeNode]
+                                                | list[n.M2NNode]], stream: TextIO) -> None:
+    """
+    Write the formatted precice-config.xml of the given nodes to the given stream.
+    Only the elements of a single top-level node are held in memory at once.
+    :param config_topology: A dict that contains participants, data nodes, meshes, coupling-schemes and M2N nodes.
+    :param stream: The text stream to write to, e.g., a file or an io.StringIO.
+    :return: None
+    """
+    elements: Iterator[Element] = chain(
+        (LOG_ELEMENT,),
+        (_data_element(data) for data in config_topology["data"]),
+        (_mesh_element(mesh) for mesh in config_topology["meshes"]),
+        (_participant_element(participant) for participant in config_topology["participants"]),
+        (_m2n_element(m2n) for m2n in config_topology["m2n"]),
+        (_coupling_scheme_element(coupling_scheme) for coupling_scheme in config_topology["coupling-schemes"]),
+    )
+    stream.write(f"{XML_DECLARATION}\n<{ROOT_TAG}>\n")
+    _write_top_level_elements(elements, stream)
+    stream.write(f"</{ROOT_TAG}>\n")
+
+
+def _write_top_level_elements(elements: Iterable[Element], stream: TextIO) -> None:
+    """
+    Write the children of the root element, separated like precice-config-format separates them:
+    Consecutive elements whose tags have the same prefix, e.g., "data" for "data:scalar" and "data:vector",
+    form a group. If the first element of a group has no children, the group is written as a block.
+    Otherwise, every element of the group is a block on its own. Blocks are separated by an empty line.
+    :param elements: The children of the root element.
+    :param stream: The text stream to write to.
+    :return: None
+    """
+    previous_prefix: str | None = None
+    is_block: bool = False
+    for element in elements:
+        prefix: str = element[0].split(":")[0]
+        if prefix != previous_prefix:
+            if previous_prefix is not None:
+                stream.write("\n")
+            previous_prefix = prefix
+            is_block = not element[2]
+        elif not is_block:
+            stream.write("\n")
+        _write_element(element, 1, stream)
+
+
+def _write_element(element: Element, level: int, stream: TextIO) -> None:
+    """
+    Write an element and all its children, where attributes are written on separate lines if the element
+    does not fit into a single line.
+    :param element: The element to write.
+    :param level: The level of indentation of the element.
+    :param stream: The text stream to write to.
+    :return: None
+    """
+    tag, attributes, children = element
+    indent: str = helper.CONFIG_INDENT * level
+    # The ending of the opening tag of empty elements
+    tag_end: str = ">" if children else " />"
+    if not attributes:
+        stream.write(f"{indent}<{tag}{tag_end}\n")
+    else:
+        # Names may contain any character, so values are escaped to keep the configuration well-formed
+        attribute_strs: list[str] = [f'{key}="{escape(str(value), ATTRIBUTE_ENTITIES)}"' for key, value in attributes]
+        # This is the length of "<tag attributes>" or "<tag attributes />" as computed by precice-config-format
+        element_length: int = 3 + len(tag) + sum(map(len, attribute_strs)) + len(attribute_strs) - 1
+        if not children:
+            element_length += 2
+        if element_length + len(indent) <= helper.CONFIG_MAX_WIDTH:
+            stream.write(f"{indent}<{tag} {' '.join(attribute_strs)}{tag_end}\n")
+        else:
+            attribute_indent: str = indent + helper.CONFIG_INDENT
+            stream.write(f"{indent}<{tag}\n")
+            stream.write("\n".join(attribute_indent + attribute_str for attribute_str in attribute_strs))
+            stream.write(f"{tag_end}\n")
+    if children:
+        for child in children:
+            _write_element(child, level + 1, stream)
+        stream.write(f"{indent}</{tag}>\n")
+
+
+def _data_element(data: n.DataNode) -> Element:
+    """
+    Create the element of the given data node, like its to_xml() method.
+    :param data: The data node.
+    :return: An Element representing the data:* element.
+    """
+    return f"data:{data.data_type.value}", [("name", data.name)], []
+
+
+def _mesh_element(mesh: n.MeshNode) -> Element:
+    """
+    Create the element of the given mesh node, like its to_xml() method.
+    :param mesh: The mesh node.
+    :return: An Element representing the mesh element.
+    """
+    return ("mesh", [("name", mesh.name), ("dimensions", str(mesh.dimensions))],
+            [("use-data", [("name", data.name)], []) for data in mesh.use_data])
+
+
+def _participant_element(participant: n.ParticipantNode) -> Element:
+    """
+    Create the element of the given participant node, like its to_xml() method.
+    :param participant: The participant node.
+    :return: An Element representing the participant element.
+    """
+    children: list[Element] = [("provide-mesh", [("name", mesh.name)], []) for mesh in participant.provide_meshes]
+    for receive_mesh in participant.receive_meshes:
+        attributes: list[tuple[str, str]] = [("name", receive_mesh.mesh.name),
+                                             ("from", receive_mesh.from_participant.name)]
+        if receive_mesh.api_access:
+            attributes.append(("api-access", "true"))
+        children.append(("receive-mesh", attributes, []))
+    children.extend(("read-data", [("name", read_data.data.name), ("mesh", read_data.mesh.name)], [])
+                    for read_data in participant.read_data)
+    children.extend(("write-data", [("name", write_data.data.name), ("mesh", write_data.mesh.name)], [])
+                    for write_data in participant.write_data)
+    children.extend(_mapping_element(mapping) for mapping in participant.mappings)
+    children.extend(_action_element(action) for action in participant.actions)
+    children.extend((f"export:{export.format.value}", [("directory", export.directory)], [])
+                    for export in participant.exports)
+    children.extend(("watch-point", [("name", watch_point.name), ("mesh", watch_point.mesh.name),
+                                     ("coordinate", ";".join(map(str, watch_point.coordinate)))], [])
+                    for watch_point in participant.watchpoints)
+    children.extend(("watch-integral", [("name", watch_integral.name), ("mesh", watch_integral.mesh.name),
+                                        ("scale-with-connectivity", str(watch_integral.scale_with_connectivity))], [])
+                    for watch_integral in participant.watch_integrals)
+    return "participant", [("name", participant.name)], children
+
+
+def _mapping_element(mapping: n.MappingNode) -> Element:
+    """
+    Create the element of the given mapping node, like its to_xml() method.
+    Unlike MappingNode.to_xml(), which closes the mapping:* element of RBF mappings before their executor:* and
+    basis-function:* elements, these are written inside the mapping. The NodeCreator does not create RBF mappings.
+    :param mapping: The mapping node.
+    :return: An Element representing the mapping:* element.
+    """
+    attributes: list[tuple[str, str]] = [("direction", mapping.direction.value)]
+    # For a just-in-time mapping, either "from" or "to" is not specified
+    if mapping.from_mesh:
+        attributes.append(("from", mapping.from_mesh.name))
+    if mapping.to_mesh:
+        attributes.append(("to", mapping.to_mesh.name))
+    attributes.append(("constraint", mapping.constraint.value))
+    if mapping.method in RBF_DEAD_AXES_METHODS:
+        attributes.extend((("x-dead", str(mapping.x_dead)), ("y-dead", str(mapping.y_dead)),
+                           ("z-dead", str(mapping.z_dead))))
+    if mapping.method in RBF_POLYNOMIAL_METHODS:
+        attributes.append(("polynomial", mapping.polynomial.value))
+    if mapping.method == e.MappingMethod.RBF_PUM_DIRECT:
+        attributes.extend((("vertices-per-cluster", str(mapping.vertices_per_cluster)),
+                           ("relative-overlap", str(mapping.relative_overlap)),
+                           ("project-to-input", str(mapping.project_to_input))))
+    if mapping.method in MULTISCALE_METHODS:
+        attributes.extend((("multiscale-type", mapping.multiscale_type.value),
+                           ("multiscale-axis", mapping.multiscale_axis.value),
+                           ("multiscale-radius", str(mapping.multiscale_radius))))
+    children: list[Element] = []
+    if mapping.method in RBF_METHODS:
+        children = [_executor_element(mapping.executor), _basis_function_element(mapping.basisfunction)]
+    return f"mapping:{mapping.method.value}", attributes, children
+
+
+def _executor_element(executor: n.MappingExecutorNode) -> Element:
+    """
+    Create the element of the given executor node of a mapping, like its to_xml() method.
+    :param executor: The executor node of a mapping.
+    :return: An Element representing the executor:* element.
+    """
+    attributes: list[tuple[str, str]] = []
+    if executor.type == e.MappingExecutorType.OPENMP:
+        attributes.append(("n-threads", str(executor.n_threads)))
+    if executor.type in (e.MappingExecutorType.CUDA, e.MappingExecutorType.HIP):
+        attributes.append(("gpu-device-id", str(executor.gpu_device_id)))
+    return f"executor:{executor.type.value}", attributes, []
+
+
+def _basis_function_element(basis_function: n.MappingBasisFunctionNode) -> Element:
+    """
+    Create the element of the given basis-function node of a mapping, like its to_xml() method.
+    :param basis_function: The basis-function node of a mapping.
+    :return: An Element representing the basis-function:* element.
+    """
+    attributes: list[tuple[str, str]] = []
+    if basis_function.type in SHAPE_PARAMETER_BASIS_FUNCTIONS:
+        attributes.append(("shape-parameter", str(basis_function.shape_parameter)))
+    if basis_function.type in SUPPORT_RADIUS_BASIS_FUNCTIONS:
+        attributes.append(("support-radius", str(basis_function.support_radius)))
+    return f"basis-function:{basis_function.type.value}", attributes, []
+
+
+def _action_element(action: n.ActionNode) -> Element:
+    """
+    Create the element of the given action node, like its to_xml() method.
+    :param action: The action node.
+    :return: An Element representing the action:* element.
+    """
+    children: list[Element] = []
+    if action.type != e.ActionType.RECORDER and action.target_data is not None:
+        children.append(("target-data", [("name", action.target_data.name)], []))
+    if action.type == e.ActionType.PYTHON:
+        children.append(("path", [("name", action.python_module_path)], []))
+        children.append(("module", [("name", action.python_module_name)], []))
+    children.extend(("source-data", [("name", source_data.name)], []) for source_data in action.source_data)
+    return f"action:{action.type.value}", [("mesh", action.mesh.name), ("timing", action.timing.value)], children
+
+
+def _m2n_element(m2n: n.M2NNode) -> Element:
+    """
+    Create the element of the given M2N node, like its to_xml() method.
+    :param m2n: The M2N node.
+    :return: An Element representing the m2n:* element.
+    """
+    return (f"m2n:{m2n.type.value}", [("acceptor", m2n.acceptor.name), ("connector", m2n.connector.name),
+                                      ("exchange-directory", m2n.directory)], [])
+
+
+def _coupling_scheme_element(coupling_scheme: n.CouplingSchemeNode | n.MultiCouplingSchemeNode) -> Element:
+    """
+    Create the element of the given coupling-scheme node, like its to_xml() method.
+    :param coupling_scheme: The coupling-scheme node.
+    :return: An Element representing the coupling-scheme:* element.
+    """
+    if isinstance(coupling_scheme, n.MultiCouplingSchemeNode):
+        tag: str = "coupling-scheme:multi"
+        children: list[Element] = [
+            ("participant", [("name", participant.name), ("control", "yes")]
+             if participant == coupling_scheme.control_participant else [("name", participant.name)], [])
+            for participant in coupling_scheme.participants]
+    else:
+        tag = f"coupling-scheme:{coupling_scheme.type.value}"
+        children = [("participants", [("first", coupling_scheme.first_participant.name),
+                                      ("second", coupling_scheme.second_participant.name)], [])]
+    children.extend(("exchange", [("data", exchange.data.name), ("mesh", exchange.mesh.name),
+                                  ("from", exchange.from_participant.name), ("to", exchange.to_participant.name)], [])
+                    for exchange in coupling_scheme.exchanges)
+    children.append(("time-window-size", [("value", str(coupling_scheme.time_window_size))], []))
+    children.append(("max-time-windows", [("value", str(coupling_scheme.max_time_windows))], []))
+    children.extend(_convergence_measure_element(convergence_measure)
+                    for convergence_measure in coupling_scheme.convergence_measures)
+    if coupling_scheme.acceleration is not None:
+        children.append(_acceleration_element(coupling_scheme.acceleration))
+    return tag, [], children
+
+
+def _convergence_measure_element(convergence_measure: n.ConvergenceMeasureNode) -> Element:
+    """
+    Create the element of the given convergence-measure node, like its to_xml() method.
+    :param convergence_measure: The convergence-measure node.
+    :return: An Element representing the *-convergence-measure element.
+    """
+    attributes: list[tuple[str, str]] = [("data", convergence_measure.data.name),
+                                         ("mesh", convergence_measure.mesh.name)]
+    if convergence_measure.type in (e.ConvergenceMeasureType.ABSOLUTE, e.ConvergenceMeasureType.RESIDUAL_RELATIVE):
+        attributes.append(("limit", str(convergence_measure.limit)))
+    elif convergence_measure.type == e.ConvergenceMeasureType.RELATIVE:
+        attributes.append(("limit", str(convergence_measure.rel_limit)))
+    elif convergence_measure.type == e.ConvergenceMeasureType.ABSOLUTE_OR_RELATIVE:
+        attributes.extend((("abs-limit", str(convergence_measure.limit)),
+                           ("rel-limit", str(convergence_measure.rel_limit))))
+    return f"{convergence_measure.type.value}-convergence-measure", attributes, []
+
+
+def _acceleration_element(acceleration: n.AccelerationNode) -> Element:
+    """
+    Create the element of the given acceleration node, like its to_xml() method.
+    :param acceleration: The acceleration node.
+    :return: An Element representing the acceleration:* element.
+    """
+    children: list[Element] = [("data", [("name", data.data.name), ("mesh", data.mesh.name)], [])
+                               for data in acceleration.data]
+    if acceleration.preconditioner is not None:
+        preconditioner: n.PreconditionerNode = acceleration.preconditioner
+        attributes: list[tuple[str, str]] = [("type", preconditioner.type.value),
+                                             ("freeze-after", str(preconditioner.freeze_after))]
+        if acceleration.type != e.AccelerationType.AITKEN:
+            attributes.append(("update-on-threshold", str(preconditioner.update_on_threshold)))
+        children.append(("preconditioner", attributes, []))
+    if acceleration.type == e.AccelerationType.CONSTANT:
+        children.append(("relaxation", [("value", "1")], []))
+    if acceleration.filter is not None:
+        children.append(("filter", [("type", acceleration.filter.type.value),
+                                    ("limit", str(acceleration.filter.limit))], []))
+    return f"acceleration:{acceleration.type.value}", [], children
@@ -1,14 +1,33 @@
 import logging
-import shutil
+from functools import cache
 from pathlib import Path
-from importlib.resources import files, as_file
+from importlib.resources import files
 
 from precice_config_graph import nodes as n
 
 import precicecasegenerate.helper as helper
+from precicecasegenerate.file_creators.case_writer import CaseWriter
 
 logger = logging.getLogger(__name__)
 
+TEMPLATES_PACKAGE: str = "precicecasegenerate.templates"
+RUN_FILE_NAME: str = "run.sh"
+CLEAN_FILE_NAME: str = "clean.sh"
+
+
+@cache
+def get_template(filename: str) -> bytes:
+    """
+    Return the content of the template file with the given name in precicecasegenerate/templates/.
+    The package resource is only looked up and read once per process; every further call returns the same bytes,
+    such that a case with many participants writes all its run files from memory.
+    :param filename: The name of the template file.
+    :return: The content of the template file.
+    """
+    content: bytes = (files(TEMPLATES_PACKAGE) / filename).read_bytes()
+    logger.debug("Read template %s with %d bytes.", filename, len(content))
+    return content
+
 
 class UtilityFileCreator:
     """
@@ -23,80 +42,58 @@ class UtilityFileCreator:
         """
         self.participant_solver_map = participant_solver_map
 
-    def create_utility_files(self, parent_directory: Path = "./") -> None:
+    def create_utility_files(self, writer: CaseWriter) -> None:
         """
         Create all utility files for the generated project:
         clean.sh, README.md and run.sh for each participant-solver pair.
-        :param parent_directory: The directory from which to save the files.
+        :param writer: The writer to save the files with.
         :return: None
         """
-        # Convert to Path object just in case
-        parent_directory = Path(parent_directory)
-        self._create_clean_file(parent_directory)
+        # Participant directories are relative to the output root of the writer
+        parent_directory: Path = Path()
+        self._create_clean_file(writer, parent_directory)
         # Create a run file for each participant
         for participant in self.participant_solver_map:
             participant_directory = helper.get_participant_solver_directory(parent_directory, participant.name,
                                                                             self.participant_solver_map[participant])
-            self._create_run_file(participant_directory)
-        self._create_readme_file(parent_directory)
+            self._create_run_file(writer, participant_directory)
+        self._create_readme_file(writer, parent_directory)
 
-    def _create_clean_file(self, directory: Path = "./") -> None:
+    def _create_clean_file(self, writer: CaseWriter, directory: Path = Path()) -> None:
         """
         Create a clean-file for the simulation in the given directory.
         This copies the template file `precicecasegenerate/templates/clean.sh` to the specified directory.
-        :param directory: The directory to save the file in.
+        :param writer: The writer to save the file with.
+        :param directory: The directory to save the file in, relative to the output root of the writer.
         :return: None
         """
-        # Convert to Path object just in case
-        directory = Path(directory)
-        # Get the file to copy
-        src = files("precicecasegenerate.templates") / "clean.sh"
-        # Create directory if it does not exist
-        directory.mkdir(parents=True, exist_ok=True)
+        file_path: Path = Path(directory) / CLEAN_FILE_NAME
+        writer.write_file(file_path, get_template(CLEAN_FILE_NAME), executable=True)
+        logger.debug("File clean.sh written to %s", writer.output_root / file_path)
 
-        file_path: Path = directory / src.name
-
-        # Use as_file to get a real path even if the file is zipped
-        with as_file(src) as real_src_path:
-            shutil.copy2(real_src_path, file_path)
-        logger.debug(f"File clean.sh written to {file_path.resolve()}")
-
-    def _create_run_file(self, directory: Path = "./") -> None:
+    def _create_run_file(self, writer: CaseWriter, directory: Path = Path()) -> None:
         """
         Create a run file for a participant in the given directory.
         This copies the template file `precicecasegenerate/templates/run.sh` to the specified directory.
-        :param directory: The directory to save the file in.
+        :param writer: The writer to save the file with.
+        :param directory: The directory to save the file in, relative to the output root of the writer.
         :return: None
         """
-        # Convert to Path object just in case
-        directory = Path(directory)
-        # Get the file to copy
-        src = files("precicecasegenerate.templates") / "run.sh"
-        # Create directory if it does not exist
-        directory.mkdir(parents=True, exist_ok=True)
-
-        file_path: Path = directory / src.name
-
-        # Use as_file to get a real path
-        with as_file(src) as real_src_path:
-            shutil.copy2(real_src_path, file_path)
-        logger.debug(f"File run.sh written to {file_path.resolve()}")
+        file_path: Path = Path(directory) / RUN_FILE_NAME
+        writer.write_file(file_path, get_template(RUN_FILE_NAME), executable=True)
+        logger.debug("File run.sh written to %s", writer.output_root / file_path)
 
-    def _create_readme_file(self, directory: Path = "./", filename: str = "README.md") -> None:
+    def _create_readme_file(self, writer: CaseWriter, directory: Path = Path(), filename: str = "README.md") -> None:
         """
         Create a README file in the given directory.
-        :param directory: The directory to save the file in.
+        :param writer: The writer to save the file with.
+        :param directory: The directory to save the file in, relative to the output root of the writer.
+        :param filename: The name of the file.
         :return: None
         """
-        # Convert to Path object just in case
-        directory = Path(directory)
-        # Create directory if it does not exist
-        directory.mkdir(parents=True, exist_ok=True)
-
-        file_path: Path = directory / filename
-        with open(file_path, "w") as f:
-            f.write(self._create_readme_str())
-        logger.info(f"README file written to {file_path.resolve()}")
+        file_path: Path = Path(directory) / filename
+        writer.write_text(file_path, self._create_readme_str())
+        logger.info(f"README file written to {writer.output_root / file_path}")
 
     def _create_readme_str(self) -> str:
         """
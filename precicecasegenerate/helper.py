@@ -1,4 +1,3 @@
-import random
 from enum import Enum
 from pathlib import Path
 from precice_config_graph import nodes as n
@@ -9,6 +8,9 @@ Helper items and classes for the NodeCreator.
 """
 # Indent for config
 INDENT: str = " " * 4
+# Indent and maximum line width of precice-config-format, which the precice-config.xml is formatted like
+CONFIG_INDENT: str = " " * 2
+CONFIG_MAX_WIDTH: int = 100
 
 # Link to the precice/case-generate repository
 case_generate_repository_url: str = "https://github.com/precice/case-generate"
@@ -89,6 +91,8 @@ DATA_UNIQUIFIERS: list[str] = [
     "suspicious",
     "wonderful",
 ]
+# Uniquifiers are removed from the list above when they are used, so keep the original list to restore it
+_ALL_DATA_UNIQUIFIERS: tuple[str, ...] = tuple(DATA_UNIQUIFIERS)
 
 # A default data type if none is given
 DEFAULT_DATA_TYPES: dict[str, e.DataType] = {
@@ -104,6 +108,23 @@ DEFAULT_DATA_TYPES: dict[str, e.DataType] = {
 }
 
 
+def get_data_type(data_name: str, data_type: str | None = None) -> e.DataType:
+    """
+    Return the data type of the given data, choosing a default based on the data name if none is given.
+    E.g., temperature defaults to DataType.SCALAR, whereas force defaults to DataType.VECTOR.
+    :param data_name: The name of the data.
+    :param data_type: The data type given in the topology, if any.
+    :return: A data type, which defaults to DEFAULT_DATA_TYPE.
+    """
+    if data_type is not None:
+        return e.DataType(data_type)
+    # Check if the data has a default type. Sort by key length to have a deterministic order
+    for key in sorted(DEFAULT_DATA_TYPES.keys(), key=len, reverse=True):
+        if key.lower() in data_name.lower():
+            return DEFAULT_DATA_TYPES[key]
+    return DEFAULT_DATA_TYPE
+
+
 def capitalize_name(name: str) -> str:
     """
     Capitalize the first letter of each word in a string.
@@ -115,11 +136,20 @@ def capitalize_name(name: str) -> str:
 
 def get_uniquifier() -> str:
     """
-    Return a random string from the DATA_UNIQUIFIERS list and remove it from the list.
+    Return the first string of the DATA_UNIQUIFIERS list and remove it from the list.
+    Uniquifiers are taken in order, such that generating the same topology twice yields the same files.
     :return: A string to be used as a unique identifier for data names.
     """
-    unique_number = random.randint(0, len(DATA_UNIQUIFIERS) - 1)
-    return DATA_UNIQUIFIERS.pop(unique_number)
+    return DATA_UNIQUIFIERS.pop(0)
+
+
+def reset_uniquifiers() -> None:
+    """
+    Restore all uniquifiers in the DATA_UNIQUIFIERS list.
+    This needs to be called before each case if several cases are generated in the same process.
+    :return: None
+    """
+    DATA_UNIQUIFIERS[:] = _ALL_DATA_UNIQUIFIERS
 
 
 def get_participant_solver_directory(parent_directory: Path, participant_name: str, solver_name: str) -> Path:
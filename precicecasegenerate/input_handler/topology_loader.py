@@ -0,0 +1,237 @@
+"""
+This file contains methods to parse the content of topology files, choosing the fastest parser that is available.
+JSON topologies are parsed with orjson or the json module. YAML topologies are streamed through the C parser of
+PyYAML (libyaml) if it is installed, and parsed with ruamel.yaml otherwise.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+JSON_SUFFIX: str = ".json"
+# Tag of the exchanges-tag, whose items are composed and constructed one at a time when streaming
+EXCHANGES_KEY: str = "exchanges"
+# YAML tag of merge keys ("<<"), whose entries may be overridden by the keys of the mapping they are merged into
+MERGE_TAG: str = "tag:yaml.org,2002:merge"
+
+try:
+    import yaml
+    from yaml.composer import Composer
+    from yaml.constructor import ConstructorError, SafeConstructor
+    from yaml.resolver import BaseResolver
+
+    # Without libyaml, PyYAML is not faster than ruamel.yaml, which follows YAML 1.2 like the rest of the program
+    HAS_LIBYAML: bool = yaml.__with_libyaml__
+except ImportError:
+    HAS_LIBYAML = False
+
+if HAS_LIBYAML:
+    from ruamel.yaml.resolver import implicit_resolvers as ruamel_implicit_resolvers
+    from yaml.cyaml import CParser
+
+
+    class _Yaml12Resolver(BaseResolver):
+        """
+        A resolver for the implicit types of YAML 1.2, which ruamel.yaml uses as well.
+        PyYAML follows YAML 1.1, where, e.g., "on", "no" and "1:30" are no strings.
+        """
+        pass
+
+
+    # Use the same patterns as ruamel.yaml, such that both parsers resolve every scalar to the same type
+    for _versions, _tag, _pattern, _first_characters in ruamel_implicit_resolvers:
+        if (1, 2) in _versions:
+            _Yaml12Resolver.add_implicit_resolver(_tag, _pattern, _first_characters)
+
+
+    class _StreamingConstructor(SafeConstructor):
+        """
+        A constructor for the types of YAML 1.2. Strings are interned, since the exchanges of large topologies
+        repeat the same participant, patch and data names many times.
+        Like ruamel.yaml, duplicate keys in a mapping are rejected instead of overwriting each other.
+        """
+
+        def construct_mapping(self, node, deep: bool = False) -> dict:
+            keys: set = set()
+            for key_node, _ in node.value:
+                if key_node.tag == MERGE_TAG:
+                    continue
+                # Constructed objects are remembered, so the keys are not constructed again below
+                key: Any = self.construct_object(key_node, deep=deep)
+                try:
+                    is_duplicate: bool = key in keys
+                except TypeError:
+                    # Unhashable keys are rejected when the mapping is constructed
+                    continue
+                if is_duplicate:
+                    raise ConstructorError("while constructing a mapping", node.start_mark,
+                                           f'found duplicate key "{key}"', key_node.start_mark)
+                keys.add(key)
+            return super().construct_mapping(node, deep=deep)
+
+        def construct_yaml_str(self, node) -> str:
+            return sys.intern(self.construct_scalar(node))
+
+        def construct_yaml_int(self, node) -> int:
+            value: str = self.construct_scalar(node).replace("_", "")
+            # In YAML 1.2, "012" is the decimal 12 instead of an octal number
+            return int(value, 0) if value.lstrip("+-")[:2] in ("0b", "0o", "0x") else int(value)
+
+
+    _StreamingConstructor.add_constructor("tag:yaml.org,2002:str", _StreamingConstructor.construct_yaml_str)
+    _StreamingConstructor.add_constructor("tag:yaml.org,2002:int", _StreamingConstructor.construct_yaml_int)
+
+
+    class _StreamingLoader(Composer, CParser, _StreamingConstructor, _Yaml12Resolver):
+        """
+        A loader reading events from libyaml, which composes and constructs parts of a document separately.
+        The composer of PyYAML is used instead of the one of libyaml, since only the former composes single nodes.
+        """
+
+        def __init__(self, stream: str | IO):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            _StreamingConstructor.__init__(self)
+            _Yaml12Resolver.__init__(self)
+
+
+class TopologyLoadError(ValueError):
+    """
+    An error raised if a topology cannot be parsed, independent of the parser that was chosen.
+    """
+    pass
+
+
+def is_json(topology_file_path: Path | None = None, topology_str: str | None = None) -> bool:
+    """
+    Check if a topology is given as JSON instead of YAML.
+    Files are distinguished by their suffix and strings by their first character, since a JSON topology is an object.
+    :param topology_file_path: The path to the topology file.
+    :param topology_str: The content of a topology file. If given, the path is ignored.
+    :return: True, if the topology is likely JSON. False otherwise.
+    """
+    if topology_str is not None:
+        return topology_str.lstrip().startswith("{")
+    return topology_file_path is not None and topology_file_path.suffix.lower() == JSON_SUFFIX
+
+
+def load_topology(topology_file_path: Path | None = None, topology_str: str | None = None) -> Any:
+    """
+    Parse a topology file or string.
+    Errors of the different parsers, e.g., for duplicate keys or invalid syntax, are all raised as TopologyLoadError.
+    :param topology_file_path: The path to the topology file.
+    :param topology_str: The content of a topology file. If given, it is parsed instead of the file.
+    :return: The parsed topology, which is a dict for valid topologies.
+    """
+    from ruamel.yaml.error import YAMLError
+
+    parser_errors: tuple[type[Exception], ...] = (ValueError, YAMLError, yaml.YAMLError) if HAS_LIBYAML \
+        else (ValueError, YAMLError)
+    try:
+        return _parse_topology(topology_file_path, topology_str)
+    except parser_errors as e:
+        raise TopologyLoadError(str(e)) from e
+
+
+def _parse_topology(topology_file_path: Path | None, topology_str: str | None) -> Any:
+    """
+    Parse a topology file or string with the fastest parser that is available.
+    :param topology_file_path: The path to the topology file.
+    :param topology_str: The content of a topology file. If given, it is parsed instead of the file.
+    :return: The parsed topology.
+    """
+    if is_json(topology_file_path, topology_str):
+        try:
+            return _load_json(topology_str if topology_str is not None else topology_file_path.read_bytes())
+        except ValueError as e:
+            if topology_str is None:
+                raise
+            # YAML is a superset of JSON, so a string starting like JSON may still be YAML
+            logger.debug("Topology is not valid JSON, parsing it as YAML: %s", e)
+
+    if topology_str is not None:
+        return _load_yaml(topology_str)
+    with open(topology_file_path, "r") as topology_file:
+        return _load_yaml(topology_file)
+
+
+def _load_json(content: str | bytes) -> Any:
+    """
+    Parse a JSON topology, using orjson if it is installed.
+    :param content: The JSON document.
+    :return: The parsed topology.
+    """
+    try:
+        import orjson
+    except ImportError:
+        logger.debug("Parsing topology with json.")
+        return json.loads(content)
+    logger.debug("Parsing topology with orjson.")
+    return orjson.loads(content)
+
+
+def _load_yaml(stream: str | IO) -> Any:
+    """
+    Parse a YAML topology, streaming it through libyaml if it is available.
+    :param stream: The YAML document as a string or a file.
+    :return: The parsed topology.
+    """
+    if HAS_LIBYAML:
+        logger.debug("Parsing topology with libyaml.")
+        return _stream_yaml(stream)
+
+    from ruamel.yaml import YAML
+
+    logger.debug("Parsing topology with ruamel.yaml.")
+    return YAML(typ="safe").load(stream)
+
+
+def _stream_yaml(stream: str | IO) -> Any:
+    """
+    Parse a YAML topology, composing and constructing the items of the exchanges-tag one at a time.
+    Other loaders first compose a node with position information for every scalar of the document and only then
+    construct the Python objects, so the nodes of all exchanges are held in memory at once.
+    Here, the nodes of an exchange are discarded as soon as its dict is constructed.
+    :param stream: The YAML document as a string or a file.
+    :return: The parsed topology.
+    """
+    loader: _StreamingLoader = _StreamingLoader(stream)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return None
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent) or loader.peek_event().anchor is not None:
+            # Not a topology, which is rejected by the validation later on
+            topology: Any = loader.construct_document(loader.compose_node(None, None))
+        else:
+            topology = {}
+            mapping_start_mark = loader.get_event().start_mark  # MappingStartEvent
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = loader.compose_node(None, None)
+                key: Any = loader.construct_document(key_node)
+                if key in topology:
+                    raise ConstructorError("while constructing a mapping", mapping_start_mark,
+                                           f'found duplicate key "{key}"', key_node.start_mark)
+                if key == EXCHANGES_KEY and loader.check_event(yaml.SequenceStartEvent) \
+                        and loader.peek_event().anchor is None:
+                    loader.get_event()  # SequenceStartEvent
+                    exchanges: list = []
+                    while not loader.check_event(yaml.SequenceEndEvent):
+                        exchanges.append(loader.construct_document(loader.compose_node(None, None)))
+                    loader.get_event()  # SequenceEndEvent
+                    topology[key] = exchanges
+                else:
+                    topology[key] = loader.construct_document(loader.compose_node(None, None))
+            loader.get_event()  # MappingEndEvent
+        loader.get_event()  # DocumentEndEvent
+        if not loader.check_event(yaml.StreamEndEvent):
+            raise yaml.composer.ComposerError("expected a single document in the stream", None,
+                                              "but found another document", loader.peek_event().start_mark)
+        return topology
+    finally:
+        loader.dispose()
@@ -1,51 +1,99 @@
-from ruamel.yaml import YAML
 import json
 import jsonschema
 import logging
+from functools import cache
 from pathlib import Path
 from importlib.resources import files
 from precicecasegenerate import helper
+from precicecasegenerate.input_handler.topology_loader import load_topology, TopologyLoadError
 
 logger = logging.getLogger(__name__)
 
+TOPOLOGY_SCHEMA_NAME: str = "topology-schema.json"
+
+
+@cache
+def get_topology_validator() -> jsonschema.protocols.Validator:
+    """
+    Return a validator for the topology schema in schemas/topology-schema.json.
+    The schema is loaded, checked and compiled into a validator with a format checker only once per process;
+    every further call returns the same validator.
+    :return: A jsonschema validator for topologies.
+    """
+    schema_path = files("precicecasegenerate.schemas") / TOPOLOGY_SCHEMA_NAME
+    schema: dict = json.loads(schema_path.read_text(encoding="utf-8"))
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    logger.debug(f"Compiled topology schema {schema_path} with {validator_class.__name__}.")
+    return validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+
 
 class TopologyReader:
     """
-    Read a given topology.yaml file and save it as a dict.
+    Read a given topology.yaml or topology.json file and save it as a dict.
     """
 
-    def __init__(self, path_to_topology_file: Path):
+    def __init__(self, path_to_topology_file: Path | None = None, topology_str: str | None = None):
+        """
+        Initialize a TopologyReader object and read the topology.
+        :param path_to_topology_file: The path to the topology file.
+        :param topology_str: The content of a topology file. If given, it is read instead of the file,
+            whose path is then only used in log messages.
+        """
         # Convert to Path object just in case
-        self.topology_file_path = Path(path_to_topology_file)
+        self.topology_file_path = Path(path_to_topology_file) if path_to_topology_file is not None else None
+        self.topology_str = topology_str
+        # Describes where the topology comes from in log messages
+        self.topology_source: str = str(self.topology_file_path) if self.topology_file_path is not None else "<string>"
+        # Set if the topology cannot be parsed, which is reported by validate_topology()
+        self.load_error: TopologyLoadError | None = None
         self.topology = self._read_topology()
 
-    def _read_topology(self) -> dict:
+    def _read_topology(self) -> dict | None:
         """
-        Read the topology file and convert it to a dict.
-        :return: The topology dict.
+        Read the topology file or string and convert it to a dict.
+        JSON and YAML topologies are both supported, see topology_loader.load_topology().
+        :return: The topology dict, or None if the topology cannot be parsed.
         """
-        logger.debug(f"Reading topology file at {self.topology_file_path.resolve()}")
-        yaml = YAML(typ="safe")
-        with open(self.topology_file_path, "r") as topology_file:
-            topology = yaml.load(topology_file)
-        return topology
+        if self.topology_str is not None:
+            logger.debug("Reading topology from string.")
+        else:
+            logger.debug(f"Reading topology file at {self.topology_file_path.resolve()}")
+        try:
+            return load_topology(self.topology_file_path, topology_str=self.topology_str)
+        except TopologyLoadError as e:
+            self.load_error = e
+            return None
 
-    def validate_topology(self) -> int:
+    def validate_topology(self, all_errors: bool = False) -> int:
         """
         Check if the topology adheres to the defined schema in schemas/topology-schema.json
+        The compiled validator is shared by all TopologyReader objects of the process.
+        :param all_errors: Report every schema violation instead of only the most relevant one.
         :return: 0 if topology is valid, 1 otherwise
         """
-        schema_path = files("precicecasegenerate.schemas") / "topology-schema.json"
-
-        schema = json.loads(schema_path.read_text(encoding="utf-8"))
-        try:
-            jsonschema.validate(self.topology, schema)
-            logger.debug("Topology file adheres to the schema.")
-        except jsonschema.ValidationError as e:
-            logger.critical(f"Topology file {self.topology_file_path.resolve()} does not adhere to the schema "
-                            f"as specified in {schema_path}: {e.message}. Aborting program.")
+        if self.load_error is not None:
+            logger.critical(f"Topology file {self.topology_source} could not be parsed:\n{self.load_error}\n"
+                            f"Aborting program.")
             return 1
-        return 0
+        validator: jsonschema.protocols.Validator = get_topology_validator()
+        if all_errors:
+            errors: list[jsonschema.ValidationError] = list(validator.iter_errors(self.topology))
+        else:
+            # This is the error jsonschema.validate() would raise
+            error: jsonschema.ValidationError | None = jsonschema.exceptions.best_match(
+                validator.iter_errors(self.topology))
+            errors: list[jsonschema.ValidationError] = [error] if error is not None else []
+
+        if not errors:
+            logger.debug("Topology file adheres to the schema.")
+            return 0
+        for error in errors:
+            location: str = "/".join(str(part) for part in error.absolute_path)
+            logger.critical(f"Topology file {self.topology_source} does not adhere to the schema "
+                            f"as specified in {TOPOLOGY_SCHEMA_NAME}"
+                            f"{f' at {location}' if location else ''}: {error.message}. Aborting program.")
+        return 1
 
     def check_topology(self) -> int:
         """
@@ -54,7 +102,7 @@ class TopologyReader:
 
         - Checking if participant names are unique.
         - Checking if exchanges only contain known "to" and "from" participants.
-        - Checking if exchanges are unique, when ignoring "to-patch", "from-patch" and "type" tags.
+        - Checking if exchanges are unique, when ignoring any tags that are not used.
         If any of these checks fail, an error message is printed and the program is aborted.
         Additionally, it is checked if any of the data names contains one of the uniquifiers defined in
         helper.DATA_UNIQUIFIERS. If so, this uniquifier is removed from the list of uniquifiers.
@@ -65,13 +113,15 @@ class TopologyReader:
         for participant in self.topology["participants"]:
             if participant["name"] in participant_names:
                 logger.critical(
-                    f"Duplicate participant name {participant['name']} in topology file {self.topology_file_path}.")
+                    f"Duplicate participant name {participant['name']} in topology file {self.topology_source}.")
                 return 1
             participant_names.add(participant["name"])
         logger.debug("Topology does not contain duplicate participant names.")
 
         # Check if participants actually appear in exchanges
         participants_in_exchanges: set[str] = set()
+        # The schema only detects exchanges that are identical including any further tags
+        known_exchanges: set[tuple] = set()
 
         # Check if exchanges only contain known "to" and "from" participants
         for exchange in self.topology["exchanges"]:
@@ -83,11 +133,11 @@ class TopologyReader:
 
             if to_participant not in participant_names:
                 logger.critical(f"Unknown participant {to_participant} in topology file "
-                                f"{self.topology_file_path}.")
+                                f"{self.topology_source}.")
                 return 1
             if from_participant not in participant_names:
                 logger.critical(f"Unknown participant {from_participant} in topology file "
-                                f"{self.topology_file_path}.")
+                                f"{self.topology_source}.")
                 return 1
             data: str = exchange["data"]
 
@@ -95,6 +145,14 @@ class TopologyReader:
                 logger.error(f"Participant {from_participant} exchanges {data} with itself.")
                 return 1
 
+            exchange_key: tuple = tuple(exchange.get(key) for key in
+                                        ("from", "from-patch", "to", "to-patch", "data", "data-type", "type"))
+            if exchange_key in known_exchanges:
+                logger.critical(f"Duplicate exchange of data {data} from {from_participant} to {to_participant} "
+                                f"in topology file {self.topology_source}.")
+                return 1
+            known_exchanges.add(exchange_key)
+
             # Remove uniquifiers from the list if they are present in a data name
             for uniquifier in helper.DATA_UNIQUIFIERS.copy():
                 if uniquifier in data:
@@ -1,11 +1,38 @@
+import atexit
 import datetime
 import logging
+import os
+import queue
 from logging import LogRecord, Logger
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import TYPE_CHECKING
 from colored import Style, Fore
 
 from precicecasegenerate import cli_helper
 
+if TYPE_CHECKING:
+    import multiprocessing
+
+# Log files are named LOG_FILE_PREFIX + start time + process ID + LOG_FILE_SUFFIX, such that every run has its own file
+LOG_FILE_PREFIX: str = "precice-case-generate-"
+LOG_FILE_SUFFIX: str = ".log"
+# Format of the start time in the name of a log file, which sorts the log files by their start time
+LOG_FILE_TIME_FORMAT: str = "%Y-%m-%d_%H-%M-%S-%f"
+# Number of runs whose log files are kept, including the current run. Files of running processes are always kept
+LOG_FILE_RUN_COUNT: int = 10
+# Old log files are only removed every this many runs, such that other runs do not have to list the log directory
+LOG_CLEANUP_INTERVAL: int = 10
+# Name of the file in the log directory counting the runs, which decides when old log files are removed
+LOG_RUN_COUNTER_FILE_NAME: str = ".precice-case-generate-runs"
+# Size in bytes after which the log file of a long-running process is rotated to a single backup file ending in ".1"
+LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+
+# The listener writing records to the file and the console in a background thread, if logging is set up
+_listener: QueueListener | None = None
+# The listener writing records of worker processes to the same handlers, if a parallel batch is running
+_worker_listener: QueueListener | None = None
+
 
 class ColorFormatter(logging.Formatter):
     COLORS = {
@@ -17,78 +44,243 @@ class ColorFormatter(logging.Formatter):
     }
     RESET = Style.reset
 
+    def __init__(self, fmt: str, datefmt: str | None = None):
+        """
+        Initialize a ColorFormatter.
+        The colored levelname is baked into one format per level, such that records do not have to be modified.
+        :param fmt: The format string, which may contain %(levelname)s.
+        :param datefmt: The format string for dates.
+        """
+        super().__init__(fmt, datefmt=datefmt)
+        self.level_formatters: dict[int, logging.Formatter] = {
+            level: logging.Formatter(fmt.replace("%(levelname)s", f"{color}%(levelname)s{self.RESET}"), datefmt=datefmt)
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record: LogRecord) -> str:
         """
         Format a log record, such that the levelname is colored according to the level.
         :param record: The log record to format.
         :return: The formatted log record.
         """
-        # Store original levelname
-        levelname = record.levelname
-        color = self.COLORS.get(record.levelno, "")
-        record.levelname = f"{color}{levelname}{self.RESET}"
-        formatted = super().format(record)
-        # Restore original levelname
-        record.levelname = levelname
-        return formatted
+        formatter: logging.Formatter | None = self.level_formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
+        return formatter.format(record)
 
 
-def setup_logging(verbose: bool = False) -> Logger:
+def setup_logging(verbose: bool = False, log_file: bool = True, log_directory: Path | None = None) -> Logger:
     """
     Create a logger object and set up logging to a file and the console.
     By default, only warnings and errors are logged to the console, whereas everything is logged to the file.
+    Records are only put into a queue by the logging thread. Formatting and writing them to the file and the console
+    happens in a background thread, which is stopped by stop_logging() or when the program exits.
     :param verbose: Enables debug logging to the console.
+    :param log_file: Enables logging to a file. Without a file, debug records are only created if verbose is set.
+    :param log_directory: The directory of the log files. Defaults to cli_helper.get_log_directory().
     :return: A logger object.
     """
-    log_directory: Path = Path(cli_helper.LOG_DIR_NAME)
-    log_directory.mkdir(parents=True, exist_ok=True)
+    global _listener
+    # Stop a previous listener incase this method is called multiple times
+    stop_logging()
 
-    # Base level is debug (nothing is ignored)
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
-
-    # Delete old log files if there are more than 10 to avoid clutter
-    log_files = sorted(log_directory.glob("precice-case-generate-*.log"))
-    if len(log_files) >= 10:
-        for old_file in log_files[:-9]:
-            try:
-                # This deletes the file
-                old_file.unlink()
-            except OSError as e:
-                logger.error(f"Error deleting old log file {old_file}: {e}")
-
-    timestamp: str = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file_path: Path = log_directory / f"precice-case-generate-{timestamp}.log"
-
     # Prevent duplicate handlers incase this method is called multiple times
     if logger.hasHandlers():
         logger.handlers.clear()
 
-    # Write everything to a log file
-    file_handler = logging.FileHandler(log_file_path)
-    file_handler.setLevel(logging.DEBUG)
+    handlers: list[logging.Handler] = []
+    if log_file:
+        if log_directory is None:
+            log_directory = cli_helper.get_log_directory()
+        handlers.append(_create_file_handler(log_directory))
+
     # Only write warnings and errors to the console
     console_handler = logging.StreamHandler()
     if not verbose:
         console_handler.setLevel(logging.INFO)
     else:
         console_handler.setLevel(logging.DEBUG)
-
-    file_formatter = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] [%(name)s]: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(file_formatter)
     # Use a file_formatter with color
     console_formatter = ColorFormatter(
         "[%(asctime)s] [%(levelname)s]: %(message)s",
         datefmt="%H:%M:%S"
     )
     console_handler.setFormatter(console_formatter)
+    handlers.append(console_handler)
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # The base level is the lowest level of any handler, such that no records are created that nobody consumes
+    logger.setLevel(min(handler.level or logging.DEBUG for handler in handlers))
 
-    logger.debug(f"Logs can be found in {log_directory.resolve()}")
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    if log_file:
+        logger.debug(f"Logs can be found in {log_directory.resolve()}")
 
     return logger
+
+
+def _create_file_handler(log_directory: Path) -> logging.Handler:
+    """
+    Create a handler writing everything to a new log file of this run.
+    The file name contains the start time and the ID of this process, such that concurrent runs, e.g., a server and
+    a single generation, never write to, rename or remove the file of another run.
+    Old log files are removed every LOG_CLEANUP_INTERVAL runs, see _remove_old_log_files(), so there are at most
+    LOG_FILE_RUN_COUNT + LOG_CLEANUP_INTERVAL - 1 log files of finished runs.
+    :param log_directory: The directory of the log files.
+    :return: The file handler.
+    """
+    log_directory.mkdir(parents=True, exist_ok=True)
+    timestamp: str = datetime.datetime.now().strftime(LOG_FILE_TIME_FORMAT)
+    log_file_path: Path = log_directory / f"{LOG_FILE_PREFIX}{timestamp}-{os.getpid()}{LOG_FILE_SUFFIX}"
+
+    # Long-running processes rotate their own file once it exceeds LOG_FILE_MAX_BYTES
+    file_handler = RotatingFileHandler(log_file_path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=1, encoding="utf-8")
+    if _count_run(log_directory) % LOG_CLEANUP_INTERVAL == 0:
+        _remove_old_log_files(log_directory)
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter(
+        "[%(asctime)s] [%(levelname)s] [%(processName)s] [%(name)s]: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+    file_handler.setFormatter(file_formatter)
+    return file_handler
+
+
+def _count_run(log_directory: Path) -> int:
+    """
+    Increment the number of runs stored in the run counter file of the log directory.
+    Concurrent runs may count the same run, which only shifts when old log files are removed next.
+    :param log_directory: The directory of the log files.
+    :return: The number of runs including this one.
+    """
+    counter_path: Path = log_directory / LOG_RUN_COUNTER_FILE_NAME
+    try:
+        runs: int = int(counter_path.read_text()) + 1
+    except (OSError, ValueError):
+        # The first run, or the counter was damaged
+        runs = 1
+    try:
+        counter_path.write_text(str(runs))
+    except OSError as e:
+        logging.getLogger(__name__).debug("Could not update the run counter %s: %s", counter_path, e)
+    return runs
+
+
+def _remove_old_log_files(log_directory: Path) -> None:
+    """
+    Remove the log files of all but the last LOG_FILE_RUN_COUNT runs, together with their rotated backups.
+    The files of processes that are still running are kept, since these processes may still write to them.
+    :param log_directory: The directory of the log files.
+    :return: None
+    """
+    # The start time at the beginning of the name sorts the files from the oldest to the newest run
+    log_files: list[Path] = sorted(log_directory.glob(f"{LOG_FILE_PREFIX}*{LOG_FILE_SUFFIX}"))
+    for old_file in log_files[:-LOG_FILE_RUN_COUNT]:
+        try:
+            pid: int = int(old_file.stem.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            # Not written by this program
+            continue
+        if _is_process_running(pid):
+            continue
+        for path in (old_file, old_file.with_name(f"{old_file.name}.1")):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                # E.g., on Windows, the file of a running process cannot be removed
+                logging.getLogger(__name__).debug("Could not remove old log file %s: %s", path, e)
+
+
+def _is_process_running(pid: int) -> bool:
+    """
+    Check if the process with the given ID is running and may still write to its log file.
+    The log files of previous runs in this process have been closed by stop_logging(), so they are not in use.
+    :param pid: The ID of the process.
+    :return: True, if the process is running. False otherwise.
+    """
+    if pid == os.getpid():
+        return False
+    if os.name == "nt":
+        # Signals terminate processes on Windows. There, the file of a running process cannot be removed anyway
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process runs as another user
+        return True
+    return True
+
+
+def start_worker_logging() -> tuple["multiprocessing.Queue", int]:
+    """
+    Forward the records of worker processes to the handlers of this process.
+    The workers pass the returned queue and level to setup_worker_logging(), such that all records of a batch end up
+    in the log file and on the console of the main process.
+    :return: The queue for the records of the workers and the level of the root logger.
+    """
+    global _worker_listener
+    # Imported here, since importing multiprocessing noticeably slows down the startup of the CLI
+    import multiprocessing
+
+    stop_worker_logging()
+    worker_queue: multiprocessing.Queue = multiprocessing.Queue()
+    # Without setup_logging(), e.g., when used as a library, forward to the handlers of the root logger instead
+    handlers: tuple[logging.Handler, ...] = (_listener.handlers if _listener is not None
+                                             else tuple(logging.getLogger().handlers))
+    _worker_listener = QueueListener(worker_queue, *handlers, respect_handler_level=True)
+    _worker_listener.start()
+    return worker_queue, logging.getLogger().level
+
+
+def setup_worker_logging(worker_queue: "multiprocessing.Queue", level: int) -> None:
+    """
+    Set up logging in a worker process, such that all records are sent to the main process.
+    This replaces any handlers inherited from the main process.
+    :param worker_queue: The queue returned by start_worker_logging() in the main process.
+    :param level: The level of the root logger in the main process.
+    :return: None
+    """
+    global _listener
+    # A forked worker inherits the listener of the main process, but not its thread
+    _listener = None
+    logger = logging.getLogger()
+    logger.handlers.clear()
+    logger.addHandler(QueueHandler(worker_queue))
+    logger.setLevel(level)
+
+
+def stop_worker_logging() -> None:
+    """
+    Write all records received from worker processes and stop forwarding them, if it is running.
+    :return: None
+    """
+    global _worker_listener
+    if _worker_listener is None:
+        return
+    _worker_listener.stop()
+    _worker_listener = None
+
+
+def stop_logging() -> None:
+    """
+    Write all queued records and stop the background thread of the logging, if it is running.
+    :return: None
+    """
+    global _listener
+    stop_worker_logging()
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+# Make sure all queued records are written before the program exits
+atexit.register(stop_logging)
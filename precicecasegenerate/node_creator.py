@@ -3,6 +3,8 @@ import logging
 from precice_config_graph import nodes as n
 from precice_config_graph import enums as e
 import precicecasegenerate.helper as helper
+from precicecasegenerate.exchange_index import ExchangeIndex
+from precicecasegenerate.profiler import profile_stage
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,13 @@ class NodeCreator:
         # Dimensionality is needed for meshes
         self.participant_dimensionality: dict[n.ParticipantNode, int] = {}
         self.exchange_types: dict[n.ExchangeNode, str] = {}
+        # Index over the exchanges of the topology, created once the participants are known
+        self.exchange_index: ExchangeIndex | None = None
+        # Sets mirroring the write-data, read-data and use-data lists for constant-time duplicate checks.
+        # The lists keep the order of the generated config.
+        self.write_data_keys: set[tuple[n.ParticipantNode, n.MeshNode, n.DataNode]] = set()
+        self.read_data_keys: set[tuple[n.ParticipantNode, n.MeshNode, n.DataNode]] = set()
+        self.use_data_keys: set[tuple[n.MeshNode, n.DataNode]] = set()
 
         self._create_nodes()
 
@@ -71,61 +80,73 @@ class NodeCreator:
         # Topology will only have tags "participants" and "exchanges"
 
         # Initialize participants from participants tag
-        participant_map: dict[str, n.ParticipantNode] = self._initialize_participants()
-        logger.debug(f"Created {len(set(participant_map.values()))} participant nodes.")
+        with profile_stage("participant_initialization"):
+            participant_map: dict[str, n.ParticipantNode] = self._initialize_participants()
+        logger.debug("Created %d participant nodes.", len(set(participant_map.values())))
+
+        # Index the exchanges tag once; all following stages query this index instead of scanning the topology
+        with profile_stage("exchange_index"):
+            self.exchange_index = ExchangeIndex(self.topology["exchanges"], participant_map)
 
         # Update patches
         # IMPORTANT: This updates the topology dict.
-        #  Anything using a "frozenset" of topology items needs to be done after this method!
-        #  (such as "initialize_data")
-        participant_patch_label_map: dict[tuple[n.ParticipantNode, n.ParticipantNode], dict[str, set[str]]] = (
-            self._patch_preprocessing(participant_map))
+        #  Anything using the patch names of the topology needs to be done after this method!
+        with profile_stage("patch_preprocessing"):
+            participant_patch_label_map: dict[tuple[n.ParticipantNode, n.ParticipantNode], dict[str, set[str]]] = (
+                self._patch_preprocessing())
 
         # Update non-unique data names depending on from-/to-patches of the involved participants
         # IMPORTANT: This updates the topology dict (see warning above)
-        self._data_preprocessing(participant_map)
+        with profile_stage("data_preprocessing"):
+            self._data_preprocessing()
 
         # Initialize data from exchanges tag (defined implicitly)
-        # IMPORTANT: This uses the topology dict as keys, so it needs to be done after the patch preprocessing.
-        data_map: dict[frozenset, n.DataNode] = self._initialize_data(participant_map)
-        logger.debug(f"Created {len(set(data_map.values()))} data nodes.")
+        # IMPORTANT: This uses the data names of the topology, so it needs to be done after the data preprocessing.
+        with profile_stage("data_initialization"):
+            data_map: dict[int, n.DataNode] = self._initialize_data()
+        logger.debug("Created %d data nodes.", len(set(data_map.values())))
 
         # Initialize meshes from the exchanges tag (defined implicitly)
-        mesh_map: dict[
-            tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode] = self._initialize_meshes_and_patches(
-            participant_patch_label_map)
-        logger.debug(f"Created {len(set(mesh_map.values()))} mesh nodes.")
+        with profile_stage("mesh_initialization"):
+            mesh_map: dict[
+                tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode] = self._initialize_meshes_and_patches(
+                participant_patch_label_map)
+        logger.debug("Created %d mesh nodes.", len(set(mesh_map.values())))
 
         # Initialize mappings from the exchanges tag (defined implicitly)
-        mapping_map: dict[tuple[n.MeshNode, n.MeshNode], n.MappingNode] = self._initialize_mappings(participant_map,
-                                                                                                    mesh_map, data_map)
-        logger.debug(f"Created {len(set(mapping_map.values()))} mapping nodes.")
+        with profile_stage("mapping_initialization"):
+            mapping_map: dict[tuple[n.MeshNode, n.MeshNode], n.MappingNode] = self._initialize_mappings(
+                mesh_map, data_map)
+        logger.debug("Created %d mapping nodes.", len(set(mapping_map.values())))
 
         # Initialize exchanges from the exchanges tag
-        potential_couplings: list[dict] = self._initialize_exchanges(participant_map, mesh_map, data_map, mapping_map)
-        logger.debug(f"Created {len(potential_couplings)} exchange nodes.")
+        with profile_stage("exchange_initialization"):
+            potential_couplings: list[dict] = self._initialize_exchanges(mesh_map, data_map, mapping_map)
+        logger.debug("Created %d exchange nodes.", len(potential_couplings))
 
         # All potentially strong coupling-schemes
         strong_couplings: list[dict] = [coupling for coupling in potential_couplings if coupling["type"] == "strong"]
-        logger.debug(f"Found {len(strong_couplings)} strong exchanges.")
+        logger.debug("Found %d strong exchanges.", len(strong_couplings))
         # All potentially weak coupling-schemes
         weak_couplings: list[dict] = [coupling for coupling in potential_couplings if coupling["type"] == "weak"]
-        logger.debug(f"Found {len(weak_couplings)} weak exchanges.")
+        logger.debug("Found %d weak exchanges.", len(weak_couplings))
 
         # Maps participants to coupling schemes.
         coupling_map: dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode | n.MultiCouplingSchemeNode] = {}
-        # Handle strong couplings
-        if len(strong_couplings) > 0:
-            # This might manipulate weak_couplings, so this method needs to be called before _create_weak ...
-            coupling_map = self._create_strong_coupling_schemes(strong_couplings, weak_couplings)
+        with profile_stage("coupling_schemes"):
+            # Handle strong couplings
+            if len(strong_couplings) > 0:
+                # This might manipulate weak_couplings, so this method needs to be called before _create_weak ...
+                coupling_map = self._create_strong_coupling_schemes(strong_couplings, weak_couplings)
 
-        # Handle weak couplings
-        if len(weak_couplings) > 0:
-            coupling_map = self._create_weak_coupling_schemes(weak_couplings, coupling_map)
+            # Handle weak couplings
+            if len(weak_couplings) > 0:
+                coupling_map = self._create_weak_coupling_schemes(weak_couplings, coupling_map)
 
         # Create M2Ns
-        self._create_M2N()
-        logger.debug(f"Created {len(self.m2ns)} M2N nodes.")
+        with profile_stage("m2n"):
+            self._create_M2N()
+        logger.debug("Created %d M2N nodes.", len(self.m2ns))
 
     def _create_M2N(self) -> None:
         """
@@ -145,8 +166,8 @@ class NodeCreator:
                                                    connector=exchange.to_participant)
                         m2n_map[frozenset((exchange.from_participant, exchange.to_participant))] = m2n
                         self.m2ns.append(m2n)
-                        logger.debug(f"Created M2N from {exchange.from_participant.name} to "
-                                     f"{exchange.to_participant.name}.")
+                        logger.debug("Created M2N from %s to %s.",
+                                     exchange.from_participant.name, exchange.to_participant.name)
 
                 control_participant: n.ParticipantNode = coupling_scheme.control_participant
                 # Create an M2N from the control participant to every other participant
@@ -157,8 +178,8 @@ class NodeCreator:
                                                        connector=participant)
                             m2n_map[frozenset((control_participant, participant))] = m2n
                             self.m2ns.append(m2n)
-                            logger.debug(f"Created M2N from control-participant {control_participant.name} "
-                                         f"to {participant.name}.")
+                            logger.debug("Created M2N from control-participant %s to %s.",
+                                         control_participant.name, participant.name)
 
             # Only one M2N is needed for a regular coupling-scheme (since there is only one pair of participants involved)
             elif isinstance(coupling_scheme, n.CouplingSchemeNode):
@@ -169,74 +190,94 @@ class NodeCreator:
                         type=helper.DEFAULT_M2N_TYPE, acceptor=first_participant, connector=second_participant)
                     m2n_map[frozenset((first_participant, second_participant))] = m2n
                     self.m2ns.append(m2n)
-                    logger.debug(f"Created M2N from {first_participant.name} to "
-                                 f"{second_participant.name}.")
+                    logger.debug("Created M2N from %s to %s.", first_participant.name, second_participant.name)
 
     def _create_strong_coupling_schemes(self, strong_couplings: list[dict], weak_couplings: list[dict]) -> (
-            dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode]):
+            dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode | n.MultiCouplingSchemeNode]):
         """
         Create coupling-schemes for strong interactions.
-        First, bidirectional strong couplings are determined. If there is more than one bidirectional strong coupling,
-        a multi-coupling-scheme is created. Otherwise, if there is exactly one bidirectional strong coupling, an implicit
-        coupling-scheme is created.
-        Otherwise, no implicit coupling-scheme is created and all "strong" couplings are added to the "weak" couplings
-        list to be handled by the ``_create_weak_coupling_schemes()`` method.
-        Next, all potential couplings (both strong and weak) are inspected for couplings with participants involved in
-        bidirectional strong couplings. Such participants are added to the implicit coupling-scheme.
-        Finally, acceleration and convergence measures are added to every exchange of the implicit coupling-scheme.
+        First, participants are grouped into implicit clusters by ``_find_implicit_clusters()``, where each cluster
+        is connected by bidirectional strong couplings. For each cluster of two participants, an implicit
+        coupling-scheme is created; for each larger cluster, a multi-coupling-scheme is created.
+        All strong couplings that are not part of any cluster are added to the "weak" couplings list
+        to be handled by the ``_create_weak_coupling_schemes()`` method.
+        Next, all potential couplings (both strong and weak) between participants of the same cluster are moved to the
+        coupling-scheme of that cluster.
+        Finally, acceleration and convergence measures are added to every exchange of the implicit coupling-schemes.
         A dict mapping tuples of participants to coupling-schemes is returned.
         :param strong_couplings: A list of dicts with potential strong coupling schemes (exchanged of type "strong").
         :param weak_couplings: A list of dicts with potential weak coupling schemes (exchanged of type "weak").
-        :return: A dict[frozenset[ParticipantNode], CouplingSchemeNode]
+        :return: A dict[frozenset[ParticipantNode], CouplingSchemeNode | MultiCouplingSchemeNode]
         """
         coupling_map: dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode | n.MultiCouplingSchemeNode] = {}
 
-        # All pairs of participants involved in bidirectional strong couplings
-        bidirectional_strong_coupling_participant_pairs: set[frozenset[n.ParticipantNode]] = set()
-        bidirectional_strong_couplings: list[dict] = []
-
-        implicit_coupling_scheme: n.MultiCouplingSchemeNode | None = None
-
-        # Iterate over all potential strong couplings
-        for coupling in strong_couplings:
-            # Check all other potential strong couplings to determine whether there are bidirectional strong couplings
-            for other_coupling in strong_couplings:
-                if coupling != other_coupling:
-                    if coupling["from"] == other_coupling["to"] and coupling["to"] == other_coupling["from"]:
-                        bidirectional_strong_coupling_participant_pairs.add(
-                            frozenset((coupling["from"], coupling["to"])))
-                        logger.debug(f"Found bidirectional strong coupling between {coupling['from'].name} "
-                                     f"and {coupling['to'].name}.")
-        logger.debug(f"There are {len(bidirectional_strong_coupling_participant_pairs)} participant pairs involved in "
-                     f"bidirectional strong couplings.")
-
-        # Check each potential strong coupling whether its participants are involved in bidirectional strong couplings
-        # If so, add it to bidirectional_strong_couplings
+        clusters: list[list[n.ParticipantNode]] = self._find_implicit_clusters(strong_couplings)
+        if not clusters:
+            # No implicit coupling-scheme is required.
+            # Add all strong ones to the weak couplings list and let the other method handle them
+            logger.debug("No bidirectional strong couplings found. Adding all strong couplings to weak couplings list.")
+            weak_couplings += strong_couplings
+            return coupling_map
+
+        # Map each participant to the index of its cluster
+        cluster_map: dict[n.ParticipantNode, int] = {participant: cluster_index
+                                                     for cluster_index, cluster in enumerate(clusters)
+                                                     for participant in cluster}
+        # Exchanges of each cluster, in the order they are added to its coupling-scheme
+        bidirectional_strong_couplings: list[list[dict]] = [[] for _ in clusters]
+        unidirectional_strong_couplings: list[list[dict]] = [[] for _ in clusters]
+        absorbed_weak_couplings: list[list[dict]] = [[] for _ in clusters]
+
+        # The set of strong edges determines in constant time whether a strong coupling is bidirectional
+        strong_edges: set[tuple[n.ParticipantNode, n.ParticipantNode]] = {(coupling["from"], coupling["to"])
+                                                                          for coupling in strong_couplings}
+        remaining_strong_couplings: list[dict] = []
         for coupling in strong_couplings:
-            if frozenset((coupling["from"], coupling["to"])) in bidirectional_strong_coupling_participant_pairs:
-                bidirectional_strong_couplings.append(coupling)
-
-        unidirectional_strong_couplings: list[dict] = [coupling for coupling in strong_couplings if
-                                                       coupling not in bidirectional_strong_couplings]
-        logger.debug(f"There are {len(unidirectional_strong_couplings)} unidirectional strong exchanges and "
-                     f"{len(bidirectional_strong_couplings)} bidirectional strong exchanges.")
-
-        # We need a multi-coupling scheme if there is more than one bidirectional strong coupling
-        if len(bidirectional_strong_coupling_participant_pairs) > 1:
-            # Get all participants involved in bidirectional couplings (set to avoid duplicates)
-            participants: set[n.ParticipantNode] = {participant for pair in
-                                                    bidirectional_strong_coupling_participant_pairs
-                                                    for participant in pair}
-            participants: list[n.ParticipantNode] = list(participants)
-
-            control_participant: n.ParticipantNode = self._determine_control_participant(participants,
-                                                                                         bidirectional_strong_couplings)
-
-            implicit_coupling_scheme: n.MultiCouplingSchemeNode = n.MultiCouplingSchemeNode(
-                control_participant=control_participant,
-                participants=participants)
-            logger.debug(f"Created multi-coupling-scheme with control participant {control_participant.name} "
-                         f"and participants: {', '.join(p.name for p in participants)}.")
+            cluster_index: int | None = cluster_map.get(coupling["from"])
+            if cluster_index is None or cluster_index != cluster_map.get(coupling["to"]):
+                remaining_strong_couplings.append(coupling)
+            elif (coupling["to"], coupling["from"]) in strong_edges:
+                bidirectional_strong_couplings[cluster_index].append(coupling)
+            else:
+                # Both participants are already involved in the implicit coupling scheme
+                # This means we add their exchange to the implicit coupling scheme
+                unidirectional_strong_couplings[cluster_index].append(coupling)
+                logger.debug("Found unidirectional strong exchange between %s and %s and added it to the implicit "
+                             "coupling-scheme.", coupling['from'].name, coupling['to'].name)
+
+        remaining_weak_couplings: list[dict] = []
+        for coupling in weak_couplings:
+            cluster_index: int | None = cluster_map.get(coupling["from"])
+            if cluster_index is None or cluster_index != cluster_map.get(coupling["to"]):
+                remaining_weak_couplings.append(coupling)
+            else:
+                absorbed_weak_couplings[cluster_index].append(coupling)
+                logger.debug("Found weak exchange between %s and %s and added it to the implicit coupling-scheme.",
+                             coupling['from'].name, coupling['to'].name)
+        logger.debug("There are %d strong exchanges outside of implicit coupling-schemes.",
+                     len(remaining_strong_couplings))
+
+        # Only the couplings outside the implicit coupling-schemes remain to be handled as weak couplings
+        weak_couplings[:] = remaining_weak_couplings + remaining_strong_couplings
+
+        for cluster_index, participants in enumerate(clusters):
+            if len(participants) > 2:
+                # We need a multi-coupling scheme if there is more than one bidirectional strong coupling
+                control_participant: n.ParticipantNode = self._determine_control_participant(
+                    participants, bidirectional_strong_couplings[cluster_index])
+                implicit_coupling_scheme: n.MultiCouplingSchemeNode = n.MultiCouplingSchemeNode(
+                    control_participant=control_participant,
+                    participants=participants)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Created multi-coupling-scheme with control participant %s and participants: %s.",
+                                 control_participant.name, ', '.join(p.name for p in participants))
+            else:
+                # Only one bidirectional strong coupling means implicit coupling-scheme
+                first, second = participants
+                implicit_coupling_scheme: n.CouplingSchemeNode = n.CouplingSchemeNode(
+                    first_participant=first, second_participant=second, type=helper.DEFAULT_IMPLICIT_COUPLING_TYPE)
+                logger.debug("Created implicit coupling-scheme between %s and %s.", first.name, second.name)
+            self.coupling_schemes.append(implicit_coupling_scheme)
 
             # Add all combinations of participants to the coupling-map
             for participant in participants:
@@ -244,61 +285,11 @@ class NodeCreator:
                     if participant != other_participant:
                         coupling_map[frozenset((participant, other_participant))] = implicit_coupling_scheme
 
-        # Only one bidirectional strong coupling means implicit coupling-scheme
-        elif len(bidirectional_strong_coupling_participant_pairs) == 1:
-            # Get both participants
-            first: n.ParticipantNode = list(list(bidirectional_strong_coupling_participant_pairs)[0])[0]
-            second: n.ParticipantNode = list(list(bidirectional_strong_coupling_participant_pairs)[0])[1]
-            implicit_coupling_scheme: n.CouplingSchemeNode = n.CouplingSchemeNode(first_participant=first,
-                                                                                  second_participant=second,
-                                                                                  type=helper.DEFAULT_IMPLICIT_COUPLING_TYPE)
-            coupling_map[frozenset((first, second))] = implicit_coupling_scheme
-            participants: list[n.ParticipantNode] = [first, second]
-            logger.debug(f"Created implicit coupling-scheme between {first.name} and {second.name}.")
-        # No bidirectional strong coupling
-        else:
-            # No implicit coupling-scheme is required.
-            # Add all strong ones to the weak couplings list and let the other method handle them
-            logger.debug("No bidirectional strong couplings found. Adding all strong couplings to weak couplings list.")
-            weak_couplings += strong_couplings
-
-        # If an implicit coupling-scheme was created, exchanges, acceleration and convergence measures are added to it
-        if implicit_coupling_scheme is not None:
-            self.coupling_schemes.append(implicit_coupling_scheme)
-
-            # Add bidirectional strong exchanges to the multi-coupling scheme
-            for coupling in bidirectional_strong_couplings:
+            for coupling in (bidirectional_strong_couplings[cluster_index] + unidirectional_strong_couplings[
+                cluster_index] + absorbed_weak_couplings[cluster_index]):
                 coupling["exchange"].coupling_scheme = implicit_coupling_scheme
                 implicit_coupling_scheme.exchanges.append(coupling["exchange"])
 
-            # Check all other unidirectional strong couplings
-            # Iterate over a copy to be able to remove elements from the list
-            for coupling in unidirectional_strong_couplings.copy():
-                # Both participants are already involved in the multi-coupling scheme
-                # This means we add their exchange to the multi-coupling scheme
-                if coupling["from"] in participants and coupling["to"] in participants:
-                    coupling["exchange"].coupling_scheme = implicit_coupling_scheme
-                    implicit_coupling_scheme.exchanges.append(coupling["exchange"])
-                    # Remove this coupling from the list of unidirectional couplings, as it has already been added to the multi-coupling scheme
-                    unidirectional_strong_couplings.remove(coupling)
-                    logger.debug(f"Found unidirectional strong exchange between {coupling['from'].name} "
-                                 f"and {coupling['to'].name} and added it to the implicit coupling-scheme.")
-
-            # Check all weak couplings
-            for coupling in weak_couplings.copy():
-                # Both participants are already involved in the multi-coupling scheme
-                # This means we add their exchange to the multi-coupling scheme
-                if coupling["from"] in participants and coupling["to"] in participants:
-                    coupling["exchange"].coupling_scheme = implicit_coupling_scheme
-                    implicit_coupling_scheme.exchanges.append(coupling["exchange"])
-                    # Remove this coupling from the list of couplings, as it has already been added to the multi-coupling scheme
-                    weak_couplings.remove(coupling)
-                    logger.debug(f"Found weak exchange between {coupling['from'].name} and {coupling['to'].name} "
-                                 f"and added it to the implicit coupling-scheme.")
-
-            # Add all remaining strong couplings to the weak couplings list
-            weak_couplings += unidirectional_strong_couplings
-
             # Add acceleration and convergence measure for every exchange of the coupling-scheme
             acceleration: n.AccelerationNode = n.AccelerationNode(coupling_scheme=implicit_coupling_scheme,
                                                                   type=helper.DEFAULT_ACCELERATION_TYPE)
@@ -315,11 +306,64 @@ class NodeCreator:
                     data=exchange.data,
                     mesh=exchange.mesh)
                 implicit_coupling_scheme.convergence_measures.append(convergence_measure)
-                logger.debug(f"Added acceleration and convergence-measure for data {exchange.data.name} "
-                             f"on mesh {exchange.mesh.name}.")
+                logger.debug("Added acceleration and convergence-measure for data %s on mesh %s.",
+                             exchange.data.name, exchange.mesh.name)
 
         return coupling_map
 
+    def _find_implicit_clusters(self, strong_couplings: list[dict]) -> list[list[n.ParticipantNode]]:
+        """
+        Find clusters of participants that need to be coupled implicitly.
+        Participants form a graph, in which two participants are adjacent if they have strong couplings in both
+        directions. Since this graph is undirected, its strongly connected components are its connected components,
+        which are found with a depth-first search in linear time.
+        Each component is one cluster. Participants of a cluster are ordered by their first appearance in the
+        strong couplings, which makes the resulting coupling-schemes deterministic.
+        :param strong_couplings: A list of dicts with potential strong coupling schemes.
+        :return: A list of clusters, each being a list of at least two participants.
+        """
+        # Adjacency sets of the directed graph of strong couplings
+        strong_successors: dict[n.ParticipantNode, set[n.ParticipantNode]] = {}
+        for coupling in strong_couplings:
+            strong_successors.setdefault(coupling["from"], set()).add(coupling["to"])
+
+        # Adjacency sets of the undirected graph of bidirectional strong couplings.
+        # Insertion order of the dict is the order of first appearance.
+        bidirectional_neighbours: dict[n.ParticipantNode, set[n.ParticipantNode]] = {}
+        for coupling in strong_couplings:
+            from_participant: n.ParticipantNode = coupling["from"]
+            to_participant: n.ParticipantNode = coupling["to"]
+            if from_participant in strong_successors.get(to_participant, ()):
+                bidirectional_neighbours.setdefault(from_participant, set()).add(to_participant)
+                bidirectional_neighbours.setdefault(to_participant, set()).add(from_participant)
+        logger.debug("There are %d participants involved in bidirectional strong couplings.",
+                     len(bidirectional_neighbours))
+
+        # Assign a component to every participant with a depth-first search
+        component_map: dict[n.ParticipantNode, int] = {}
+        number_of_components: int = 0
+        for start in bidirectional_neighbours:
+            if start in component_map:
+                continue
+            component_map[start] = number_of_components
+            stack: list[n.ParticipantNode] = [start]
+            while stack:
+                participant: n.ParticipantNode = stack.pop()
+                for neighbour in bidirectional_neighbours[participant]:
+                    if neighbour not in component_map:
+                        component_map[neighbour] = number_of_components
+                        stack.append(neighbour)
+            number_of_components += 1
+
+        # Group the participants by component, in order of their first appearance
+        clusters: list[list[n.ParticipantNode]] = [[] for _ in range(number_of_components)]
+        for participant in bidirectional_neighbours:
+            clusters[component_map[participant]].append(participant)
+        for cluster in clusters:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found implicit cluster of participants: %s.", ', '.join(p.name for p in cluster))
+        return clusters
+
     def _create_weak_coupling_schemes(self, weak_couplings: list[dict],
                                       coupling_map: dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode]) -> (
             dict[frozenset[n.ParticipantNode], n.CouplingSchemeNode]):
@@ -341,43 +385,43 @@ class NodeCreator:
                                                                              second_participant=to_participant)
                 coupling_map[frozenset((from_participant, to_participant))] = coupling_scheme
                 self.coupling_schemes.append(coupling_scheme)
-                logger.debug(f"Created coupling-scheme between {from_participant.name} and {to_participant.name}.")
+                logger.debug("Created coupling-scheme between %s and %s.", from_participant.name, to_participant.name)
 
             else:
                 # Otherwise, use the existing one
                 coupling_scheme = coupling_map[frozenset((from_participant, to_participant))]
                 logger.debug(
-                    f"Found existing coupling-scheme between {from_participant.name} and {to_participant.name}.")
+                    "Found existing coupling-scheme between %s and %s.", from_participant.name, to_participant.name)
             # Add the exchange to the coupling-scheme
             coupling_scheme.exchanges.append(weak_coupling["exchange"])
             weak_coupling["exchange"].coupling_scheme = coupling_scheme
-            logger.debug(f"Added exchange of data {weak_coupling['exchange'].data.name} on mesh "
-                         f"{weak_coupling['exchange'].mesh.name} to the coupling-scheme.")
+            logger.debug("Added exchange of data %s on mesh %s to the coupling-scheme.",
+                         weak_coupling['exchange'].data.name, weak_coupling['exchange'].mesh.name)
 
         return coupling_map
 
-    def _initialize_exchanges(self, participant_map: dict[str, n.ParticipantNode],
-                              mesh_map: dict[tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode],
-                              data_map: dict[frozenset, n.DataNode],
+    def _initialize_exchanges(self, mesh_map: dict[tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode],
+                              data_map: dict[int, n.DataNode],
                               mapping_map: dict[tuple[n.MeshNode, n.MeshNode], n.MappingNode]) -> list[dict]:
         """
         Initialize exchanges based on the exchanges-tag of the topology.
         Each exchange corresponds to one exchange node.
         This also creates "potential-couplings", as not every exchange needs a separate coupling-scheme.
         A potential coupling stores information about the exchange, from- and to-participant, and exchange-type.
-        :param participant_map: A dict mapping participant names to participant nodes.
         :param mesh_map: A dict mapping participant pairs and "extensive/intensive" to mesh nodes.
-        :param data_map: A dict mapping data names to data nodes.
+        :param data_map: A dict mapping exchange IDs to data nodes.
         :return: A dict of potential couplings.
         """
         potential_couplings: list[dict] = []
         # An exchange is a dict "from, to, data, type, optional[data-type], from_patch, to_patch"
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            data: n.DataNode = data_map[frozenset(exchange.items())]
+        index: ExchangeIndex = self.exchange_index
+        for exchange_id in index:
+            exchange: dict = index.exchanges[exchange_id]
+            from_participant: n.ParticipantNode = index.from_participants[exchange_id]
+            to_participant: n.ParticipantNode = index.to_participants[exchange_id]
+            data: n.DataNode = data_map[exchange_id]
 
-            data_label: str = helper.get_data_label(data.name.lower()).value
+            data_label: str = index.data_kinds[exchange_id].value
 
             from_mesh: n.MeshNode = mesh_map[(from_participant, to_participant, data_label)]
             to_mesh: n.MeshNode = mesh_map[(to_participant, from_participant, data_label)]
@@ -398,15 +442,15 @@ class NodeCreator:
                 exchange_node: n.ExchangeNode = n.ExchangeNode(coupling_scheme=None, data=data, mesh=to_mesh,
                                                                from_participant=from_participant,
                                                                to_participant=to_participant)
-                logger.debug(f"Created exchange from {from_participant.name} to {to_participant.name} "
-                             f"for data {data.name} on mesh {to_mesh.name}.")
+                logger.debug("Created exchange from %s to %s for data %s on mesh %s.",
+                             from_participant.name, to_participant.name, data.name, to_mesh.name)
             else:
                 # In a read-mapping, the exchanged mesh is the "from"-mesh
                 exchange_node: n.ExchangeNode = n.ExchangeNode(coupling_scheme=None, data=data, mesh=from_mesh,
                                                                from_participant=from_participant,
                                                                to_participant=to_participant)
-                logger.debug(f"Created exchange from {from_participant.name} to {to_participant.name} "
-                             f"for data {data.name} on mesh {from_mesh.name}.")
+                logger.debug("Created exchange from %s to %s for data %s on mesh %s.",
+                             from_participant.name, to_participant.name, data.name, from_mesh.name)
             # Either strong or weak
             exchange_type: str = exchange["type"]
             potential_couplings.append(
@@ -414,27 +458,26 @@ class NodeCreator:
 
         return potential_couplings
 
-    def _initialize_mappings(self, participant_map: dict[str, n.ParticipantNode],
-                             mesh_map: dict[tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode],
-                             data_map: dict[frozenset, n.DataNode]) -> dict[
+    def _initialize_mappings(self, mesh_map: dict[tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode],
+                             data_map: dict[int, n.DataNode]) -> dict[
         tuple[n.MeshNode, n.MeshNode], n.MappingNode]:
         """
         Initialize all mappings. A mapping is needed between two participants if they exchange data over their meshes.
         For each pair of sender-mesh, receiver-mesh, a separate mapping is needed.
         The data (extensive or intensive) that is exchanged determines the type of mapping (write-conservative or read-consistent-mapping).
-        :param participant_map: A dict mapping participant names to participant nodes.
         :param mesh_map: A dict mapping pairs of participants and "extensive/intensive" to mesh nodes.
-        :param data_map: A dict mapping data names to data nodes.
+        :param data_map: A dict mapping exchange IDs to data nodes.
         :return: A dict mapping (from-mesh, to-mesh) to mapping nodes.
         """
         mapping_map: dict[tuple[n.MeshNode, n.MeshNode], n.MappingNode] = {}
         # Check for each exchange whether it already has a mapping and if not, create one
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            data: n.DataNode = data_map[frozenset(exchange.items())]
+        index: ExchangeIndex = self.exchange_index
+        for exchange_id in index:
+            from_participant: n.ParticipantNode = index.from_participants[exchange_id]
+            to_participant: n.ParticipantNode = index.to_participants[exchange_id]
+            data: n.DataNode = data_map[exchange_id]
 
-            data_label: helper.DataKind = helper.get_data_label(data.name.lower())
+            data_label: helper.DataKind = index.data_kinds[exchange_id]
             if data_label == helper.DataKind.DEFAULT:
                 logger.info(f"Data \"{data.name}\" is neither extensive nor intensive. Choosing default "
                                f"{helper.DEFAULT_DATA_KIND} with corresponding {helper.DEFAULT_MAPPING_KIND}-mapping.")
@@ -442,49 +485,53 @@ class NodeCreator:
             from_mesh: n.MeshNode = mesh_map[(from_participant, to_participant, data_label.value)]
             to_mesh: n.MeshNode = mesh_map[(to_participant, from_participant, data_label.value)]
 
-            if data not in from_mesh.use_data:
-                logger.debug(f"Adding use-data {data.name} to mesh {from_mesh.name}.")
+            if (from_mesh, data) not in self.use_data_keys:
+                logger.debug("Adding use-data %s to mesh %s.", data.name, from_mesh.name)
                 from_mesh.use_data.append(data)
-            if data not in to_mesh.use_data:
-                logger.debug(f"Adding use-data {data.name} to mesh {to_mesh.name}.")
+                self.use_data_keys.add((from_mesh, data))
+            if (to_mesh, data) not in self.use_data_keys:
+                logger.debug("Adding use-data %s to mesh %s.", data.name, to_mesh.name)
                 to_mesh.use_data.append(data)
+                self.use_data_keys.add((to_mesh, data))
 
             # Extensive data needs a conservative mapping,
             # so create a write-conservative mapping to allow for parallel participants
             if data_label == helper.DataKind.EXTENSIVE:
-                logger.debug(f"Data {data.name} is extensive. Creating write-conservative mapping.")
+                logger.debug("Data %s is extensive. Creating write-conservative mapping.", data.name)
                 # If no mapping between from-mesh and to-mesh exists, create one
                 if (from_mesh, to_mesh) not in mapping_map:
                     logger.debug(
-                        f"No mapping between {from_mesh.name} and {to_mesh.name} exists. Creating new mapping.")
+                        "No mapping between %s and %s exists. Creating new mapping.", from_mesh.name, to_mesh.name)
                     self._create_write_mapping(from_participant, to_participant, from_mesh, to_mesh, mapping_map)
 
             # Intensive data needs a consistent mapping,
             # so create a read-consistent mapping to allow for parallel participants
             elif data_label == helper.DataKind.INTENSIVE:
-                logger.debug(f"Data {data.name} is intensive. Creating read-consistent mapping.")
+                logger.debug("Data %s is intensive. Creating read-consistent mapping.", data.name)
                 if (from_mesh, to_mesh) not in mapping_map:
                     logger.debug(
-                        f"No mapping between {from_mesh.name} and {to_mesh.name} exists. Creating new mapping.")
+                        "No mapping between %s and %s exists. Creating new mapping.", from_mesh.name, to_mesh.name)
                     self._create_read_mapping(from_participant, to_participant, from_mesh, to_mesh, mapping_map)
             else:
-                logger.debug(f"Data {data.name} is {helper.DEFAULT_DATA_KIND}. Creating read-consistent mapping.")
+                logger.debug("Data %s is %s. Creating read-consistent mapping.", data.name, helper.DEFAULT_DATA_KIND)
                 if (from_mesh, to_mesh) not in mapping_map:
                     logger.debug(
-                        f"No mapping between {from_mesh.name} and {to_mesh.name} exists. Creating new mapping.")
+                        "No mapping between %s and %s exists. Creating new mapping.", from_mesh.name, to_mesh.name)
                     self._create_read_mapping(from_participant, to_participant, from_mesh, to_mesh, mapping_map)
 
             # If a mapping already exists, then the participants already receive the corresponding meshes.
             # Regardless of whether a mapping already exists, write- and read-data tags need to be added.
-            write_data: n.WriteDataNode = n.WriteDataNode(participant=from_participant, data=data, mesh=from_mesh)
-            if not self._contains_write_data(write_data, from_participant.write_data):
-                logger.debug(f"Adding write-data {data.name} to participant {from_participant.name}.")
+            if not self._contains_write_data(from_participant, from_mesh, data):
+                logger.debug("Adding write-data %s to participant %s.", data.name, from_participant.name)
+                write_data: n.WriteDataNode = n.WriteDataNode(participant=from_participant, data=data, mesh=from_mesh)
                 from_participant.write_data.append(write_data)
+                self.write_data_keys.add((from_participant, from_mesh, data))
 
-            read_data: n.ReadDataNode = n.ReadDataNode(participant=to_participant, data=data, mesh=to_mesh)
-            if not self._contains_read_data(read_data, to_participant.read_data):
-                logger.debug(f"Adding read-data {data.name} to participant {to_participant.name}.")
+            if not self._contains_read_data(to_participant, to_mesh, data):
+                logger.debug("Adding read-data %s to participant %s.", data.name, to_participant.name)
+                read_data: n.ReadDataNode = n.ReadDataNode(participant=to_participant, data=data, mesh=to_mesh)
                 to_participant.read_data.append(read_data)
+                self.read_data_keys.add((to_participant, to_mesh, data))
 
         return mapping_map
 
@@ -517,9 +564,9 @@ class NodeCreator:
                                                             from_participant=to_participant,
                                                             api_access=False)
         from_participant.receive_meshes.append(receive_mesh)
-        logger.debug(f"Added receive-mesh {receive_mesh.mesh.name} to participant {from_participant.name}.")
-        logger.debug(f"Created write-mapping between {from_mesh.name} and {to_mesh.name} "
-                     f"for participant {from_participant.name}.")
+        logger.debug("Added receive-mesh %s to participant %s.", receive_mesh.mesh.name, from_participant.name)
+        logger.debug("Created write-mapping between %s and %s for participant %s.",
+                     from_mesh.name, to_mesh.name, from_participant.name)
 
     def _create_read_mapping(self, from_participant: n.ParticipantNode, to_participant: n.ParticipantNode,
                              from_mesh: n.MeshNode, to_mesh: n.MeshNode,
@@ -550,9 +597,9 @@ class NodeCreator:
                                                             from_participant=from_participant,
                                                             api_access=False)
         to_participant.receive_meshes.append(receive_mesh)
-        logger.debug(f"Added receive-mesh {receive_mesh.mesh.name} to participant {to_participant.name}.")
-        logger.debug(f"Created read-mapping between {from_mesh.name} and {to_mesh.name} "
-                     f"for participant {to_participant.name}.")
+        logger.debug("Added receive-mesh %s to participant %s.", receive_mesh.mesh.name, to_participant.name)
+        logger.debug("Created read-mapping between %s and %s for participant %s.",
+                     from_mesh.name, to_mesh.name, to_participant.name)
 
     def _initialize_meshes_and_patches(self, participant_patch_map: dict[tuple[n.ParticipantNode, n.ParticipantNode],
     dict[str, set[str]]]) -> dict[tuple[n.ParticipantNode, n.ParticipantNode, str], n.MeshNode]:
@@ -606,8 +653,8 @@ class NodeCreator:
                 self.meshes.append(intensive_mesh)
                 participant_label_mesh_map[(from_participant, to_participant, "extensive")] = extensive_mesh
                 participant_label_mesh_map[(from_participant, to_participant, "intensive")] = intensive_mesh
-                logger.debug(f"Created extensive and intensive mesh for communication between "
-                             f"{from_participant.name} and {to_participant.name}.")
+                logger.debug("Created extensive and intensive mesh for communication between %s and %s.",
+                             from_participant.name, to_participant.name)
                 # Create new patch nodes for from_participant
                 # Since only the patches of "from" are contained in
                 # participant_patch_map[(from_participant, to_participant)], we must not create any patches for "to"
@@ -641,8 +688,8 @@ class NodeCreator:
                 # Determine the kind of mesh this is (extensive or intensive)
                 label: str = "extensive" if extensives > 0 else "intensive"
                 participant_label_mesh_map[(from_participant, to_participant, label)] = mesh
-                logger.debug(f"Created mesh for communication between {from_participant.name} "
-                             f"and {to_participant.name}.")
+                logger.debug("Created mesh for communication between %s and %s.",
+                             from_participant.name, to_participant.name)
                 # Create new patch nodes for only this label
                 for patch in participant_patch_map[(from_participant, to_participant)][label]:
                     patch_node: helper.PatchNode = helper.PatchNode(name=patch, participant=from_participant,
@@ -669,10 +716,10 @@ class NodeCreator:
                                f"Setting it to {helper.DEFAULT_PARTICIPANT_DIMENSIONALITY}.")
                 dim = helper.DEFAULT_PARTICIPANT_DIMENSIONALITY
             self.participant_dimensionality[parzival] = dim
-            logger.debug(f"Initialized participant {parzival.name} with dimensionality {dim}.")
+            logger.debug("Initialized participant %s with dimensionality %s.", parzival.name, dim)
         return participant_map
 
-    def _data_preprocessing(self, participant_map: dict[str, n.ParticipantNode]):
+    def _data_preprocessing(self) -> None:
         """
         Update data names in the topology dict, if they fulfill these conditions:
          - Data is sent from participant A to participant B with the same name multiple times
@@ -680,167 +727,61 @@ class NodeCreator:
         Then, these exchanges lead to errors, as they are only "unique" in the patch names,
         which are not included in the precice-config; i.e., they would lead to duplicate exchanges.
         Such a data name is then "uniquified", directly in the topology dict.
-        :param participant_map: A dict mapping participant names to participant nodes.
         :return: None
         """
-        # Map tuples of from-/to-participants, data-name, data-type and exchange-type to the from-/to-patches
-        # that are used in exchanges
-        exchange_patch_map: dict[
-            tuple[n.ParticipantNode, n.ParticipantNode, str, e.DataType, str], dict[str, list[str]]] = {}
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            data: str = exchange["data"]
-            data_type = self._get_data_type(exchange)
-            type: str = exchange["type"]
-            from_patch: str = exchange["from-patch"]
-            to_patch: str = exchange["to-patch"]
-            if (from_participant, to_participant, data, data_type, type) in exchange_patch_map:
-                exchange_patch_map[from_participant, to_participant, data, data_type, type]["from-patch"].append(
-                    from_patch)
-                exchange_patch_map[from_participant, to_participant, data, data_type, type]["to-patch"].append(to_patch)
-            else:
-                exchange_patch_map[from_participant, to_participant, data, data_type, type] = \
-                    {"from-patch": [from_patch], "to-patch": [to_patch]}
-
-        # Check every collected tuple for violations
-        for key, patches in exchange_patch_map.items():
-            from_participant, to_participant, data, data_type, type = key
-            from_patches = patches["from-patch"]
-            to_patches = patches["to-patch"]
-            # Check if it is the first occurrence since we want to preserve the original data name 
-            initial: bool = True
-            # If a tuple is not unique, its dict will have sets of length greater than 1
-            if len(from_patches) > 1 or len(to_patches) > 1:
-                for from_patch, to_patch in zip(from_patches, to_patches):
-                    # Iterate over all exchanges to check if they correspond to this tuple
-                    for exchange in self.topology["exchanges"]:
-                        # Check that all values match
-                        if (from_participant.name == exchange["from"] and to_participant.name == exchange["to"]
-                                and data == exchange["data"] and type.lower() == exchange["type"].lower()
-                                and data_type == self._get_data_type(exchange)
-                                and from_patch == exchange["from-patch"] and to_patch == exchange["to-patch"]):
-                            # Do not modify the first occurrence in order to not uniquify all data names
-                            if initial:
-                                initial = False
-                                continue
-                            # All values match, and it is not the first violation
-                            # Thus, uniquify the data name
-                            # Choose a new uniquifier for each violation
-                            uniquifier: str = helper.get_uniquifier()
-                            new_data_name: str = f"{uniquifier.capitalize()}-{helper.capitalize_name(data)}"
-                            exchange["data"] = new_data_name
-
-    def _get_data_type(self, exchange: dict) -> e.DataType:
-        """
-        Get the data-type for the data in the given exchange or choose a default if none is given.
-        E.g., temperature defaults to DataType.SCALAR, whereas force defaults to DataType.VECTOR.
-        :param exchange: The exchange for which the data-type is needed.
-        :return: A data-type for the given exchange, which defaults to the helper.DEFAULT_DATA_TYPE.
-        """
-        data: str = exchange["data"]
-        data_type: e.DataType = exchange.get("data-type")
-        if data_type is None:
-            data_type = helper.DEFAULT_DATA_TYPE
-            # Check if the data has a default type. Sort by key length to have a deterministic order
-            for key in sorted(helper.DEFAULT_DATA_TYPES.keys(), key=len, reverse=True):
-                if key.lower() in data.lower():
-                    data_type = helper.DEFAULT_DATA_TYPES[key]
-                    break
-        return data_type
-
-    def _patch_preprocessing(self, participant_map: dict[str, n.ParticipantNode]):
+        index: ExchangeIndex = self.exchange_index
+        # The index groups exchanges by from-/to-participants, data-name, data-type and exchange-type.
+        # Iterate over a copy, since renaming data moves exchanges to other groups
+        for exchange_ids in list(index.data_map.values()):
+            # If a tuple is not unique, its group contains more than one exchange
+            # Do not modify the first occurrence in order to not uniquify all data names
+            for exchange_id in exchange_ids[1:]:
+                # Choose a new uniquifier for each violation
+                uniquifier: str = helper.get_uniquifier()
+                data: str = index.exchanges[exchange_id]["data"]
+                new_data_name: str = f"{uniquifier.capitalize()}-{helper.capitalize_name(data)}"
+                index.rename_data(exchange_id, new_data_name)
+
+    def _patch_preprocessing(self) -> dict[tuple[n.ParticipantNode, n.ParticipantNode], dict[str, set[str]]]:
         """
         Preprocess patch labels in the topology.
         This is done by first assigning a label ("extensive" or "intensive") to each patch,
         then splitting them up if necessary; i.e., if they have both labels.
         Finally, a map (participant_1, participant_2) -> {extensive: {i_j}, intensive: {l_k}} is created,
         where an entry means that p1 uses extensive patches i_j and intensive patches l_k for communication with p2.
-        :param participant_map: A dict mapping participant names to participant nodes.
         :return: A dict mapping participant pairs to patches used in communication between them.
         """
-        participant_patch_label_map: dict[tuple[n.ParticipantNode, str], set[str]] = {}
-
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            from_patch: str = exchange["from-patch"]
-            to_patch: str = exchange["to-patch"]
-            data_name: str = exchange["data"]
-            # Get data label
-            data_label: str = helper.get_data_label(data_name).value
-            # Create new entries if necessary
-            if (from_participant, from_patch) not in participant_patch_label_map:
-                participant_patch_label_map[(from_participant, from_patch)] = set()
-            if (to_participant, to_patch) not in participant_patch_label_map:
-                participant_patch_label_map[(to_participant, to_patch)] = set()
-            # Add the label to the patch
-            participant_patch_label_map[(from_participant, from_patch)].add(data_label)
-            participant_patch_label_map[(to_participant, to_patch)].add(data_label)
-
-        # Map split-up patches to new patches
-        participant_patch_new_patch_map: dict[tuple[n.ParticipantNode, str], dict[str, str]] = {}
-        # Now, check if a patch has more than one label (i.e., both intensive and extensive)
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            from_patch: str = exchange["from-patch"]
-            to_patch: str = exchange["to-patch"]
-            data_name: str = exchange["data"]
-            # Extensive or intensive
-            data_label: str = helper.get_data_label(data_name).value
-
-            # Check if this patch has been split up before
-            if (from_participant, from_patch) in participant_patch_new_patch_map:
-                # If so, then we just need to assign the new label to the patch
-                exchange["from-patch"] = participant_patch_new_patch_map[(from_participant, from_patch)][data_label]
-            # Else, if this patch has not been split, check if it needs to be split up
-            elif len(participant_patch_label_map[(from_participant, from_patch)]) > 1:
-                extensive_patch: str = f"{from_patch}-extensive"
-                intensive_patch: str = f"{from_patch}-intensive"
-                participant_patch_new_patch_map[(from_participant, from_patch)] = {"extensive": extensive_patch,
-                                                                                   "intensive": intensive_patch}
-                logger.warning(f"Split patch \"{from_patch}\" of participant {from_participant.name} into "
-                               f"extensive patch \"{extensive_patch}\" and intensive patch \"{intensive_patch}\".")
-                # Assign new patch name to the topology
-                exchange["from-patch"] = extensive_patch if data_label == "extensive" else intensive_patch
-            # If the patch has never been split and is not supposed to be split, nothing needs to be done
-
-            # Check if this patch has been split up before
-            if (to_participant, to_patch) in participant_patch_new_patch_map:
-                # If so, then we just need to assign the new label to the patch
-                exchange["to-patch"] = participant_patch_new_patch_map[(to_participant, to_patch)][data_label]
-            # Else, if this patch has not been split, check if it needs to be split up
-            elif len(participant_patch_label_map[(to_participant, to_patch)]) > 1:
-                extensive_patch: str = f"{to_patch}-extensive"
-                intensive_patch: str = f"{to_patch}-intensive"
-                participant_patch_new_patch_map[(to_participant, to_patch)] = {"extensive": extensive_patch,
-                                                                               "intensive": intensive_patch}
-                logger.warning(f"Split patch \"{to_patch}\" of participant {to_participant.name} into "
-                               f"extensive patch \"{extensive_patch}\" and intensive patch \"{intensive_patch}\".")
-                # Assign new patch name to the topology
-                exchange["to-patch"] = extensive_patch if data_label == "extensive" else intensive_patch
-            # If the patch has never been split and is not supposed to be split, nothing needs to be done
+        index: ExchangeIndex = self.exchange_index
+
+        # Determine all patches with more than one label (i.e., both intensive and extensive) before splitting any
+        split_patches: list[tuple[n.ParticipantNode, str]] = [
+            (participant, patch) for (participant, patch), exchange_ids in index.patch_map.items()
+            if len({index.data_kinds[exchange_id] for exchange_id in exchange_ids}) > 1
+        ]
+        for participant, patch in split_patches:
+            extensive_patch: str = f"{patch}-extensive"
+            intensive_patch: str = f"{patch}-intensive"
+            logger.warning(f"Split patch \"{patch}\" of participant {participant.name} into "
+                           f"extensive patch \"{extensive_patch}\" and intensive patch \"{intensive_patch}\".")
+            # Assign new patch names to the topology
+            index.split_patch(participant, patch, {"extensive": extensive_patch, "intensive": intensive_patch})
 
         # Now create a map for which participant pair uses which patch
         # This means that for (p_1,p_2) -> {i_1,...,i_n}, p_1 uses i_j in communication with p_2; p_2 might use other patches
         participant_patch_map: dict[tuple[n.ParticipantNode, n.ParticipantNode], dict[str, set[str]]] = {}
-        for exchange in self.topology["exchanges"]:
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            from_patch: str = exchange["from-patch"]
-            to_patch: str = exchange["to-patch"]
-            data_name: str = exchange["data"]
-            data_label: str = helper.get_data_label(data_name).value
+        for (from_participant, to_participant), exchange_ids in index.participant_pair_map.items():
             # Initialize entries if necessary
             if (from_participant, to_participant) not in participant_patch_map:
                 participant_patch_map[(from_participant, to_participant)] = {"extensive": set(), "intensive": set()}
                 # If this direction does not yet exist, the other direction is also not initialized yet
                 participant_patch_map[(to_participant, from_participant)] = {"extensive": set(), "intensive": set()}
-            # From-participant uses from-patch in communication with to-participant
-            participant_patch_map[(from_participant, to_participant)][data_label].add(from_patch)
-            # To-participant uses to-patch in communication with from-participant
-            participant_patch_map[(to_participant, from_participant)][data_label].add(to_patch)
+            for exchange_id in exchange_ids:
+                exchange: dict = index.exchanges[exchange_id]
+                data_label: str = index.data_kinds[exchange_id].value
+                # From-participant uses from-patch in communication with to-participant
+                participant_patch_map[(from_participant, to_participant)][data_label].add(exchange["from-patch"])
+                # To-participant uses to-patch in communication with from-participant
+                participant_patch_map[(to_participant, from_participant)][data_label].add(exchange["to-patch"])
 
         return participant_patch_map
 
@@ -860,8 +801,8 @@ class NodeCreator:
 
             to_participant: n.ParticipantNode = participant_map[exchange["to"]]
             patch_map[to_participant].add(exchange["to-patch"])
-            logger.debug(f"Added entries for participant {from_participant.name} and patch {exchange['from-patch']}; "
-                         f"as well as for participant {to_participant.name} and patch {exchange['to-patch']}.")
+            logger.debug("Added entries for participant %s and patch %s; as well as for participant %s and patch %s.",
+                         from_participant.name, exchange['from-patch'], to_participant.name, exchange['to-patch'])
         return patch_map
 
     def _determine_control_participant(self, participants: list[n.ParticipantNode],
@@ -880,11 +821,11 @@ class NodeCreator:
             frequency_map[coupling["to"]] += 1
         # On a tie, it will choose the first participant in the list
         control_participant: n.ParticipantNode = max(frequency_map, key=frequency_map.get)
-        logger.debug(f"Control participant determined to be {control_participant.name} "
-                     f"with frequency {frequency_map[control_participant]}.")
+        logger.debug("Control participant determined to be %s with frequency %s.",
+                     control_participant.name, frequency_map[control_participant])
         return control_participant
 
-    def _initialize_data(self, participant_map: dict[str, n.ParticipantNode]) -> dict[frozenset, n.DataNode]:
+    def _initialize_data(self) -> dict[int, n.DataNode]:
         """
         Initialize data nodes based on the participants and exchanges in the topology.
         This takes into account the type of the data node, i.e., either scalar or vector.
@@ -896,11 +837,10 @@ class NodeCreator:
         in particular, with more than four exchanges,
         there may not be enough information to uniquely identify the data node.
         Such cases should, however, not occur frequently.
-        :param participant_map: A dict mapping participant names to participant nodes.
-        :return: A dict mapping exchanges to data nodes.
+        :return: A dict mapping exchange IDs to data nodes.
         """
-        # Map exchanges to data nodes. Use a frozenset since it is hashable and can be used as a key in a dict
-        exchange_data_map: dict[frozenset, n.DataNode] = {}
+        # Map exchange IDs to data nodes
+        exchange_data_map: dict[int, n.DataNode] = {}
         # Map data names to their respective data nodes, differentiating between "vector" and "scalar" data
         data_name_map: dict[str, dict[e.DataType, list[n.DataNode]]] = {}
         # Map pairs of participants and data names to data nodes, differentiating between "vector" and "scalar" data
@@ -909,25 +849,19 @@ class NodeCreator:
         # Keep track of data nodes exchanged by participants
         participant_data_map: dict[tuple[n.ParticipantNode, str], list[n.DataNode]] = {}
 
-        for exchange in self.topology["exchanges"]:
+        index: ExchangeIndex = self.exchange_index
+        for exchange_id in index:
+            exchange: dict = index.exchanges[exchange_id]
             data_name: str = exchange["data"]
-            data_type: e.DataType = exchange.get("data-type")
-            if data_type is None:
-                data_type = helper.DEFAULT_DATA_TYPE
-                # Check if the data has a default type. Sort by key length to have a deterministic order
-                for key in sorted(helper.DEFAULT_DATA_TYPES.keys(), key=len, reverse=True):
-                    if key.lower() in data_name.lower():
-                        data_type = helper.DEFAULT_DATA_TYPES[key]
-                        break
+            data_type: e.DataType = index.data_types[exchange_id]
+            if exchange.get("data-type") is None:
                 logger.warning(f"No data type provided for data \"{data_name}\". "
                                f"Choosing default type \"{data_type.value}\".")
-            else:
-                data_type = e.DataType(data_type)
 
-            from_participant: n.ParticipantNode = participant_map[exchange["from"]]
-            to_participant: n.ParticipantNode = participant_map[exchange["to"]]
-            logger.debug(f"Handling data {data_name} with type {data_type.value} between participants "
-                         f"{from_participant.name} and {to_participant.name}")
+            from_participant: n.ParticipantNode = index.from_participants[exchange_id]
+            to_participant: n.ParticipantNode = index.to_participants[exchange_id]
+            logger.debug("Handling data %s with type %s between participants %s and %s",
+                         data_name, data_type.value, from_participant.name, to_participant.name)
 
             # Roughly, there are three possibilities:
             # 1. The data is not known (great), create a new data node.
@@ -977,7 +911,7 @@ class NodeCreator:
                                 old_data_node.name + "-" + old_data_node.data_type.value)
                             new_data_node: n.DataNode = n.DataNode(name=new_data_name, data_type=data_type)
 
-                            exchange_data_map[frozenset(exchange.items())] = new_data_node
+                            exchange_data_map[exchange_id] = new_data_node
                             self.data.append(new_data_node)
                             data_name_map[data_name][data_type].append(new_data_node)
                             if (from_participant, data_name) in participant_data_map:
@@ -1017,17 +951,18 @@ class NodeCreator:
                                 participant_data_map[(from_participant, data_name)].append(new_data_node)
                             else:
                                 participant_data_map[(from_participant, data_name)] = [new_data_node]
-                            exchange_data_map[frozenset(exchange.items())] = new_data_node
+                            exchange_data_map[exchange_id] = new_data_node
 
                     # Check if this data is already exchanged in the other direction (but not with both types)
                     elif (to_participant, from_participant, data_name) in participant_data_name_map:
                         # If so, the data name needs to be uniquified (and a new data node has to be created),
                         # to avoid both participants writing and reading this data
-                        logger.debug(f"{from_participant.name}->{to_participant.name}: {data_name}({data_type.value})")
+                        logger.debug("%s->%s: %s(%s)",
+                                     from_participant.name, to_participant.name, data_name, data_type.value)
                         # Here, we also want to check that A -> B does not yet exchange this data;
                         # in that case we should not uniquify but split
                         if (from_participant, to_participant, data_name) in participant_data_name_map:
-                            print(participant_data_name_map[(from_participant, to_participant, data_name)])
+                            logger.debug("%s", participant_data_name_map[(from_participant, to_participant, data_name)])
                             # We know that the other type must be known, since it cannot be known with the current type
                             if data_type == e.DataType.VECTOR:
                                 old_data_node: n.DataNode = \
@@ -1068,7 +1003,7 @@ class NodeCreator:
                             participant_data_map[(from_participant, data_name)].append(new_data_node)
                         else:
                             participant_data_map[(from_participant, data_name)] = [new_data_node]
-                        exchange_data_map[frozenset(exchange.items())] = new_data_node
+                        exchange_data_map[exchange_id] = new_data_node
                     else:
                         # Otherwise, we use a data node already exchanged by the from-participant
                         data_node: n.DataNode = None
@@ -1078,8 +1013,8 @@ class NodeCreator:
                                 data_node = value[data_type]
                         # This should not happen
                         assert data_node is not None, "Data node not found."
-                        logger.debug(f"Chose data {data_node.name} with type {data_type.value}.")
-                        exchange_data_map[frozenset(exchange.items())] = data_node
+                        logger.debug("Chose data %s with type %s.", data_node.name, data_type.value)
+                        exchange_data_map[exchange_id] = data_node
 
                 # Either a vector or a scalar variant of the data is already known (not both)
                 else:
@@ -1111,7 +1046,7 @@ class NodeCreator:
                         self.data.append(new_data_node)
                         logger.warning(f"Split up data \"{data_name}\" into {data_node.name} and {new_data_node.name}, "
                                        f"since it occurs with different data types.")
-                        exchange_data_map[frozenset(exchange.items())] = new_data_node
+                        exchange_data_map[exchange_id] = new_data_node
 
                     # Check if this data is exchanged in the other direction, which is not allowed
                     elif (to_participant, from_participant, data_name) in participant_data_name_map:
@@ -1138,10 +1073,10 @@ class NodeCreator:
                             data_name_map[data_name][data_type].append(new_data_node)
                         else:
                             data_name_map[data_name][data_type] = [new_data_node]
-                        exchange_data_map[frozenset(exchange.items())] = new_data_node
+                        exchange_data_map[exchange_id] = new_data_node
                     # Otherwise, record that we observed this data exchange in one direction
                     else:
-                        exchange_data_map[frozenset(exchange.items())] = data_node
+                        exchange_data_map[exchange_id] = data_node
                         if (from_participant, to_participant, data_name) not in participant_data_name_map:
                             participant_data_name_map[(from_participant, to_participant, data_name)] = {
                                 data_type: data_node}
@@ -1153,41 +1088,33 @@ class NodeCreator:
             else:
                 data_node: n.DataNode = n.DataNode(name=helper.capitalize_name(data_name), data_type=data_type)
                 data_name_map[data_name] = {data_type: [data_node]}
-                logger.debug(f"Created new data node {data_node.name} for data {data_name} "
-                             f"between participants {from_participant.name} and {to_participant.name}")
+                logger.debug("Created new data node %s for data %s between participants %s and %s",
+                             data_node.name, data_name, from_participant.name, to_participant.name)
                 self.data.append(data_node)
                 participant_data_map[(from_participant, data_name)] = [data_node]
                 participant_data_name_map[(from_participant, to_participant, data_name)] = {data_type: data_node}
-                exchange_data_map[frozenset(exchange.items())] = data_node
+                exchange_data_map[exchange_id] = data_node
 
         return exchange_data_map
 
-    def _contains_write_data(self, write_data: n.WriteDataNode, suspect_list: list[n.WriteDataNode]) -> bool:
+    def _contains_write_data(self, participant: n.ParticipantNode, mesh: n.MeshNode, data: n.DataNode) -> bool:
         """
-        Check if the given list of write-data nodes already contains the given write-data node.
-        :param write_data: The write-data node to check for.
-        :param suspect_list: The list of write-data nodes to check in.
-        :return: True, if an equivalent write-data node already exists in the list. False otherwise.
+        Check if the given participant already writes the given data to the given mesh.
+        This is a lookup in the set of write-data keys, which mirrors the write-data lists of all participants.
+        :param participant: The participant that writes the data.
+        :param mesh: The mesh the data is written to.
+        :param data: The data that is written.
+        :return: True, if an equivalent write-data node already exists. False otherwise.
         """
-        for suspect in suspect_list:
-            if suspect.data == write_data.data and suspect.mesh == write_data.mesh and suspect.participant == write_data.participant:
-                logger.debug(f"Found write-data node with participant {suspect.participant.name}, "
-                             f"mesh {suspect.mesh.name} and data {suspect.data.name}.")
-                return True
-        return False
-
-    def _contains_read_data(self, read_data: n.ReadDataNode, suspect_list: list[n.ReadDataNode]) -> bool:
+        return (participant, mesh, data) in self.write_data_keys
+
+    def _contains_read_data(self, participant: n.ParticipantNode, mesh: n.MeshNode, data: n.DataNode) -> bool:
         """
-        Check if the given list of read-data nodes already contains the given write-data node.
-        :param read_data: The read-data node to check for.
-        :param suspect_list: The list of read-data nodes to check in.
-        :return: True, if an equivalent read-data node already exists in the list. False otherwise.
+        Check if the given participant already reads the given data from the given mesh.
+        This is a lookup in the set of read-data keys, which mirrors the read-data lists of all participants.
+        :param participant: The participant that reads the data.
+        :param mesh: The mesh the data is read from.
+        :param data: The data that is read.
+        :return: True, if an equivalent read-data node already exists. False otherwise.
         """
-        for suspect in suspect_list:
-            if suspect.data == read_data.data and suspect.mesh == read_data.mesh and suspect.participant == read_data.participant:
-                logger.debug(f"Found read-data node with participant {suspect.participant.name}, "
-                             f"mesh {suspect.mesh.name} and data {suspect.data.name}.")
-                return True
-        return False
-
-
+        return (participant, mesh, data) in self.read_data_keys
@@ -0,0 +1,226 @@
+"""
+This file contains methods to measure the wall time, CPU time and peak memory of the stages of the case generation.
+Stages are marked with profile_stage(), which does nothing unless a StageProfiler is active, such that the
+instrumentation costs nothing in regular runs.
+"""
+
+import contextlib
+import json
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Suffixes of profile outputs that are written as cProfile statistics, which can be read with pstats or snakeviz
+CPROFILE_SUFFIXES: list[str] = [".prof", ".pstats"]
+# Suffix of profile outputs that are written in the file format of https://www.speedscope.app
+SPEEDSCOPE_SUFFIX: str = ".speedscope.json"
+
+# The profiler that profile_stage() reports to, if any
+_active_profiler: "StageProfiler | None" = None
+
+
+class StageRecord:
+    """
+    A class holding the measurements of a single stage.
+    """
+
+    def __init__(self, name: str, path: str, depth: int):
+        """
+        Initialize a StageRecord object.
+        :param name: The name of the stage.
+        :param path: The names of all enclosing stages and this stage, separated by slashes.
+        :param depth: The number of enclosing stages.
+        """
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.wall_time: float = 0.0
+        self.cpu_time: float = 0.0
+        # Highest memory allocated during the stage in bytes, relative to the start of the stage
+        self.peak_memory: int | None = None
+
+    def to_dict(self) -> dict:
+        """
+        Return the measurements as a JSON-serializable dict.
+        :return: A dict with the name, path, depth, wall time, CPU time and peak memory of the stage.
+        """
+        return {"name": self.name, "path": self.path, "depth": self.depth, "wall_time": self.wall_time,
+                "cpu_time": self.cpu_time, "peak_memory": self.peak_memory}
+
+
+class StageProfiler:
+    """
+    A class to measure the stages of the case generation while it is active, i.e., inside a "with" block.
+    Peak memory is measured with tracemalloc, which slows down the generation, so wall and CPU times are higher
+    than without profiling. Optionally, the whole generation is profiled with cProfile as well.
+    """
+
+    def __init__(self, trace_memory: bool = True, cprofile: bool = False):
+        """
+        Initialize a StageProfiler object.
+        :param trace_memory: Measure the peak memory of every stage with tracemalloc.
+        :param cprofile: Profile all function calls with cProfile.
+        """
+        self.trace_memory = trace_memory
+        self.records: list[StageRecord] = []
+        # Open and close events of the stages in seconds since the profiler was activated, for speedscope
+        self.events: list[tuple[str, str, float]] = []
+        self.start_time: float = 0.0
+        self.end_time: float = 0.0
+        # Records of the stages that are currently running and the highest absolute memory seen in each of them
+        self._open_stages: list[tuple[StageRecord, list[int]]] = []
+        self._started_tracemalloc: bool = False
+        self.cprofile = None
+        if cprofile:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+
+    def __enter__(self) -> "StageProfiler":
+        global _active_profiler
+        if _active_profiler is not None:
+            raise RuntimeError("Another profiler is already active.")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        _active_profiler = self
+        self.start_time = time.perf_counter()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        global _active_profiler
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.end_time = time.perf_counter()
+        _active_profiler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """
+        Measure the code inside a "with" block as a stage. Stages may be nested.
+        :param name: The name of the stage.
+        :return: A context manager yielding the record of the stage.
+        """
+        parent_path: str = self._open_stages[-1][0].path + "/" if self._open_stages else ""
+        record: StageRecord = StageRecord(name, parent_path + name, len(self._open_stages))
+        self.records.append(record)
+        start_memory: int = 0
+        if self.trace_memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            # tracemalloc only has one peak, so the peak of the enclosing stage is kept in its entry of _open_stages
+            self._update_open_peaks()
+            tracemalloc.reset_peak()
+        observed_peak: list[int] = [start_memory]
+        self._open_stages.append((record, observed_peak))
+        self.events.append(("O", name, time.perf_counter() - self.start_time))
+        start_wall: float = time.perf_counter()
+        start_cpu: float = time.process_time()
+        try:
+            yield record
+        finally:
+            record.cpu_time = time.process_time() - start_cpu
+            record.wall_time = time.perf_counter() - start_wall
+            self.events.append(("C", name, time.perf_counter() - self.start_time))
+            if self.trace_memory:
+                self._update_open_peaks()
+                record.peak_memory = observed_peak[0] - start_memory
+            self._open_stages.pop()
+
+    def _update_open_peaks(self) -> None:
+        """
+        Add the current peak of tracemalloc to the peaks of all running stages.
+        :return: None
+        """
+        peak: int = tracemalloc.get_traced_memory()[1]
+        for _, observed_peak in self._open_stages:
+            observed_peak[0] = max(observed_peak[0], peak)
+
+    def to_dict(self) -> dict:
+        """
+        Return all measurements as a JSON-serializable dict.
+        :return: A dict with the total wall time and the measurements of every stage, in the order they started.
+        """
+        return {"wall_time": self.end_time - self.start_time,
+                "stages": [record.to_dict() for record in self.records]}
+
+    def log_summary(self) -> None:
+        """
+        Log a table with the wall time, CPU time and peak memory of every stage.
+        Nested stages are indented below their enclosing stage.
+        :return: None
+        """
+        name_width: int = max([len("Stage")] + [2 * record.depth + len(record.name) for record in self.records])
+        logger.info(f"{'Stage':<{name_width}} {'Wall [ms]':>10} {'CPU [ms]':>10} {'Peak memory [KiB]':>18}")
+        for record in self.records:
+            name: str = "  " * record.depth + record.name
+            memory: str = f"{record.peak_memory / 1024:.1f}" if record.peak_memory is not None else "-"
+            logger.info(f"{name:<{name_width}} {record.wall_time * 1000:>10.2f} {record.cpu_time * 1000:>10.2f} "
+                        f"{memory:>18}")
+        # Time outside of all stages, e.g., for importing the modules of the generation
+        total_time: float = self.end_time - self.start_time
+        other_time: float = total_time - sum(record.wall_time for record in self.records if record.depth == 0)
+        logger.info(f"{'(other)':<{name_width}} {other_time * 1000:>10.2f}")
+        logger.info(f"{'Total':<{name_width}} {total_time * 1000:>10.2f}")
+
+    def write(self, output_file: Path) -> None:
+        """
+        Write the measurements to a file. The format depends on the suffix of the file:
+        ".prof" and ".pstats" files hold cProfile statistics, ".speedscope.json" files hold a timeline of the stages
+        for https://www.speedscope.app, and all other files hold the measurements as JSON.
+        :param output_file: The path to the file.
+        :return: None
+        """
+        output_file = Path(output_file)
+        if output_file.suffix.lower() in CPROFILE_SUFFIXES:
+            if self.cprofile is None:
+                raise ValueError(f"Writing {output_file} requires a profiler created with cprofile=True.")
+            self.cprofile.dump_stats(output_file)
+        elif output_file.name.lower().endswith(SPEEDSCOPE_SUFFIX):
+            output_file.write_text(json.dumps(self._to_speedscope()), encoding="utf-8")
+        else:
+            output_file.write_text(json.dumps(self.to_dict(), indent=4), encoding="utf-8")
+        logger.info(f"Profile written to {output_file}.")
+
+    def _to_speedscope(self) -> dict:
+        """
+        Convert the stages to an evented profile of the speedscope file format.
+        :return: The content of a speedscope file as a dict.
+        """
+        frame_indices: dict[str, int] = {}
+        events: list[dict] = []
+        for event_type, name, at in self.events:
+            frame_index: int = frame_indices.setdefault(name, len(frame_indices))
+            events.append({"type": event_type, "frame": frame_index, "at": at})
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name} for name in frame_indices]},
+            "profiles": [{
+                "type": "evented",
+                "name": "precice-case-generate",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.end_time - self.start_time,
+                "events": events,
+            }],
+            "exporter": "precice-case-generate",
+        }
+
+
+def profile_stage(name: str) -> contextlib.AbstractContextManager:
+    """
+    Measure the code inside a "with" block as a stage of the active profiler.
+    :param name: The name of the stage.
+    :return: A context manager measuring the stage, or doing nothing if no profiler is active.
+    """
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.stage(name)
@@ -0,0 +1,381 @@
+"""
+This file contains a local HTTP server that generates preCICE cases on request.
+The server process stays resident, such that the imported modules and the compiled topology schema are loaded once
+and every request only pays for generating the case itself. The server only listens on the loopback interface.
+
+Endpoints:
+
+- GET /health returns the status of the server as JSON.
+- POST /generate takes the content of a topology file as request body and returns all files of the case,
+  as JSON (default) or as a zip archive with "?format=zip".
+"""
+
+import importlib
+import io
+import json
+import logging
+import threading
+import time
+import zipfile
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from typing import TYPE_CHECKING
+
+from precicecasegenerate.cli_helper import DEFAULT_SERVER_PORT, DEFAULT_MAX_REQUESTS
+
+if TYPE_CHECKING:
+    from precicecasegenerate.case_cache import CaseCache
+    from precicecasegenerate.file_creators.case_writer import CaseWriter
+
+logger = logging.getLogger(__name__)
+
+# The server only accepts connections from the local machine
+SERVER_HOST: str = "127.0.0.1"
+# Maximum size of a topology in bytes
+MAX_TOPOLOGY_SIZE: int = 1024 * 1024
+
+HEALTH_PATH: str = "/health"
+GENERATE_PATH: str = "/generate"
+RESPONSE_FORMATS: list[str] = ["json", "zip"]
+# Modules needed to generate a case, which are imported before the first request
+WARM_UP_MODULES: list[str] = [
+    "precicecasegenerate.node_creator",
+    "precicecasegenerate.file_creators.config_creator",
+    "precicecasegenerate.file_creators.adapter_config_creator",
+    "precicecasegenerate.file_creators.utility_file_creator",
+]
+
+
+class _RequestErrorHandler(logging.Handler):
+    """
+    A logging handler that collects the errors logged while a case is generated, such that they are returned to the
+    client that requested the case. Records are assigned to the request by the thread handling it.
+    """
+
+    def __init__(self):
+        """
+        Initialize a _RequestErrorHandler object.
+        """
+        super().__init__(level=logging.ERROR)
+        self.errors: dict[int, list[str]] = {}
+
+    def start(self) -> None:
+        """
+        Start collecting the errors of the current thread.
+        :return: None
+        """
+        self.errors[threading.get_ident()] = []
+
+    def stop(self) -> list[str]:
+        """
+        Stop collecting the errors of the current thread.
+        :return: The messages of all errors logged by the current thread since start() was called.
+        """
+        return self.errors.pop(threading.get_ident(), [])
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Collect the message of the given record, if its thread collects errors.
+        :param record: The log record.
+        :return: None
+        """
+        errors: list[str] | None = self.errors.get(record.thread)
+        if errors is not None:
+            errors.append(record.getMessage())
+
+
+class CaseGenerationServer(ThreadingHTTPServer):
+    """
+    A class to represent a local HTTP server generating cases.
+    Each connection is handled by its own thread, but the cases themselves are generated one at a time,
+    since the case generation uses module-level state, e.g., the uniquifiers of data names.
+    At most max_requests requests are accepted at once, such that a burst of requests cannot pile up indefinitely.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = DEFAULT_SERVER_PORT, max_requests: int = DEFAULT_MAX_REQUESTS,
+                 cache: "CaseCache | None" = None):
+        """
+        Initialize a CaseGenerationServer object and bind it to the given port on the loopback interface.
+        :param port: The port to listen on. With 0, a free port is chosen.
+        :param max_requests: The number of requests that are handled at once.
+        :param cache: A CaseCache to restore and store the cases, or None to disable caching.
+        """
+        super().__init__((SERVER_HOST, port), CaseGenerationRequestHandler)
+        self.max_requests = max_requests
+        self.cache = cache
+        self.request_slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_requests)
+        self.generation_lock: threading.Lock = threading.Lock()
+        self.counter_lock: threading.Lock = threading.Lock()
+        self.active_requests: int = 0
+        self.generated_cases: int = 0
+        self.start_time: float = time.monotonic()
+        self.error_handler: _RequestErrorHandler = _RequestErrorHandler()
+
+    def warm_up(self) -> None:
+        """
+        Import all modules needed to generate a case, compile the topology and adapter config schemas
+        and read the templates of the utility files, such that the first request is as fast as all following ones.
+        :return: None
+        """
+        from precicecasegenerate.input_handler.topology_reader import get_topology_validator
+        from precicecasegenerate.file_creators.adapter_config_creator import get_adapter_config_validator
+        from precicecasegenerate.file_creators import utility_file_creator
+
+        for module_name in WARM_UP_MODULES:
+            importlib.import_module(module_name)
+        get_topology_validator()
+        get_adapter_config_validator()
+        utility_file_creator.get_template(utility_file_creator.RUN_FILE_NAME)
+        utility_file_creator.get_template(utility_file_creator.CLEAN_FILE_NAME)
+
+    def acquire_request_slot(self) -> bool:
+        """
+        Reserve one of the max_requests slots for a request, without waiting.
+        :return: True, if a slot was reserved. False, if the server is busy.
+        """
+        if not self.request_slots.acquire(blocking=False):
+            return False
+        with self.counter_lock:
+            self.active_requests += 1
+        return True
+
+    def release_request_slot(self) -> None:
+        """
+        Release a slot reserved by acquire_request_slot().
+        :return: None
+        """
+        with self.counter_lock:
+            self.active_requests -= 1
+        self.request_slots.release()
+
+    def get_health(self) -> dict:
+        """
+        Return the status of the server.
+        :return: A dict describing the status and load of the server.
+        """
+        from precicecasegenerate.case_cache import get_package_version
+
+        with self.counter_lock:
+            return {
+                "status": "ok",
+                "version": get_package_version(),
+                "uptime": round(time.monotonic() - self.start_time, 3),
+                "active_requests": self.active_requests,
+                "max_requests": self.max_requests,
+                "generated_cases": self.generated_cases,
+            }
+
+    def generate(self, topology_str: str) -> tuple["CaseWriter | None", list[str]]:
+        """
+        Generate the files of a case from the given topology in memory.
+        :param topology_str: The content of a topology file.
+        :return: The writer holding the files of the case, or None if the topology is invalid,
+            and the messages of all errors logged while generating the case.
+        """
+        from precicecasegenerate.cli import create_case
+        from precicecasegenerate.file_creators.case_writer import CaseWriter
+        from precicecasegenerate.input_handler.topology_reader import TopologyReader
+
+        with self.generation_lock:
+            self.error_handler.start()
+            try:
+                writer: CaseWriter = CaseWriter()
+                topology_reader: TopologyReader = TopologyReader(topology_str=topology_str)
+                return_value: int = create_case(topology_reader, writer, cache=self.cache)
+            except Exception as e:
+                # E.g., a YAML syntax error
+                logger.error(f"Generating the case failed: {e}")
+                return_value = 1
+            finally:
+                errors: list[str] = self.error_handler.stop()
+        if return_value != 0:
+            return None, errors
+        writer.close()
+        with self.counter_lock:
+            self.generated_cases += 1
+        return writer, errors
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """
+        Handle requests until shutdown() is called, while collecting the errors of the requests.
+        :param poll_interval: The time between two checks for a shutdown in seconds.
+        :return: None
+        """
+        logging.getLogger().addHandler(self.error_handler)
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            logging.getLogger().removeHandler(self.error_handler)
+
+
+class CaseGenerationRequestHandler(BaseHTTPRequestHandler):
+    """
+    A class to handle a single HTTP request to a CaseGenerationServer.
+    """
+
+    server: CaseGenerationServer
+    # Keep connections open, such that clients sending many requests do not pay for a new connection every time
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        """
+        Handle a GET request, which is only supported for the health endpoint.
+        :return: None
+        """
+        if urlsplit(self.path).path != HEALTH_PATH:
+            self._send_json(HTTPStatus.NOT_FOUND, {"errors": [f"Unknown path {self.path}."]})
+            return
+        self._send_json(HTTPStatus.OK, self.server.get_health())
+
+    def do_POST(self) -> None:
+        """
+        Handle a POST request, which is only supported for the generate endpoint.
+        :return: None
+        """
+        url = urlsplit(self.path)
+        if url.path != GENERATE_PATH:
+            self._reject(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}.")
+            return
+        response_format: str = parse_qs(url.query).get("format", ["json"])[0]
+        if response_format not in RESPONSE_FORMATS:
+            self._reject(HTTPStatus.BAD_REQUEST, f"Unknown format {response_format}. "
+                                                 f"Supported formats are {', '.join(RESPONSE_FORMATS)}.")
+            return
+        try:
+            length: int = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self._reject(HTTPStatus.LENGTH_REQUIRED, "The request needs a valid Content-Length header.")
+            return
+        if length > MAX_TOPOLOGY_SIZE:
+            self._reject(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Topologies are limited to {MAX_TOPOLOGY_SIZE} bytes.")
+            return
+        if not self.server.acquire_request_slot():
+            self._reject(HTTPStatus.SERVICE_UNAVAILABLE,
+                         f"The server is busy with {self.server.max_requests} requests. Try again later.",
+                         headers={"Retry-After": "1"})
+            return
+
+        try:
+            start: float = time.perf_counter()
+            try:
+                topology_str: str = self.rfile.read(length).decode("utf-8")
+            except UnicodeDecodeError:
+                self._send_json(HTTPStatus.BAD_REQUEST, {"errors": ["The topology is not valid UTF-8."]})
+                return
+            writer, errors = self.server.generate(topology_str)
+        finally:
+            self.server.release_request_slot()
+
+        if writer is None:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {"errors": errors})
+            return
+        duration: float = time.perf_counter() - start
+        logger.info(f"Generated a case with {len(writer.contents)} files in {duration * 1000:.1f} ms.")
+        if response_format == "zip":
+            self._send(HTTPStatus.OK, _create_zip_archive(writer), "application/zip")
+        else:
+            self._send_json(HTTPStatus.OK, {
+                "files": {path: content.decode("utf-8") for path, content in writer.contents.items()},
+                "executable_files": sorted(writer.executable_files),
+                "duration": round(duration, 6),
+            })
+
+    def _reject(self, status: HTTPStatus, error: str, headers: dict[str, str] | None = None) -> None:
+        """
+        Send an error response without reading the request body, and close the connection afterward,
+        since the unread body would otherwise be taken for the next request.
+        :param status: The HTTP status of the response.
+        :param error: The error message.
+        :param headers: Additional headers of the response.
+        :return: None
+        """
+        self.close_connection = True
+        self._send_json(status, {"errors": [error]}, headers=headers)
+
+    def _send_json(self, status: HTTPStatus, body: dict, headers: dict[str, str] | None = None) -> None:
+        """
+        Send a response with the given JSON body.
+        :param status: The HTTP status of the response.
+        :param body: The body of the response, which is serialized to JSON.
+        :param headers: Additional headers of the response.
+        :return: None
+        """
+        self._send(status, json.dumps(body).encode("utf-8"), "application/json", headers=headers)
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers: dict[str, str] | None = None) -> None:
+        """
+        Send a response with the given body.
+        :param status: The HTTP status of the response.
+        :param body: The body of the response.
+        :param content_type: The content type of the body.
+        :param headers: Additional headers of the response.
+        :return: None
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Log every request at debug level instead of printing it to stderr.
+        :param format: The format string of the message.
+        :param args: The arguments of the format string.
+        :return: None
+        """
+        logger.debug("%s - " + format, self.address_string(), *args)
+
+
+def _create_zip_archive(writer: "CaseWriter") -> bytes:
+    """
+    Pack all files of a case into a zip archive in memory, keeping scripts executable.
+    :param writer: The writer holding the files of the case.
+    :return: The content of the zip archive.
+    """
+    from precicecasegenerate.file_creators.case_writer import FILE_MODE, EXECUTABLE_FILE_MODE
+
+    buffer: io.BytesIO = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for relative_path, content in sorted(writer.contents.items()):
+            info = zipfile.ZipInfo(relative_path)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            mode: int = EXECUTABLE_FILE_MODE if relative_path in writer.executable_files else FILE_MODE
+            # The upper 16 bits hold the Unix file permissions
+            info.external_attr = mode << 16
+            archive.writestr(info, content)
+    return buffer.getvalue()
+
+
+def run_server(port: int = DEFAULT_SERVER_PORT, max_requests: int = DEFAULT_MAX_REQUESTS,
+               cache: "CaseCache | None" = None) -> int:
+    """
+    Run a CaseGenerationServer until the process is interrupted.
+    :param port: The port to listen on. With 0, a free port is chosen.
+    :param max_requests: The number of requests that are handled at once.
+    :param cache: A CaseCache to restore and store the cases, or None to disable caching.
+    :return: 0 once the server is stopped with Ctrl+C, 1 if the server could not be started.
+    """
+    try:
+        server: CaseGenerationServer = CaseGenerationServer(port, max_requests=max_requests, cache=cache)
+    except OSError as e:
+        logger.critical(f"Could not start the server on port {port}: {e}. Aborting program.")
+        return 1
+    with server:
+        server.warm_up()
+        host, port = server.server_address[:2]
+        logger.info(f"Serving on http://{host}:{port} with at most {max_requests} concurrent requests. "
+                    f"Press Ctrl+C to stop.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info(f"Stopped the server after generating {server.generated_cases} cases.")
+    return 0
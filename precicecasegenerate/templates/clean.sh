@@ -32,6 +32,8 @@ ROOT_PRESERVE_PATHS=(
     "clean.sh"
     "README.md"
     "precice-config.xml"
+    ".precice-case-generate-manifest.json"   # records the generated files for incremental regeneration
+    ".precice-case-generate.lock"   # serializes concurrent runs of preCICE case-generate
     "$LOG_FILE"   # always keep the log (will be overwritten)
 )
 
@@ -0,0 +1,283 @@
+"""
+This file contains methods to regenerate a preCICE case whenever its topology file changes.
+The process stays resident, such that the imported modules, the compiled topology schema and the manifest of the
+output directory are loaded once instead of for every edit of the topology.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from precicecasegenerate.case_cache import CaseCache
+
+logger = logging.getLogger(__name__)
+
+# Time in seconds without further changes before the case is regenerated, since editors often write a file in steps
+DEFAULT_DEBOUNCE: float = 0.1
+# Time in seconds between two checks of the topology file if inotify is not available
+DEFAULT_POLL_INTERVAL: float = 0.5
+
+# Events of the directory of the topology file that may change the topology file, see inotify(7)
+_IN_MODIFY: int = 0x00000002
+_IN_CLOSE_WRITE: int = 0x00000008
+_IN_MOVED_TO: int = 0x00000080
+_IN_CREATE: int = 0x00000100
+_INOTIFY_MASK: int = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+# Header of an inotify event: watch descriptor, mask, cookie and length of the name that follows
+_INOTIFY_EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+
+class InotifyFileWatcher:
+    """
+    A class to wait for changes of a file using inotify, which is only available on Linux.
+    The directory of the file is watched instead of the file itself, since many editors save a file by replacing it.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Initialize an InotifyFileWatcher object and start watching the directory of the given file.
+        Raises an OSError if inotify is not available.
+        :param file_path: The path to the file to watch.
+        """
+        self.file_name = file_path.name
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available.")
+        self.file_descriptor: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        if libc.inotify_add_watch(self.file_descriptor, os.fsencode(file_path.parent), _INOTIFY_MASK) < 0:
+            error: int = ctypes.get_errno()
+            os.close(self.file_descriptor)
+            raise OSError(error, os.strerror(error), str(file_path.parent))
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the file changes.
+        :param timeout: The maximum time to wait in seconds, or None to wait indefinitely.
+        :return: True, if the file changed. False, if the timeout expired.
+        """
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining: float | None = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.file_descriptor], [], [], remaining)
+            if not readable:
+                return False
+            if self._read_events():
+                return True
+
+    def _read_events(self) -> bool:
+        """
+        Read all pending events of the watched directory.
+        :return: True, if any of the events concerns the watched file. False otherwise.
+        """
+        try:
+            data: bytes = os.read(self.file_descriptor, 64 * 1024)
+        except BlockingIOError:
+            return False
+        changed: bool = False
+        offset: int = 0
+        while offset < len(data):
+            _, _, _, name_length = _INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT_HEADER.size
+            # The name is padded with null bytes
+            name: str = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            if name == self.file_name:
+                changed = True
+        return changed
+
+    def close(self) -> None:
+        """
+        Stop watching the file.
+        :return: None
+        """
+        os.close(self.file_descriptor)
+
+
+class PollingFileWatcher:
+    """
+    A class to wait for changes of a file by periodically checking its modification time, size and inode.
+    """
+
+    def __init__(self, file_path: Path, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Initialize a PollingFileWatcher object.
+        :param file_path: The path to the file to watch.
+        :param poll_interval: The time between two checks of the file in seconds.
+        """
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self.signature: tuple[int, int, int] | None = self._get_signature()
+
+    def _get_signature(self) -> tuple[int, int, int] | None:
+        """
+        Return the modification time, size and inode of the file, which change whenever the file is written.
+        :return: A tuple identifying the state of the file, or None if the file does not exist.
+        """
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until the file changes.
+        :param timeout: The maximum time to wait in seconds, or None to wait indefinitely.
+        :return: True, if the file changed. False, if the timeout expired.
+        """
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature: tuple[int, int, int] | None = self._get_signature()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+            sleep_time: float = self.poll_interval
+            if deadline is not None:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                sleep_time = min(sleep_time, remaining)
+            time.sleep(sleep_time)
+
+    def close(self) -> None:
+        """
+        Stop watching the file.
+        :return: None
+        """
+        pass
+
+
+def create_file_watcher(file_path: Path, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                        polling: bool = False) -> InotifyFileWatcher | PollingFileWatcher:
+    """
+    Create a watcher for the given file, which uses inotify if it is available and polling otherwise.
+    :param file_path: The path to the file to watch.
+    :param poll_interval: The time between two checks of the file in seconds, if polling is used.
+    :param polling: Use polling even if inotify is available.
+    :return: A file watcher.
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            file_watcher: InotifyFileWatcher = InotifyFileWatcher(file_path)
+            logger.debug("Watching %s using inotify.", file_path)
+            return file_watcher
+        except OSError as e:
+            logger.debug("inotify is not available, falling back to polling: %s", e)
+    logger.debug("Watching %s by polling every %s seconds.", file_path, poll_interval)
+    return PollingFileWatcher(file_path, poll_interval)
+
+
+class TopologyWatcher:
+    """
+    A class to regenerate a case whenever its topology file changes.
+    Only files whose content changed are rewritten, and the manifest of the output directory is kept in memory
+    between regenerations. A failed regeneration, e.g., due to a topology that is only partially edited,
+    leaves the previous case untouched.
+    """
+
+    def __init__(self, input_file: Path, output_root: Path, cache: "CaseCache | None" = None,
+                 debounce: float = DEFAULT_DEBOUNCE, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 polling: bool = False, validate_adapter_configs: bool = True, validate_config: bool = False):
+        """
+        Initialize a TopologyWatcher object.
+        :param input_file: The path to the topology file to watch.
+        :param output_root: The root directory for the generated files.
+        :param cache: A CaseCache to restore and store the files, or None to disable caching.
+        :param debounce: The time in seconds without further changes before the case is regenerated.
+        :param poll_interval: The time between two checks of the topology file in seconds, if polling is used.
+        :param polling: Use polling even if inotify is available.
+        :param validate_adapter_configs: Validate the generated adapter configs against the precice-adapter-schema.
+        :param validate_config: Check the generated preCICE configuration with the rules of precice-config-check.
+        """
+        self.input_file = Path(input_file).resolve()
+        self.output_root = Path(output_root)
+        self.cache = cache
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.polling = polling
+        self.validate_adapter_configs = validate_adapter_configs
+        self.validate_config = validate_config
+        # The manifest written by the last successful regeneration, such that it does not have to be read again
+        self.manifest: dict[str, dict[str, str | int]] | None = None
+        # The hash of the topology the case was last generated from
+        self.topology_hash: str | None = None
+        self.regenerations: int = 0
+
+    def regenerate(self, changed_at: float | None = None) -> int:
+        """
+        Regenerate the case if the content of the topology file changed since the last successful regeneration.
+        Errors are logged instead of raised, such that watching continues.
+        :param changed_at: The time.perf_counter() value when the change of the topology file was detected, if any.
+        :return: 0 if the case is up to date, 1 otherwise.
+        """
+        # Imported here, since the CLI module imports this module
+        from precicecasegenerate.cli import write_case
+        from precicecasegenerate.file_creators.case_writer import DirectoryWriter
+
+        start: float = time.perf_counter()
+        try:
+            topology_bytes: bytes = self.input_file.read_bytes()
+        except OSError as e:
+            logger.error(f"Could not read topology file {self.input_file}: {e}")
+            return 1
+        topology_hash: str = hashlib.sha256(topology_bytes).hexdigest()
+        if topology_hash == self.topology_hash:
+            logger.info(f"Content of {self.input_file} is unchanged, so the case is up to date.")
+            return 0
+
+        try:
+            self.output_root.mkdir(parents=True, exist_ok=True)
+            writer: DirectoryWriter = DirectoryWriter(self.output_root, previous_manifest=self.manifest)
+            # Generate the case from the content that was hashed, even if the file changes again in the meantime
+            return_value: int = write_case(self.input_file, writer, cache=self.cache,
+                                           topology_str=topology_bytes.decode("utf-8"),
+                                           validate_adapter_configs=self.validate_adapter_configs,
+                                           validate_config=self.validate_config)
+        except Exception as e:
+            logger.error(f"Generating the case from {self.input_file} failed: {e}")
+            return_value = 1
+        end: float = time.perf_counter()
+        if return_value != 0:
+            logger.error(f"Regeneration failed after {(end - start) * 1000:.0f} ms. The previous case is kept.")
+            return return_value
+
+        self.manifest = writer.manifest
+        self.topology_hash = topology_hash
+        self.regenerations += 1
+        latency: str = f", {(end - changed_at) * 1000:.0f} ms after the change" if changed_at is not None else ""
+        logger.info(f"Regenerated case in {self.output_root} in {(end - start) * 1000:.0f} ms{latency}.")
+        return 0
+
+    def watch(self) -> int:
+        """
+        Generate the case and regenerate it whenever the topology file changes, until the process is interrupted.
+        :return: 0 once watching is stopped with Ctrl+C.
+        """
+        file_watcher: InotifyFileWatcher | PollingFileWatcher = create_file_watcher(
+            self.input_file, poll_interval=self.poll_interval, polling=self.polling)
+        try:
+            self.regenerate()
+            logger.info(f"Watching {self.input_file} for changes. Press Ctrl+C to stop.")
+            while True:
+                file_watcher.wait()
+                changed_at: float = time.perf_counter()
+                # Wait until the file stops changing, since editors often write a file in several steps
+                while file_watcher.wait(self.debounce):
+                    pass
+                self.regenerate(changed_at)
+        except KeyboardInterrupt:
+            logger.info(f"Stopped watching {self.input_file} after {self.regenerations} regenerations.")
+        finally:
+            file_watcher.close()
+        return 0
@@ -0,0 +1,36 @@
+"""
+This file tests that the adapter configs rendered from the interface index match a scan of all read- and write-data.
+"""
+from pathlib import Path
+
+from precicecasegenerate import helper
+from precicecasegenerate.benchmark.synthetic_topology import generate_topology
+from precicecasegenerate.file_creators.adapter_config_creator import AdapterConfigCreator
+from precicecasegenerate.node_creator import NodeCreator
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+
+
+def test_interface_index_matches_scan():
+    """
+    Test that every interface lists exactly the sorted patches, read-data and write-data of its mesh,
+    for participants with many meshes and data.
+    """
+    helper.reset_uniquifiers()
+    topology: dict = generate_topology(6, 80, patch_reuse=0.3, duplicate_data=0.5, seed=7)
+    node_creator: NodeCreator = NodeCreator(topology)
+    mesh_patch_map: dict = node_creator.get_mesh_patch_map()
+    adapter_config_creator: AdapterConfigCreator = AdapterConfigCreator(node_creator.get_participant_solver_map(),
+                                                                        mesh_patch_map)
+
+    for participant in node_creator.get_participant_solver_map():
+        adapter_config: dict = adapter_config_creator._create_adapter_config_dict(participant)
+        assert [interface["mesh_name"] for interface in adapter_config["interfaces"]] == [
+            mesh.name for mesh in participant.provide_meshes]
+        for mesh, interface in zip(participant.provide_meshes, adapter_config["interfaces"]):
+            read_data: list[str] = sorted(rd.data.name for rd in participant.read_data if rd.mesh == mesh)
+            write_data: list[str] = sorted(wd.data.name for wd in participant.write_data if wd.mesh == mesh)
+            assert interface["patches"] == sorted(mesh_patch_map.get(mesh, []))
+            assert interface.get("read_data_names", []) == read_data
+            assert interface.get("write_data_names", []) == write_data
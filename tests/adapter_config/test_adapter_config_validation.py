@@ -0,0 +1,68 @@
+"""
+This file tests that adapter configs are validated in bulk with a shared validator and that validation can be skipped.
+"""
+import logging
+from pathlib import Path
+
+import jsonschema
+import preciceadapterschema
+import pytest
+
+from precicecasegenerate.cli import generate_case_files
+from precicecasegenerate.file_creators.adapter_config_creator import AdapterConfigCreator, get_adapter_config_validator
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+VALID_ADAPTER_CONFIG: dict = {
+    "participant_name": "Fluid",
+    "precice_config_file_path": "../precice-config.xml",
+    "interfaces": [{"mesh_name": "Fluid-Mesh", "patches": ["interface"], "write_data_names": ["Force"]}],
+}
+INVALID_ADAPTER_CONFIG: dict = {
+    "participant_name": "Solid",
+    "interfaces": [{"mesh_name": 3, "patches": "interface"}],
+}
+
+
+def test_adapter_config_validator_is_cached():
+    """
+    Test that the adapter config schema is compiled only once and reused for all adapter configs.
+    """
+    assert get_adapter_config_validator() is get_adapter_config_validator()
+
+
+def test_validator_matches_adapter_schema_package():
+    """
+    Test that the shared validator accepts and rejects the same adapter configs as the precice-adapter-schema package.
+    """
+    preciceadapterschema.validate(VALID_ADAPTER_CONFIG)
+    assert list(get_adapter_config_validator().iter_errors(VALID_ADAPTER_CONFIG)) == []
+    with pytest.raises(jsonschema.ValidationError):
+        preciceadapterschema.validate(INVALID_ADAPTER_CONFIG)
+    assert list(get_adapter_config_validator().iter_errors(INVALID_ADAPTER_CONFIG)) != []
+
+
+def test_bulk_validation_reports_all_errors(caplog):
+    """
+    Test that all errors of all invalid adapter configs are reported with the directory of their adapter config.
+    """
+    adapter_config_creator: AdapterConfigCreator = AdapterConfigCreator({}, {})
+    with caplog.at_level(logging.ERROR):
+        errors: dict = adapter_config_creator.validate_adapter_configs({
+            Path("fluid-solver"): VALID_ADAPTER_CONFIG,
+            Path("solid-solver"): INVALID_ADAPTER_CONFIG,
+        })
+    assert list(errors) == [Path("solid-solver")]
+    assert len(errors[Path("solid-solver")]) >= 2
+    assert len(caplog.records) == len(errors[Path("solid-solver")])
+    assert all("solid-solver" in record.getMessage() for record in caplog.records)
+
+
+def test_skip_adapter_validation():
+    """
+    Test that skipping the validation of the adapter configs does not change the generated case.
+    """
+    topology_str: str = topology_file.read_text()
+    assert generate_case_files(topology_str, validate_adapter_configs=False) == generate_case_files(topology_str)
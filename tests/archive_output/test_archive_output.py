@@ -0,0 +1,70 @@
+"""
+This file tests that cases can be written directly into tar and zip archives.
+"""
+import os
+import stat
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.cli import generate_case, generate_case_files
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+
+def _read_archive(archive_path: Path) -> tuple[dict[str, bytes], dict[str, int]]:
+    """
+    Read all files of a tar or zip archive.
+    :param archive_path: The path to the archive.
+    :return: Dicts mapping the names of the files to their content and to their permissions.
+    """
+    contents: dict[str, bytes] = {}
+    modes: dict[str, int] = {}
+    if archive_path.suffix == ".zip":
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                contents[info.filename] = archive.read(info)
+                modes[info.filename] = stat.S_IMODE(info.external_attr >> 16)
+    else:
+        with tarfile.open(archive_path) as archive:
+            for member in archive.getmembers():
+                contents[member.name] = archive.extractfile(member).read()
+                modes[member.name] = member.mode
+    return contents, modes
+
+
+@pytest.mark.parametrize("archive_name", ["case.tar", "case.tar.gz", "case.tar.xz", "case.zip"])
+def test_archive_output(archive_name: str):
+    """
+    Test that a case is written into a single archive with executable scripts and without any other files.
+    :param archive_name: The name of the archive, which determines its format.
+    """
+    expected_contents: dict[str, bytes] = generate_case_files(topology_file.read_text())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path: Path = Path(temp_dir) / archive_name
+        assert generate_case(topology_file, archive_path) == 0
+        assert os.listdir(temp_dir) == [archive_name], "Files were written outside of the archive."
+
+        contents, modes = _read_archive(archive_path)
+    assert contents == {f"case/{name}": content for name, content in expected_contents.items()}, \
+        "The archive does not contain the files of the case."
+    for name, mode in modes.items():
+        expected_mode: int = 0o755 if name.endswith(".sh") else 0o644
+        assert mode == expected_mode, f"File {name} has permissions {oct(mode)}."
+
+
+def test_scripts_are_executable_in_directory():
+    """
+    Test that the generated scripts are executable when a case is written to a directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert generate_case(topology_file, Path(temp_dir)) == 0
+        assert os.access(Path(temp_dir) / "clean.sh", os.X_OK), "clean.sh is not executable."
+        assert os.access(Path(temp_dir) / "propagator-bsolver" / "run.sh", os.X_OK), "run.sh is not executable."
+        assert not os.access(Path(temp_dir) / "precice-config.xml", os.X_OK)
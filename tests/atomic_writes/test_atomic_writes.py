@@ -0,0 +1,68 @@
+"""
+This file tests that cases are written atomically and that concurrent runs on the same output root are safe.
+"""
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.cli import generate_case, generate_case_files
+from precicecasegenerate.file_creators.case_writer import MANIFEST_FILE_NAME, LOCK_FILE_NAME, STAGING_DIR_PREFIX
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+full_topology: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+reduced_topology: Path = test_directory.parent / "incremental_generation" / "reduced_topology" / "topology.yaml"
+
+
+def _read_files(directory: Path) -> dict[str, bytes]:
+    """
+    Return the content of all generated files in the given directory.
+    :param directory: The directory to read.
+    :return: A dict mapping relative file paths to their content.
+    """
+    return {path.relative_to(directory).as_posix(): path.read_bytes() for path in directory.rglob("*")
+            if path.is_file() and path.name not in [MANIFEST_FILE_NAME, LOCK_FILE_NAME]}
+
+
+def test_failed_run_leaves_previous_case_untouched(monkeypatch):
+    """
+    Test that a run failing halfway neither modifies the previous case nor leaves staged files behind.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root: Path = Path(temp_dir)
+        assert generate_case(full_topology, output_root) == 0
+        previous_files: dict[str, bytes] = _read_files(output_root)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("Simulated crash")
+
+        monkeypatch.setattr("precicecasegenerate.file_creators.utility_file_creator.UtilityFileCreator"
+                            ".create_utility_files", fail)
+        with pytest.raises(RuntimeError):
+            generate_case(reduced_topology, output_root)
+        assert _read_files(output_root) == previous_files, "The failed run modified the previous case."
+        assert not list(output_root.glob(f"{STAGING_DIR_PREFIX}*")), "Staged files were left behind."
+
+        # The lock has been released
+        monkeypatch.undo()
+        assert generate_case(reduced_topology, output_root) == 0
+
+
+def test_concurrent_runs_on_same_output_root():
+    """
+    Test that concurrent runs with different topologies on the same output root never mix their files.
+    """
+    full_files: dict[str, bytes] = generate_case_files(full_topology.read_text())
+    reduced_files: dict[str, bytes] = generate_case_files(reduced_topology.read_text())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root: Path = Path(temp_dir)
+        topologies: list[Path] = [full_topology, reduced_topology] * 4
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            return_values: list[int] = list(executor.map(generate_case, topologies, [output_root] * len(topologies)))
+        assert return_values == [0] * len(topologies), "Not all runs were successful."
+
+        assert _read_files(output_root) in [full_files, reduced_files], "The files of concurrent runs were mixed."
+        assert not list(output_root.glob(f"{STAGING_DIR_PREFIX}*")), "Staged files were left behind."
@@ -0,0 +1,79 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from ruamel.yaml import YAML
+
+from precicecasegenerate import batch
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+examples_directory: Path = test_directory.parent.parent / "examples"
+
+
+def test_batch_of_examples():
+    """
+    Test that a batch over the examples directory generates every example in its own subfolder.
+    """
+    topology_files: list[Path] = batch.collect_topology_files(str(examples_directory))
+    assert len(topology_files) == len(list(examples_directory.rglob("*.yaml"))), "Not all examples were collected."
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results: list[batch.CaseResult] = batch.generate_batch(topology_files, Path(temp_dir))
+        assert batch.log_batch_summary(results) == 0, "Not all examples were generated successfully."
+
+        for result in results:
+            assert result.name == result.input_file.parent.name, f"Unexpected case name {result.name}."
+            assert (Path(temp_dir) / result.name / "precice-config.xml").exists(), \
+                f"No config generated for case {result.name}."
+
+
+def test_parallel_batch_of_examples():
+    """
+    Test that a batch spread across worker processes yields the same files as a batch in a single process.
+    """
+    topology_files: list[Path] = batch.collect_topology_files(str(examples_directory))
+
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as parallel_dir:
+        serial_results: list[batch.CaseResult] = batch.generate_batch(topology_files, Path(serial_dir))
+        parallel_results: list[batch.CaseResult] = batch.generate_batch(topology_files, Path(parallel_dir), jobs=2)
+        assert batch.log_batch_summary(parallel_results) == 0, "Not all examples were generated successfully."
+        assert [r.name for r in parallel_results] == [r.name for r in serial_results], \
+            "The results are not in the order of the topology files."
+
+        serial_files: list[Path] = sorted(p.relative_to(serial_dir) for p in Path(serial_dir).rglob("*"))
+        parallel_files: list[Path] = sorted(p.relative_to(parallel_dir) for p in Path(parallel_dir).rglob("*"))
+        assert serial_files == parallel_files, "The parallel batch generated different files."
+
+
+def test_batch_from_manifest():
+    """
+    Test that a manifest file is read relative to its own location, skipping comments and empty lines.
+    """
+    topology_files: list[Path] = batch.collect_topology_files(str(test_directory / "manifest.txt"))
+    assert topology_files == sorted([(examples_directory / "tutorial1" / "topology.yaml").resolve(),
+                                     (examples_directory / "strong-coupling" / "topology.yaml").resolve()])
+    assert sorted(batch.get_case_names(topology_files).values()) == ["strong-coupling", "tutorial1"]
+
+
+def test_batch_with_json_topology(tmp_path: Path):
+    """
+    Test that JSON topologies are collected from directories and given directly, while adapter configs are skipped.
+    """
+    yaml_file: Path = tmp_path / "tutorial1" / "topology.yaml"
+    yaml_file.parent.mkdir()
+    shutil.copy(examples_directory / "tutorial1" / "topology.yaml", yaml_file)
+    json_file: Path = tmp_path / "tutorial2.json"
+    json_file.write_text(json.dumps(YAML(typ="safe").load(examples_directory / "tutorial2" / "topology.yaml")))
+    # An adapter config of a case generated in the directory is not a topology
+    shutil.copytree(examples_directory / "tutorial2" / "_reference", tmp_path / "generated")
+
+    topology_files: list[Path] = batch.collect_topology_files(str(tmp_path))
+    assert topology_files == sorted([yaml_file.resolve(), json_file.resolve()])
+    assert batch.collect_topology_files(str(json_file)) == [json_file.resolve()], "The JSON file was not collected."
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results: list[batch.CaseResult] = batch.generate_batch(topology_files, Path(temp_dir))
+        assert batch.log_batch_summary(results) == 0, "Not all topologies were generated successfully."
+        assert (Path(temp_dir) / "tutorial2" / "precice-config.xml").exists(), "The JSON topology was not generated."
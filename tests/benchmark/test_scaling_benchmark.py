@@ -0,0 +1,73 @@
+"""
+This file tests that synthetic topologies are valid and that the scaling benchmark reports every stage.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.benchmark.scaling_benchmark import (STAGES, TOTAL, check_thresholds, get_scaling_exponents,
+                                                              run_benchmark)
+from precicecasegenerate.benchmark.synthetic_topology import generate_topology, topology_to_yaml
+from precicecasegenerate.cli import generate_case_files
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+
+
+@pytest.mark.parametrize("participants,exchanges", [(2, 1), (5, 20), (12, 60)])
+def test_synthetic_topology_is_valid(participants: int, exchanges: int):
+    """
+    Test that synthetic topologies have the requested size, are deterministic and generate a case.
+    """
+    topology: dict = generate_topology(participants, exchanges, strong_ratio=0.5, patch_reuse=0.5,
+                                       duplicate_data=0.5, seed=3)
+    assert len(topology["participants"]) == participants
+    assert len(topology["exchanges"]) == exchanges
+    assert topology == generate_topology(participants, exchanges, strong_ratio=0.5, patch_reuse=0.5,
+                                         duplicate_data=0.5, seed=3)
+
+    files: dict[str, bytes] | None = generate_case_files(topology_to_yaml(topology))
+    assert files is not None
+    assert "precice-config.xml" in files
+
+
+def test_synthetic_topology_rejects_single_participant():
+    """
+    Test that a topology with less than two participants cannot be synthesized.
+    """
+    with pytest.raises(ValueError):
+        generate_topology(1, 1)
+
+
+def test_benchmark_reports_all_stages():
+    """
+    Test that a small benchmark run reports every stage for every scenario and is serializable as JSON.
+    """
+    results: dict = run_benchmark([2, 4], exchanges_per_participant=2, repetitions=1)
+    assert [scenario["exchanges"] for scenario in results["scenarios"]] == [4, 8]
+    for scenario in results["scenarios"]:
+        assert set(scenario["seconds"]) == set(STAGES + [TOTAL])
+        assert all(seconds >= 0 for seconds in scenario["seconds"].values())
+    assert set(results["scaling_exponents"]) == set(STAGES + [TOTAL])
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_thresholds_detect_superlinear_scaling():
+    """
+    Test that a stage scaling quadratically violates the scaling threshold, whereas linear stages do not.
+    """
+    scenarios: list[dict] = []
+    for exchanges in [10, 20, 40]:
+        seconds: dict[str, float] = {stage: 0.001 * exchanges for stage in STAGES}
+        seconds["node_creation"] = 0.0001 * exchanges ** 2
+        seconds[TOTAL] = sum(seconds.values())
+        scenarios.append({"participants": exchanges // 4, "exchanges": exchanges, "seconds": seconds})
+    results: dict = {"scenarios": scenarios, "scaling_exponents": get_scaling_exponents(scenarios)}
+
+    assert results["scaling_exponents"]["node_creation"] == pytest.approx(2)
+    assert results["scaling_exponents"]["read"] == pytest.approx(1)
+    violations: list[str] = check_thresholds(results, {"max_scaling_exponent": {"read": 1.5, "node_creation": 1.5}})
+    assert len(violations) == 1 and "node_creation" in violations[0]
+    violations = check_thresholds(results, {"max_seconds_per_exchange": {"read": 0.0005}})
+    assert len(violations) == len(scenarios)
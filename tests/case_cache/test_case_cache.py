@@ -0,0 +1,127 @@
+"""
+This file tests the on-disk cache of generated cases.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate import case_cache
+from precicecasegenerate.case_cache import CaseCache
+from precicecasegenerate.cli import generate_case, write_case
+from precicecasegenerate.file_creators.case_writer import DirectoryWriter, MANIFEST_FILE_NAME, LOCK_FILE_NAME
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+
+def _read_files(directory: Path) -> dict[Path, bytes]:
+    """
+    Return the content of all generated files in the given directory.
+    :param directory: The directory to read.
+    :return: A dict mapping relative file paths to their content.
+    """
+    return {path.relative_to(directory): path.read_bytes() for path in directory.rglob("*")
+            if path.is_file() and path.name not in [MANIFEST_FILE_NAME, LOCK_FILE_NAME]}
+
+
+def test_cache_hit_restores_case(monkeypatch):
+    """
+    Test that a cached case is restored without creating nodes, and that the restored files are identical.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache: CaseCache = CaseCache(Path(temp_dir) / "cache")
+        assert generate_case(topology_file, Path(temp_dir) / "first", cache=cache) == 0
+        assert len(list(cache.directory.iterdir())) == 1, "The case was not stored in the cache."
+
+        def fail(*args, **kwargs):
+            pytest.fail("The nodes were created despite a cache hit.")
+
+        monkeypatch.setattr("precicecasegenerate.node_creator.NodeCreator.__init__", fail)
+        assert generate_case(topology_file, Path(temp_dir) / "second", cache=cache) == 0
+        assert _read_files(Path(temp_dir) / "first") == _read_files(Path(temp_dir) / "second"), \
+            "The restored case differs from the generated one."
+
+
+def test_written_files_are_only_kept_for_the_cache():
+    """
+    Test that a directory writer does not keep the content of the files, while the cache still receives all files.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache: CaseCache = CaseCache(Path(temp_dir) / "cache")
+        writer: DirectoryWriter = DirectoryWriter(Path(temp_dir) / "case")
+        assert write_case(topology_file, writer, cache=cache) == 0
+        assert not writer.contents, "The directory writer kept the content of the files."
+
+        cache_key: str = next(cache.directory.iterdir()).stem
+        cached_files, _ = cache.load(cache_key)
+        assert {Path(path) for path in cached_files} == set(_read_files(Path(temp_dir) / "case"))
+
+
+def test_cache_key_is_normalized():
+    """
+    Test that the cache key does not depend on the order of keys, but on every value of the topology.
+    """
+    cache: CaseCache = CaseCache(Path("unused"))
+    topology: dict = {"participants": [{"name": "A", "solver": "S"}], "exchanges": []}
+    reordered_topology: dict = {"exchanges": [], "participants": [{"solver": "S", "name": "A"}]}
+    changed_topology: dict = {"participants": [{"name": "A", "solver": "T"}], "exchanges": []}
+
+    assert cache.get_key(topology) == cache.get_key(reordered_topology)
+    assert cache.get_key(topology) != cache.get_key(changed_topology)
+
+
+def test_cache_key_depends_on_package_files(monkeypatch):
+    """
+    Test that changing a file of the package changes the cache key, even if the version stays the same.
+    """
+    cache: CaseCache = CaseCache(Path("unused"))
+    topology: dict = {"participants": [{"name": "A", "solver": "S"}], "exchanges": []}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_directory: Path = Path(temp_dir)
+        monkeypatch.setattr(case_cache, "PACKAGE_DIRECTORY", package_directory)
+        (package_directory / "module.py").write_text("VALUE = 1")
+        case_cache.get_package_fingerprint.cache_clear()
+        key: str = cache.get_key(topology)
+
+        (package_directory / "module.py").write_text("VALUE = 2")
+        case_cache.get_package_fingerprint.cache_clear()
+        changed_key: str = cache.get_key(topology)
+    case_cache.get_package_fingerprint.cache_clear()
+    assert key != changed_key, "The cache key did not change with the package files."
+
+
+def test_cache_key_depends_on_dependency_versions(monkeypatch):
+    """
+    Test that upgrading a dependency that shapes the generated files changes the cache key.
+    """
+    cache: CaseCache = CaseCache(Path("unused"))
+    topology: dict = {"participants": [{"name": "A", "solver": "S"}], "exchanges": []}
+    versions: dict[str, str] = {case_cache.PACKAGE_NAME: "1.0", "precice-config-graph": "3.0.0",
+                                "precice-adapter-schema": "1.0"}
+    monkeypatch.setattr(case_cache, "get_package_version",
+                        lambda package_name=case_cache.PACKAGE_NAME: versions[package_name])
+    key: str = cache.get_key(topology)
+
+    versions["precice-config-graph"] = "3.1.0"
+    assert cache.get_key(topology) != key, "The cache key did not change with the version of a dependency."
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Test that the least recently used entry is evicted once the cache exceeds its maximum size.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        content: bytes = os.urandom(1000)
+        cache: CaseCache = CaseCache(Path(temp_dir), max_size=2500)
+        cache.store("first", {"file": content})
+        cache.store("second", {"file": content})
+        # Make sure the modification times differ, then use the first entry
+        os.utime(Path(temp_dir) / "second.zip", ns=(0, 0))
+        assert cache.load("first") == ({"file": content}, set())
+
+        cache.store("third", {"file": content})
+        assert cache.load("second") is None, "The least recently used entry was not evicted."
+        assert cache.load("first") is not None and cache.load("third") is not None
@@ -0,0 +1,187 @@
+import io
+import pytest
+from xml.parsers import expat
+from pathlib import Path
+
+import precice_config_graph.graph.operations as operations
+from precice_config_graph import nodes as n, enums as e
+
+from precicecasegenerate import helper
+from precicecasegenerate.benchmark.synthetic_topology import generate_topology, topology_to_yaml
+from precicecasegenerate.file_creators.case_writer import CaseWriter
+from precicecasegenerate.file_creators.config_creator import ConfigCreator
+from precicecasegenerate.file_creators.config_serializer import RBF_METHODS
+from precicecasegenerate.input_handler.topology_reader import TopologyReader
+from precicecasegenerate.node_creator import NodeCreator
+
+test_directory: Path = Path(__file__).parent
+examples_directory: Path = test_directory.parent.parent / "examples"
+
+
+def create_nodes(topology_file: Path | None = None, topology_str: str | None = None) -> dict:
+    """
+    Create all nodes for the given topology.
+    :param topology_file: The path to the topology file.
+    :param topology_str: The content of a topology file. If given, it is read instead of the file.
+    :return: A dict containing all nodes created from the topology.
+    """
+    helper.reset_uniquifiers()
+    topology_reader: TopologyReader = TopologyReader(topology_file, topology_str=topology_str)
+    assert topology_reader.validate_topology() == 0 and topology_reader.check_topology() == 0
+    return NodeCreator(topology_reader.get_topology()).get_nodes()
+
+
+def create_all_node_types() -> dict:
+    """
+    Create a configuration containing every type of node and every variant of their elements,
+    including elements whose attributes do not fit into a single line.
+    :return: A dict containing participants, data nodes, meshes, coupling-schemes and M2N nodes.
+    """
+    # The first mesh and the first participant are empty, such that their groups are not separated
+    long_name: str = "A-Very-Long-Name-Such-That-Elements-Referencing-It-Exceed-The-Maximum-Line-Width"
+    data: list[n.DataNode] = [n.DataNode("Force", e.DataType.VECTOR), n.DataNode("Temperature", e.DataType.SCALAR),
+                              n.DataNode(long_name, e.DataType.SCALAR)]
+    empty_mesh: n.MeshNode = n.MeshNode("Empty-Mesh", dimensions=2)
+    mesh: n.MeshNode = n.MeshNode("Fluid-Mesh", use_data=data)
+    other_mesh: n.MeshNode = n.MeshNode(long_name, use_data=data[:2])
+    empty_participant: n.ParticipantNode = n.ParticipantNode("Empty")
+    fluid: n.ParticipantNode = n.ParticipantNode("Fluid", provide_meshes=[mesh, empty_mesh])
+    solid: n.ParticipantNode = n.ParticipantNode(long_name, provide_meshes=[other_mesh])
+
+    fluid.receive_meshes = [n.ReceiveMeshNode(fluid, other_mesh, solid),
+                            n.ReceiveMeshNode(fluid, empty_mesh, solid, api_access=False)]
+    fluid.read_data = [n.ReadDataNode(fluid, data[0], mesh)]
+    fluid.write_data = [n.WriteDataNode(fluid, data[2], mesh)]
+    # The XML of RBF mappings is malformed, see test_rbf_mapping_contains_executor_and_basis_function()
+    fluid.mappings = [n.MappingNode(fluid, e.Direction.READ, False, method, e.MappingConstraint.CONSISTENT,
+                                    other_mesh, mesh) for method in e.MappingMethod if method not in RBF_METHODS]
+    fluid.mappings.append(n.MappingNode(fluid, e.Direction.WRITE, True, e.MappingMethod.NEAREST_NEIGHBOR,
+                                        e.MappingConstraint.CONSERVATIVE, from_mesh=mesh))
+    for action_type in e.ActionType:
+        fluid.actions.append(n.ActionNode(fluid, action_type, mesh, e.TimingType.WRITE_MAPPING_POST, data[0],
+                                          data[1:], "path/to/module", "module"))
+    fluid.actions.append(n.ActionNode(fluid, e.ActionType.SUMMATION, mesh, e.TimingType.READ_MAPPING_POST))
+    fluid.exports = [n.ExportNode(fluid, export_format) for export_format in e.ExportFormat]
+    fluid.watchpoints = [n.WatchPointNode("Point", fluid, mesh, coordinate=[0.5, 1, 2])]
+    fluid.watch_integrals = [n.WatchIntegralNode(long_name, fluid, mesh)]
+    solid.write_data = [n.WriteDataNode(solid, data[0], other_mesh)]
+
+    coupling_schemes: list[n.CouplingSchemeNode | n.MultiCouplingSchemeNode] = []
+    for coupling_scheme_type, acceleration_type in zip(e.CouplingSchemeType, e.AccelerationType):
+        coupling_scheme: n.CouplingSchemeNode = n.CouplingSchemeNode(coupling_scheme_type, solid, fluid)
+        coupling_scheme.exchanges = [n.ExchangeNode(coupling_scheme, data[0], other_mesh, solid, fluid),
+                                     n.ExchangeNode(coupling_scheme, data[2], mesh, fluid, solid)]
+        coupling_scheme.convergence_measures = [
+            n.ConvergenceMeasureNode(coupling_scheme, convergence_measure_type, data[0], other_mesh)
+            for convergence_measure_type in e.ConvergenceMeasureType]
+        acceleration: n.AccelerationNode = n.AccelerationNode(coupling_scheme, acceleration_type)
+        acceleration.data = [n.AccelerationDataNode(acceleration, data[0], other_mesh)]
+        acceleration.preconditioner = n.PreconditionerNode(e.PreconditionerType.RESIDUAL_SUM, acceleration)
+        acceleration.filter = n.AccelerationFilterNode(acceleration)
+        coupling_scheme.acceleration = acceleration
+        coupling_schemes.append(coupling_scheme)
+    multi_coupling_scheme: n.MultiCouplingSchemeNode = n.MultiCouplingSchemeNode(fluid, [solid, fluid])
+    multi_coupling_scheme.exchanges = [n.ExchangeNode(multi_coupling_scheme, data[1], mesh, fluid, solid)]
+    coupling_schemes.append(multi_coupling_scheme)
+
+    return {"participants": [empty_participant, fluid, solid], "data": data,
+            "meshes": [empty_mesh, mesh, other_mesh], "coupling-schemes": coupling_schemes,
+            "m2n": [n.M2NNode(m2n_type, fluid, solid) for m2n_type in e.M2NType]}
+
+
+@pytest.mark.parametrize("example", sorted(examples_directory.rglob("*.yaml")), ids=lambda path: path.parent.name)
+def test_examples_equal_formatted_config(example: Path):
+    """
+    Check that the serialized configuration of every example is identical to the one formatted by
+    precice-config-format.
+    :param example: The path to the example topology file.
+    """
+    nodes: dict = create_nodes(example)
+    assert ConfigCreator(nodes).create_config_str() == operations._create_config_str(nodes)
+
+
+def test_synthetic_topology_equals_formatted_config():
+    """
+    Check that the serialized configuration of a large synthetic topology is identical to the one formatted by
+    precice-config-format.
+    """
+    nodes: dict = create_nodes(topology_str=topology_to_yaml(generate_topology(40, 160)))
+    assert ConfigCreator(nodes).create_config_str() == operations._create_config_str(nodes)
+
+
+def test_all_node_types_equal_formatted_config():
+    """
+    Check that every type of node is serialized like precice-config-format formats its XML.
+    """
+    nodes: dict = create_all_node_types()
+    expected: str = operations._create_config_str(nodes)
+    assert ConfigCreator(nodes).create_config_str() == expected
+    # Make sure that the configuration covers long lines and groups of empty elements
+    assert f'<participant name="Empty" />\n  <participant name="Fluid">' in expected
+    assert '\n    <watch-integral\n      name="' in expected
+
+
+def test_config_file_is_streamed():
+    """
+    Check that the configuration file is written to a writer and a stream with the same content.
+    """
+    nodes: dict = create_all_node_types()
+    config_creator: ConfigCreator = ConfigCreator(nodes)
+    writer: CaseWriter = CaseWriter()
+    config_creator.create_config_file(writer)
+    stream: io.StringIO = io.StringIO()
+    config_creator.write_config(stream)
+    assert writer.contents["precice-config.xml"] == stream.getvalue().encode("utf-8")
+
+
+def test_rbf_mapping_contains_executor_and_basis_function():
+    """
+    Check that the executor and basis-function of an RBF mapping are written inside the mapping.
+    MappingNode.to_xml() closes RBF mappings too early, so they cannot be compared to precice-config-format.
+    """
+    mesh: n.MeshNode = n.MeshNode("Fluid-Mesh")
+    participant: n.ParticipantNode = n.ParticipantNode("Fluid", provide_meshes=[mesh])
+    mapping: n.MappingNode = n.MappingNode(participant, e.Direction.WRITE, True, e.MappingMethod.RBF_PUM_DIRECT,
+                                           e.MappingConstraint.CONSERVATIVE, from_mesh=mesh)
+    mapping.executor = n.MappingExecutorNode(e.MappingExecutorType.OPENMP, mapping)
+    mapping.basisfunction = n.MappingBasisFunctionNode(e.MappingBasisFunctionType.GAUSSIAN, mapping)
+    participant.mappings.append(mapping)
+    config_str: str = ConfigCreator({"participants": [participant], "data": [], "meshes": [mesh],
+                                     "coupling-schemes": [], "m2n": []}).create_config_str()
+
+    assert ('    <mapping:rbf-pum-direct\n'
+            '      direction="write"\n'
+            '      from="Fluid-Mesh"\n'
+            '      constraint="conservative"\n'
+            '      polynomial="separate"\n'
+            '      vertices-per-cluster="50"\n'
+            '      relative-overlap="0.15"\n'
+            '      project-to-input="True">\n'
+            '      <executor:openmp n-threads="0" />\n'
+            '      <basis-function:gaussian shape-parameter="1" support-radius="0.5" />\n'
+            '    </mapping:rbf-pum-direct>\n') in config_str
+
+
+def test_special_characters_are_escaped():
+    """
+    Check that names containing XML special characters result in a well-formed configuration with the same names.
+    """
+    data: n.DataNode = n.DataNode('Force&Moment<"1">', e.DataType.VECTOR)
+    mesh: n.MeshNode = n.MeshNode('Solid&Mesh<"1">', use_data=[data])
+    participant: n.ParticipantNode = n.ParticipantNode('Solid&Co<"1">', provide_meshes=[mesh])
+    participant.write_data.append(n.WriteDataNode(participant, data, mesh))
+    config_str: str = ConfigCreator({"participants": [participant], "data": [data], "meshes": [mesh],
+                                     "coupling-schemes": [], "m2n": []}).create_config_str()
+
+    # Expat without namespace processing accepts tags like "data:vector", but rejects any malformed XML
+    elements: list[tuple[str, dict[str, str]]] = []
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = lambda tag, attributes: elements.append((tag, attributes))
+    parser.Parse(config_str.encode("utf-8"), True)
+
+    names: dict[str, dict[str, str]] = {tag: attributes for tag, attributes in elements}
+    assert names["data:vector"]["name"] == data.name
+    assert names["mesh"]["name"] == mesh.name
+    assert names["use-data"]["name"] == data.name
+    assert names["participant"]["name"] == participant.name
+    assert (names["write-data"]["name"], names["write-data"]["mesh"]) == (data.name, mesh.name)
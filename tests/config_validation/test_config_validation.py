@@ -0,0 +1,114 @@
+import sys
+from importlib import metadata
+import pytest
+from pathlib import Path
+
+from precice_config_graph import nodes as n, enums as e
+from precice_config_graph import xml_processing
+from precice_config_graph.graph import builder
+from precice_config_graph.graph.operations import check_graph_equivalence
+
+from precicecasegenerate import cli_helper, helper
+from precicecasegenerate.cli import generate_case
+from precicecasegenerate.file_creators.config_creator import (ConfigCreator, create_config_graph, CONFIG_CHECK_MISSING,
+                                                           CONFIG_GRAPH_VERSION)
+from precicecasegenerate.input_handler.topology_reader import TopologyReader
+from precicecasegenerate.node_creator import NodeCreator
+
+pytest.importorskip("preciceconfigcheck")
+
+test_directory: Path = Path(__file__).parent
+examples_directory: Path = test_directory.parent.parent / "examples"
+
+
+def create_nodes(topology_file: Path) -> dict:
+    """
+    Create all nodes for the given topology file.
+    :param topology_file: The path to the topology file.
+    :return: A dict containing all nodes created from the topology.
+    """
+    helper.reset_uniquifiers()
+    topology_reader: TopologyReader = TopologyReader(topology_file)
+    assert topology_reader.validate_topology() == 0 and topology_reader.check_topology() == 0
+    return NodeCreator(topology_reader.get_topology()).get_nodes()
+
+
+def test_config_graph_version():
+    """
+    Check that the installed precice-config-graph is the version whose graph builder create_config_graph mirrors.
+    """
+    installed_version: str = metadata.version("precice-config-graph")
+    assert installed_version == CONFIG_GRAPH_VERSION, (
+        f"precice-config-graph {installed_version} is installed, but create_config_graph mirrors the graph builder of "
+        f"version {CONFIG_GRAPH_VERSION}. Compare the edges of precice_config_graph.graph.builder with "
+        f"create_config_graph, then update CONFIG_GRAPH_VERSION and the pinned version in pyproject.toml.")
+
+
+@pytest.mark.parametrize("example", sorted(examples_directory.rglob("*.yaml")), ids=lambda path: path.parent.name)
+def test_graph_equals_parsed_graph(example: Path, tmp_path: Path):
+    """
+    Check that the graph created from the nodes equals the graph created from the written configuration file,
+    and that both are validated with the same result.
+    :param example: The path to the example topology file.
+    """
+    config_creator: ConfigCreator = ConfigCreator(create_nodes(example))
+    config_file: Path = tmp_path / "precice-config.xml"
+    config_file.write_text(config_creator.create_config_str())
+
+    parsed_graph = builder.get_graph(xml_processing.parse_file(config_file))
+    assert check_graph_equivalence(parsed_graph, create_config_graph(config_creator.config_topology)), (
+        f"The graph of {example} differs from the graph of its configuration file.")
+    assert config_creator.validate_config() == 0
+    assert config_creator.validate_config_file(config_file) == 0
+
+
+def test_logical_errors():
+    """
+    Check that a configuration violating a rule of precice-config-check is reported with return code 2.
+    """
+    data: n.DataNode = n.DataNode("Force", e.DataType.VECTOR)
+    mesh: n.MeshNode = n.MeshNode("Solid-Mesh", use_data=[data])
+    participant: n.ParticipantNode = n.ParticipantNode("Solid", provide_meshes=[mesh])
+    participant.write_data.append(n.WriteDataNode(participant, data, mesh))
+    # The data is written, but neither read nor exchanged
+    config_creator: ConfigCreator = ConfigCreator({"participants": [participant], "data": [data], "meshes": [mesh],
+                                                   "coupling-schemes": [], "m2n": []})
+    assert config_creator.validate_config() == 2
+
+
+def test_syntactic_errors(tmp_path: Path):
+    """
+    Check that configurations whose graph cannot be created are reported with return code 1.
+    """
+    config_creator: ConfigCreator = ConfigCreator({"participants": [], "data": [], "meshes": []})
+    assert config_creator.validate_config() == 1
+
+    config_file: Path = tmp_path / "precice-config.xml"
+    config_file.write_text('<precice-configuration>\n<participant name="Solid">\n'
+                           '<provide-mesh name="Unknown-Mesh" />\n</participant>\n</precice-configuration>\n')
+    assert config_creator.validate_config_file(config_file) == 1
+
+
+def test_generation_with_config_validation(tmp_path: Path, monkeypatch):
+    """
+    Check that a case is validated before it is written, and that a configuration with logical errors
+    is not written, but reported with return code 2.
+    """
+    example: Path = examples_directory / "tutorial2" / "topology.yaml"
+    assert generate_case(example, tmp_path / "valid", validate_config=True) == 0
+    assert (tmp_path / "valid" / cli_helper.PRECICE_CONFIG_FILE_NAME).is_file()
+
+    monkeypatch.setattr(ConfigCreator, "validate_config", lambda self: 2)
+    assert generate_case(example, tmp_path / "invalid", validate_config=True) == 2
+    assert not (tmp_path / "invalid" / cli_helper.PRECICE_CONFIG_FILE_NAME).exists(), (
+        "The invalid configuration was written.")
+
+
+def test_missing_config_check(monkeypatch):
+    """
+    Check that a configuration is not reported as valid if precice-config-check is not installed.
+    """
+    config_creator: ConfigCreator = ConfigCreator(create_nodes(examples_directory / "tutorial1" / "topology.yaml"))
+    # Importing a module that is set to None raises an ImportError
+    monkeypatch.setitem(sys.modules, "preciceconfigcheck.rules_processing", None)
+    assert config_creator.validate_config() == CONFIG_CHECK_MISSING
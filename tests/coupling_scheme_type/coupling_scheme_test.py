@@ -3,11 +3,15 @@ Test that coupling-schemes are created correctly according to the topology.
 """
 
 from pathlib import Path
+from precice_config_graph import nodes as n
 from precice_config_graph.graph import operations
 
 from preciceconfigcheck.cli import runCheck
 
 from precicecasegenerate.cli import generate_case
+from precicecasegenerate.input_handler.topology_reader import TopologyReader
+from precicecasegenerate.node_creator import NodeCreator
+import precicecasegenerate.helper as helper
 
 # This directory is the same for all tests in this file.
 test_directory: Path = Path(__file__).parent
@@ -61,4 +65,32 @@ def test_multi_coupling_scheme():
     expected: Path = case_directory / "precice-config.xml"
     actual: Path = case_directory / "_generated/precice-config.xml"
     assert operations.check_config_equivalence(expected, actual, ignore_names=True), "Configs are not equivalent up to naming."
-    assert runCheck(actual, True) == 0, "The config failed to validate."
\ No newline at end of file
+    assert runCheck(actual, True) == 0, "The config failed to validate."
+
+def test_disjoint_implicit_clusters():
+    """
+    Test that disjoint clusters of bidirectional strong couplings each get their own implicit coupling-scheme,
+    and that exchanges between the clusters are coupled explicitly.
+    """
+    case_directory: Path = test_directory / "disjoint_implicit_clusters"
+    input_file: Path = case_directory / "topology.yaml"
+
+    topology_reader: TopologyReader = TopologyReader(input_file)
+    node_creator: NodeCreator = NodeCreator(topology_reader.get_topology())
+    coupling_schemes: list = node_creator.get_nodes()["coupling-schemes"]
+
+    multi_coupling_schemes: list[n.MultiCouplingSchemeNode] = [cs for cs in coupling_schemes
+                                                                if isinstance(cs, n.MultiCouplingSchemeNode)]
+    assert len(multi_coupling_schemes) == 1, "Expected exactly one multi-coupling-scheme."
+    assert [p.name for p in multi_coupling_schemes[0].participants] == ["Fluid", "Solid-Left", "Solid-Right"], \
+        "The multi-coupling-scheme has the wrong participants."
+    assert multi_coupling_schemes[0].control_participant.name == "Fluid", "Wrong control participant."
+
+    coupling_types: list[str] = sorted(cs.type.value for cs in coupling_schemes
+                                       if isinstance(cs, n.CouplingSchemeNode))
+    assert coupling_types == sorted([helper.DEFAULT_IMPLICIT_COUPLING_TYPE.value,
+                                     helper.DEFAULT_EXPLICIT_COUPLING_TYPE.value]), \
+        "Expected one implicit and one explicit coupling-scheme."
+
+    assert generate_case(input_file, case_directory / "_generated") == 0, "Case generation failed."
+    assert runCheck(case_directory / "_generated/precice-config.xml", True) == 0, "The config failed to validate."
@@ -0,0 +1,80 @@
+"""
+Test that the exchange index groups exchanges correctly and stays consistent with the topology on renames.
+"""
+
+from pathlib import Path
+from precice_config_graph import enums as e
+
+from precicecasegenerate.input_handler.topology_reader import TopologyReader
+from precicecasegenerate.exchange_index import ExchangeIndex
+from precicecasegenerate.node_creator import NodeCreator
+import precicecasegenerate.helper as helper
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+
+
+def setup() -> tuple[dict, NodeCreator]:
+    """
+    Create all nodes for the test topology file.
+    :return: The topology dict and the node creator, which holds the exchange index.
+    """
+    topology: dict = TopologyReader(test_directory / "topology.yaml").get_topology()
+    return topology, NodeCreator(topology)
+
+
+def test_exchange_groups():
+    """
+    Check that exchanges are resolved and grouped by participant pair, patch and data.
+    """
+    topology, node_creator = setup()
+    index: ExchangeIndex = node_creator.exchange_index
+    fluid, solid = node_creator.participants
+
+    assert len(index) == len(topology["exchanges"]), "Not all exchanges were indexed."
+    assert index.from_participants == [fluid, solid, fluid], "From-participants were resolved incorrectly."
+    assert index.data_types == [e.DataType.VECTOR] * 3, "Default data types were resolved incorrectly."
+    assert index.data_kinds[0] == helper.DataKind.EXTENSIVE, "Force is not extensive."
+    assert index.participant_pair_map == {(fluid, solid): [0, 2], (solid, fluid): [1]}, \
+        "Exchanges were grouped by participant pair incorrectly."
+
+
+def test_renames():
+    """
+    Check that split patches and renamed data are written to the topology and regrouped in the index.
+    """
+    topology, node_creator = setup()
+    index: ExchangeIndex = node_creator.exchange_index
+    fluid, solid = node_creator.participants
+
+    # "interface" and "surface" are used for extensive and intensive data, so they are split up
+    assert (fluid, "interface") not in index.patch_map, "Patch interface was not split."
+    assert index.patch_map[(fluid, "interface-extensive")] == [0], "Split patch was grouped incorrectly."
+    assert index.patch_map[(fluid, "interface-intensive")] == [1], "Split patch was grouped incorrectly."
+    assert topology["exchanges"][0]["from-patch"] == "interface-extensive", "Split patch was not written to topology."
+    assert topology["exchanges"][1]["to-patch"] == "interface-intensive", "Split patch was not written to topology."
+
+    # The two Fluid -> Solid force exchanges only differ in their patches, so one of them is renamed
+    assert topology["exchanges"][0]["data"] == "Force", "The first occurrence of the data was renamed."
+    renamed: str = topology["exchanges"][2]["data"]
+    assert renamed != "Force" and renamed.endswith("-Force"), "Duplicate data was not uniquified."
+    for key, exchange_ids in index.data_map.items():
+        for exchange_id in exchange_ids:
+            assert key[2] == topology["exchanges"][exchange_id]["data"], "Data map is inconsistent with topology."
+
+
+def test_topology_loaded_without_reader():
+    """
+    Check that a topology which did not pass through the TopologyReader can be indexed,
+    and that further tags of the exchanges are kept as they are.
+    """
+    from ruamel.yaml import YAML
+
+    with open(test_directory / "topology.yaml", "r") as topology_file:
+        topology: dict = YAML(typ="safe").load(topology_file)
+    topology["exchanges"][0]["id"] = "user-defined"
+    node_creator: NodeCreator = NodeCreator(topology)
+
+    assert len(node_creator.exchange_index) == len(topology["exchanges"]), "Not all exchanges were indexed."
+    assert topology["exchanges"][0]["id"] == "user-defined", "A tag of an exchange was overwritten."
+    assert all("id" not in exchange for exchange in topology["exchanges"][1:]), "Exchanges gained an ID tag."
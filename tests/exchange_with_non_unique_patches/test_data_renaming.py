@@ -6,7 +6,7 @@ from pathlib import Path
 from precice_config_graph.graph import operations
 from preciceconfigcheck.cli import runCheck
 
-from precicecasegenerate.cli import generate_case
+from precicecasegenerate.cli import generate_case, generate_case_files
 
 # This directory is the same for all tests in this file.
 test_directory: Path = Path(__file__).parent
@@ -25,4 +25,14 @@ def test_data_renaming():
     actual: Path = case_directory / "_generated/precice-config.xml"
     assert not operations.check_config_equivalence(expected, actual), "Configs are equivalent with different names."
     assert operations.check_config_equivalence(expected, actual, ignore_names=True), "Configs not are equivalent up to naming."
-    assert runCheck(actual, True) == 0, "The config failed to validate."
\ No newline at end of file
+    assert runCheck(actual, True) == 0, "The config failed to validate."
+
+def test_data_renaming_is_deterministic():
+    """
+    Test that renamed data gets the same names every time the same topology is generated.
+    """
+    topology_str: str = (test_directory / "topology.yaml").read_text()
+    first_files: dict[str, bytes] | None = generate_case_files(topology_str)
+    second_files: dict[str, bytes] | None = generate_case_files(topology_str)
+    assert first_files is not None, "The topology is invalid."
+    assert first_files == second_files, "Generating the same topology twice yielded different files."
@@ -0,0 +1,106 @@
+"""
+This file tests that the generation server returns the same cases as the in-memory API and limits its load.
+"""
+import io
+import json
+import threading
+import zipfile
+from http.client import HTTPConnection, HTTPResponse
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.cli import generate_case_files
+from precicecasegenerate.server import CaseGenerationServer, GENERATE_PATH, HEALTH_PATH
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+
+@pytest.fixture
+def server():
+    """
+    Run a server on a free port in a background thread.
+    """
+    server = CaseGenerationServer(0, max_requests=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _request(server: CaseGenerationServer, method: str, path: str, body: bytes | None = None) -> tuple[int, bytes]:
+    """
+    Send a request to the given server.
+    :param server: The server.
+    :param method: The HTTP method.
+    :param path: The path of the request.
+    :param body: The body of the request.
+    :return: The status and body of the response.
+    """
+    connection = HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        connection.request(method, path, body=body)
+        response: HTTPResponse = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+def test_health(server):
+    """
+    Test that the health endpoint reports the load of the server.
+    """
+    status, body = _request(server, "GET", HEALTH_PATH)
+    assert status == 200
+    health: dict = json.loads(body)
+    assert health["status"] == "ok"
+    assert health["active_requests"] == 0
+    assert health["max_requests"] == 1
+
+
+def test_generated_files_match_in_memory_api(server):
+    """
+    Test that the server returns the files of the in-memory API, both as JSON and as zip archive.
+    """
+    expected_files: dict[str, bytes] = generate_case_files(topology_file.read_text())
+
+    status, body = _request(server, "POST", GENERATE_PATH, topology_file.read_bytes())
+    assert status == 200
+    response: dict = json.loads(body)
+    assert {path: content.encode("utf-8") for path, content in response["files"].items()} == expected_files
+    assert "propagator-bsolver/run.sh" in response["executable_files"]
+
+    status, body = _request(server, "POST", f"{GENERATE_PATH}?format=zip", topology_file.read_bytes())
+    assert status == 200
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert {name: archive.read(name) for name in archive.namelist()} == expected_files
+
+
+def test_invalid_topology_returns_errors(server):
+    """
+    Test that the errors of an invalid topology are returned to the client.
+    """
+    status, body = _request(server, "POST", GENERATE_PATH, b"participants: []\nexchanges: []\n")
+    assert status == 422
+    assert json.loads(body)["errors"], "No errors were returned."
+
+
+def test_requests_beyond_limit_are_rejected(server):
+    """
+    Test that a request is rejected while the server handles its maximum number of requests.
+    """
+    results: list[tuple[int, bytes]] = []
+    with server.generation_lock:
+        # This request holds the only slot, since it waits for the generation lock held by the test
+        thread = threading.Thread(target=lambda: results.append(
+            _request(server, "POST", GENERATE_PATH, topology_file.read_bytes())))
+        thread.start()
+        while server.get_health()["active_requests"] == 0:
+            thread.join(0.01)
+        status, _ = _request(server, "POST", GENERATE_PATH, topology_file.read_bytes())
+        assert status == 503, "The request beyond the limit was not rejected."
+    thread.join()
+    assert results[0][0] == 200, "The request holding the slot failed."
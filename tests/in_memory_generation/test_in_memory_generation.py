@@ -0,0 +1,44 @@
+"""
+This file tests that cases can be generated in memory, without reading or writing files.
+"""
+import tempfile
+from pathlib import Path
+
+from precicecasegenerate.cli import generate_case, generate_case_files
+from precicecasegenerate.file_creators.case_writer import MANIFEST_FILE_NAME, LOCK_FILE_NAME
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+
+def test_in_memory_files_match_written_files(monkeypatch):
+    """
+    Test that the files generated in memory are the files that are written to disk, and that nothing is written.
+    """
+    topology_str: str = topology_file.read_text()
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        monkeypatch.chdir(working_dir)
+        files: dict[str, bytes] | None = generate_case_files(topology_str)
+        assert files is not None, "The case generation failed."
+        assert not any(Path(working_dir).iterdir()), "Files were written to disk."
+
+    assert "precice-config.xml" in files
+    assert "generator-left-asolver/adapter-config.json" in files
+    assert "propagator-bsolver/run.sh" in files
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert generate_case(topology_file, Path(temp_dir)) == 0
+        written_files: dict[str, bytes] = {
+            path.relative_to(temp_dir).as_posix(): path.read_bytes() for path in Path(temp_dir).rglob("*")
+            if path.is_file() and path.name not in [MANIFEST_FILE_NAME, LOCK_FILE_NAME]
+        }
+    assert files == written_files, "The files generated in memory differ from the written files."
+
+
+def test_in_memory_invalid_topology():
+    """
+    Test that no files are returned for an invalid topology.
+    """
+    assert generate_case_files("participants: []\nexchanges: []\n") is None, "The invalid topology was accepted."
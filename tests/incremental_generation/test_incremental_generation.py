@@ -0,0 +1,59 @@
+"""
+This file tests that regenerating a case only touches files whose content changed.
+"""
+import tempfile
+from pathlib import Path
+
+from precicecasegenerate.cli import generate_case
+from precicecasegenerate.file_creators.case_writer import MANIFEST_FILE_NAME, LOCK_FILE_NAME
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+full_topology: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+reduced_topology: Path = test_directory / "reduced_topology" / "topology.yaml"
+
+
+def _get_modification_times(directory: Path) -> dict[Path, int]:
+    """
+    Return the modification times of all generated files in the given directory.
+    :param directory: The directory to search.
+    :return: A dict mapping relative file paths to modification times in nanoseconds.
+    """
+    return {path.relative_to(directory): path.stat().st_mtime_ns for path in directory.rglob("*")
+            if path.is_file() and path.name not in [MANIFEST_FILE_NAME, LOCK_FILE_NAME]}
+
+
+def test_unchanged_files_are_not_rewritten():
+    """
+    Test that regenerating the same topology does not modify any file, but restores files edited by the user.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root: Path = Path(temp_dir)
+        assert generate_case(full_topology, output_root) == 0
+        assert (output_root / MANIFEST_FILE_NAME).is_file(), "No manifest written."
+        modification_times: dict[Path, int] = _get_modification_times(output_root)
+        config_content: str = (output_root / "precice-config.xml").read_text()
+
+        assert generate_case(full_topology, output_root) == 0
+        assert _get_modification_times(output_root) == modification_times, "Unchanged files were rewritten."
+
+        (output_root / "precice-config.xml").write_text("edited")
+        assert generate_case(full_topology, output_root) == 0
+        assert (output_root / "precice-config.xml").read_text() == config_content, "The edited file was not restored."
+
+
+def test_stale_participant_directories_are_pruned():
+    """
+    Test that directories of removed participants are pruned, while files not written by the generator are kept.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root: Path = Path(temp_dir)
+        assert generate_case(full_topology, output_root) == 0
+        user_file: Path = output_root / "propagator-bsolver" / "results.vtk"
+        user_file.write_text("results")
+        assert (output_root / "generator-right-asolver").is_dir()
+
+        assert generate_case(reduced_topology, output_root) == 0
+        assert not (output_root / "generator-right-asolver").exists(), "The removed participant was not pruned."
+        assert (output_root / "generator-left-asolver" / "adapter-config.json").is_file()
+        assert user_file.is_file(), "A file not written by the generator was removed."
@@ -0,0 +1,132 @@
+"""
+This file tests that logging is set up correctly and that records are written by the background listener.
+"""
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate import cli_helper
+from precicecasegenerate.logging_setup import (ColorFormatter, setup_logging, stop_logging, LOG_FILE_PREFIX,
+                                               LOG_FILE_SUFFIX, LOG_FILE_RUN_COUNT, LOG_CLEANUP_INTERVAL)
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    """
+    Stop the logging set up by a test and restore the handlers and level of the root logger,
+    such that the logging of other tests is not affected.
+    """
+    root_logger = logging.getLogger()
+    handlers: list[logging.Handler] = root_logger.handlers[:]
+    level: int = root_logger.level
+    yield
+    stop_logging()
+    root_logger.handlers[:] = handlers
+    root_logger.setLevel(level)
+
+
+def test_no_log_file(tmp_path, monkeypatch):
+    """
+    Test that no log directory is created if logging to a file is disabled,
+    and that debug records are not created unless they are shown on the console.
+    """
+    monkeypatch.chdir(tmp_path)
+    logger = setup_logging(log_file=False)
+    assert not logger.isEnabledFor(logging.DEBUG)
+    logger.info("Test record")
+    stop_logging()
+    assert not (tmp_path / cli_helper.LOG_DIR_NAME).exists()
+
+
+def test_log_file_is_written(tmp_path, monkeypatch):
+    """
+    Test that all queued records, including debug records, end up in the log file once logging is stopped.
+    """
+    monkeypatch.chdir(tmp_path)
+    logger = setup_logging()
+    assert logger.isEnabledFor(logging.DEBUG)
+    logging.getLogger("precicecasegenerate.test").debug("Created %d test nodes.", 42)
+    stop_logging()
+    log_files: list[Path] = list((tmp_path / cli_helper.LOG_DIR_NAME).glob(f"*{LOG_FILE_SUFFIX}"))
+    assert len(log_files) == 1
+    assert log_files[0].name.startswith(LOG_FILE_PREFIX)
+    assert log_files[0].name.endswith(f"-{os.getpid()}{LOG_FILE_SUFFIX}")
+    assert "Created 42 test nodes." in log_files[0].read_text()
+
+
+def test_old_log_files_are_removed(tmp_path):
+    """
+    Test that every run writes to a new log file and that only the logs of the last runs are kept.
+    """
+    log_directory: Path = tmp_path / "logs"
+    # Old log files are removed by the last run
+    runs: int = LOG_FILE_RUN_COUNT + LOG_CLEANUP_INTERVAL
+    for run in range(runs):
+        setup_logging(log_directory=log_directory).info("Run %d", run)
+        stop_logging()
+
+    log_files: list[Path] = sorted(log_directory.glob(f"*{LOG_FILE_SUFFIX}"))
+    assert len(log_files) == LOG_FILE_RUN_COUNT
+    assert f"Run {runs - 1}" in log_files[-1].read_text()
+    assert f"Run {runs - LOG_FILE_RUN_COUNT}" in log_files[0].read_text()
+
+
+def test_log_files_of_running_processes_are_kept(tmp_path):
+    """
+    Test that the log file of a process that is still running is never removed, unlike the one of a finished process.
+    """
+    log_directory: Path = tmp_path / "logs"
+    log_directory.mkdir()
+    finished_process = subprocess.Popen([sys.executable, "-c", ""])
+    finished_process.wait()
+    # The parent process of the test runner is still running
+    running_log: Path = log_directory / f"{LOG_FILE_PREFIX}0000-{os.getppid()}{LOG_FILE_SUFFIX}"
+    finished_log: Path = log_directory / f"{LOG_FILE_PREFIX}0000-{finished_process.pid}{LOG_FILE_SUFFIX}"
+    running_log.write_text("running")
+    finished_log.write_text("finished")
+
+    # Old log files are removed by the last run, when there are more log files than are kept
+    for run in range(max(LOG_CLEANUP_INTERVAL, LOG_FILE_RUN_COUNT)):
+        setup_logging(log_directory=log_directory).info("Run %d", run)
+        stop_logging()
+
+    assert running_log.is_file(), "The log file of a running process was removed."
+    assert not finished_log.exists(), "The log file of a finished process was kept."
+
+
+def test_startup_does_not_list_log_directory(tmp_path, monkeypatch):
+    """
+    Test that a run which does not remove old log files never lists the log directory.
+    """
+    log_directory: Path = tmp_path / "logs"
+
+    def fail(*args, **kwargs):
+        pytest.fail("The log directory was listed.")
+
+    monkeypatch.setattr(Path, "glob", fail)
+    monkeypatch.setattr(Path, "iterdir", fail)
+    monkeypatch.setattr(os, "scandir", fail)
+    monkeypatch.setattr(os, "listdir", fail)
+    for run in range(LOG_CLEANUP_INTERVAL - 1):
+        setup_logging(log_directory=log_directory).info("Run %d", run)
+        stop_logging()
+
+
+def test_color_formatter_does_not_modify_records():
+    """
+    Test that the ColorFormatter colors the levelname in the output without changing the record,
+    since other handlers format the same record afterward.
+    """
+    formatter = ColorFormatter("[%(levelname)s]: %(message)s")
+    record = logging.LogRecord("test", logging.WARNING, __file__, 1, "Message %s", ("text",), None)
+    formatted: str = formatter.format(record)
+    assert formatted.startswith(f"[{ColorFormatter.COLORS[logging.WARNING]}WARNING{ColorFormatter.RESET}]")
+    assert formatted.endswith("Message text")
+    assert record.levelname == "WARNING"
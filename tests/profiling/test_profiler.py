@@ -0,0 +1,84 @@
+"""
+This file tests that the profiler measures every stage of the generation and writes its supported output formats.
+"""
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.cli import generate_case_files, profile_case
+from precicecasegenerate.profiler import StageProfiler, profile_stage
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+topology_file: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+
+PIPELINE_STAGES: list[str] = ["read", "validate", "check", "node_creation", "config_file", "adapter_configs",
+                              "utility_files"]
+NODE_CREATION_STEPS: list[str] = ["participant_initialization", "exchange_index", "patch_preprocessing",
+                                  "data_preprocessing", "data_initialization", "mesh_initialization",
+                                  "mapping_initialization", "exchange_initialization", "coupling_schemes", "m2n"]
+
+
+def test_stages_without_profiler():
+    """
+    Test that stages are not measured if no profiler is active.
+    """
+    profiler: StageProfiler = StageProfiler()
+    with profile_stage("stage"):
+        pass
+    assert profiler.records == []
+
+
+def test_nested_stages():
+    """
+    Test that nested stages are recorded with their depth and that the peak memory of a stage includes the peaks of
+    the stages inside it.
+    """
+    with StageProfiler() as profiler:
+        with profile_stage("outer"):
+            with profile_stage("inner"):
+                data: list[int] = list(range(100_000))
+            del data
+    outer, inner = profiler.records
+    assert (outer.path, outer.depth) == ("outer", 0)
+    assert (inner.path, inner.depth) == ("outer/inner", 1)
+    assert inner.peak_memory > 100_000 * 8
+    assert outer.peak_memory >= inner.peak_memory
+    assert outer.wall_time >= inner.wall_time
+
+
+def test_generation_stages():
+    """
+    Test that all stages of the generation and all steps of the node creation are measured.
+    """
+    with StageProfiler(trace_memory=False) as profiler:
+        assert generate_case_files(topology_file.read_text()) is not None
+    assert [record.name for record in profiler.records if record.depth == 0] == PIPELINE_STAGES
+    assert [record.name for record in profiler.records if record.depth == 1] == NODE_CREATION_STEPS
+    assert all(record.path.startswith("node_creation/") for record in profiler.records if record.depth == 1)
+
+
+@pytest.mark.parametrize("file_name", ["profile.json", "profile.speedscope.json", "profile.prof"])
+def test_profile_output(tmp_path: Path, file_name: str):
+    """
+    Test that a case is generated while profiling and that the profile is written in the format given by its suffix.
+    """
+    output_file: Path = tmp_path / file_name
+    assert profile_case(topology_file, tmp_path / "case", output_file=output_file) == 0
+    assert (tmp_path / "case" / "precice-config.xml").is_file()
+
+    if file_name == "profile.prof":
+        stats: pstats.Stats = pstats.Stats(str(output_file))
+        assert any(function[2] == "create_case" for function in stats.stats)
+        return
+    profile: dict = json.loads(output_file.read_text())
+    if file_name == "profile.speedscope.json":
+        frames: list[str] = [frame["name"] for frame in profile["shared"]["frames"]]
+        assert set(PIPELINE_STAGES + NODE_CREATION_STEPS + ["write"]) == set(frames)
+        events: list[dict] = profile["profiles"][0]["events"]
+        assert [event["type"] for event in events].count("O") == [event["type"] for event in events].count("C")
+    else:
+        assert [stage["name"] for stage in profile["stages"] if stage["depth"] == 0] == PIPELINE_STAGES + ["write"]
+        assert all(stage["peak_memory"] is not None for stage in profile["stages"])
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+
+# Packages that are only needed to generate a case and must not be imported when the CLI starts
+HEAVY_PACKAGES: list[str] = [
+    "precice_config_graph",
+    "preciceadapterschema",
+    "jsonschema",
+    "ruamel",
+    "networkx",
+    "lxml",
+    "colored",
+]
+
+
+def _get_import_times(code: str) -> dict[str, int]:
+    """
+    Run the given code in a new interpreter with -X importtime.
+    :param code: The code to run.
+    :return: A dict mapping the names of all imported modules to their cumulative import time in microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    import_times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # Lines have the form "import time: <self> | <cumulative> | <indented module name>"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_import_time():
+    """
+    Test that importing the CLI does not import heavy packages and is faster than importing the slowest of them.
+    Both are measured in the same interpreter, such that a slow machine slows down both alike.
+    """
+    heavy_imports: str = "; ".join(f"import {package}" for package in HEAVY_PACKAGES)
+    import_times: dict[str, int] = _get_import_times(f"import precicecasegenerate.cli; {heavy_imports}")
+
+    assert "precicecasegenerate.cli" in import_times, "The CLI module was not imported."
+    # Modules are only listed by the import that imports them first, so the heavy packages are listed after the CLI
+    modules: list[str] = list(import_times)
+    cli_index: int = modules.index("precicecasegenerate.cli")
+    heavy_modules: list[str] = [module for module in modules[:cli_index + 1] if module.split(".")[0] in HEAVY_PACKAGES]
+    assert not heavy_modules, f"Importing the CLI imports heavy modules: {heavy_modules}."
+    slowest_package: str = max(HEAVY_PACKAGES, key=lambda package: import_times.get(package, 0))
+    assert import_times["precicecasegenerate.cli"] < import_times[slowest_package], (
+        f"Importing the CLI took {import_times['precicecasegenerate.cli']}us, "
+        f"but importing {slowest_package} only took {import_times[slowest_package]}us.")
+
+
+def test_help_does_not_import_heavy_packages():
+    """
+    Test that printing the help message does not import heavy packages.
+    """
+    import_times: dict[str, int] = _get_import_times(
+        "from precicecasegenerate.cli import makeGenerateParser; "
+        "makeGenerateParser().parse_args(['--help'])"
+    )
+
+    heavy_modules: list[str] = [module for module in import_times if module.split(".")[0] in HEAVY_PACKAGES]
+    assert not heavy_modules, f"Printing the help message imports heavy modules: {heavy_modules}."
+
+
+def test_config_creator_does_not_import_networkx():
+    """
+    Test that writing a configuration does not import networkx, which is only needed to validate it.
+    """
+    import_times: dict[str, int] = _get_import_times("import precicecasegenerate.file_creators.config_creator")
+
+    assert "precicecasegenerate.file_creators.config_creator" in import_times, "The module was not imported."
+    assert "networkx" not in import_times, "Importing the config creator imports networkx."
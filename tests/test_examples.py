@@ -21,7 +21,8 @@ def test_application_with_example(example: Path):
     assert example.exists() and example.is_file(), "Topology file doesn't exist."
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        cmd = ["precice-case-generate", str(example), "-o", temp_dir]
+        # Do not read or fill the user's case cache
+        cmd = ["precice-case-generate", str(example), "-o", temp_dir, "--no-cache"]
         print(f"Running {cmd}")
         subprocess.run(cmd)
 
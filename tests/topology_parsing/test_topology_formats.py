@@ -0,0 +1,111 @@
+"""
+This file tests that JSON topologies and the streaming YAML parser result in the same topologies as ruamel.yaml.
+"""
+import json
+from pathlib import Path
+
+import pytest
+from ruamel.yaml import YAML
+
+from precicecasegenerate.cli import generate_case_files
+from precicecasegenerate.input_handler import topology_loader
+from precicecasegenerate.input_handler.topology_reader import TopologyReader
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+examples_directory: Path = test_directory.parent.parent / "examples"
+
+
+@pytest.mark.parametrize("topology_file", sorted(examples_directory.glob("*/topology.yaml")),
+                         ids=lambda path: path.parent.name)
+def test_yaml_matches_ruamel(topology_file: Path):
+    """
+    Test that the topologies of all examples are parsed exactly like ruamel.yaml parses them.
+    """
+    expected: dict = YAML(typ="safe").load(topology_file.read_text())
+    assert topology_loader.load_topology(topology_file) == expected
+    assert topology_loader.load_topology(topology_str=topology_file.read_text()) == expected
+
+
+def test_yaml_scalar_types():
+    """
+    Test that scalars are resolved following YAML 1.2 like ruamel.yaml, e.g., that "no" and "on" are strings.
+    """
+    topology_str: str = ("values: [yes, no, on, Off, 012, 0o17, 0x1f, 0b11, 1:30, 1_000, ~, 1.5, 1e-2, .inf, "
+                         "2001-12-14, true, '3', +12]\n")
+    assert topology_loader.load_topology(topology_str=topology_str) == YAML(typ="safe").load(topology_str)
+
+
+def test_yaml_with_multiple_documents():
+    """
+    Test that a topology with more than one document is rejected, like ruamel.yaml does.
+    """
+    with pytest.raises(Exception):
+        topology_loader.load_topology(topology_str="participants: []\n---\nexchanges: []\n")
+
+
+# Both YAML parsers, where libyaml is only used if PyYAML is installed with it
+YAML_PARSERS: list = [
+    pytest.param(True, id="libyaml",
+                 marks=pytest.mark.skipif(not topology_loader.HAS_LIBYAML, reason="libyaml is not installed")),
+    pytest.param(False, id="ruamel"),
+]
+
+
+@pytest.mark.parametrize("use_libyaml", YAML_PARSERS)
+@pytest.mark.parametrize("topology_str", [
+    "participants: []\nexchanges: []\nparticipants: []\n",
+    "participants:\n  - name: A\n    solver: S\n    name: B\nexchanges: []\n",
+], ids=["top_level", "nested"])
+def test_yaml_with_duplicate_keys(topology_str: str, use_libyaml: bool, monkeypatch):
+    """
+    Test that duplicate keys are rejected at the top level and in nested mappings with the same error by both parsers.
+    """
+    monkeypatch.setattr(topology_loader, "HAS_LIBYAML", use_libyaml)
+    with pytest.raises(topology_loader.TopologyLoadError, match="duplicate key"):
+        topology_loader.load_topology(topology_str=topology_str)
+
+
+@pytest.mark.parametrize("use_libyaml", YAML_PARSERS)
+@pytest.mark.parametrize("topology_str", [
+    "participants: []\nexchanges: []\nparticipants: []\n",
+    "participants: [\nexchanges: []\n",
+], ids=["duplicate_key", "invalid_yaml"])
+def test_unparsable_topology_is_reported(topology_str: str, use_libyaml: bool, monkeypatch, caplog):
+    """
+    Test that a topology that cannot be parsed is reported as an error by the reader instead of raising an exception.
+    """
+    monkeypatch.setattr(topology_loader, "HAS_LIBYAML", use_libyaml)
+    topology_reader: TopologyReader = TopologyReader(topology_str=topology_str)
+    assert topology_reader.validate_topology() == 1
+    assert "could not be parsed" in caplog.text
+    assert generate_case_files(topology_str) is None, "A case was generated from an unparsable topology."
+
+
+def test_yaml_merge_keys_may_be_overridden():
+    """
+    Test that keys of a merged mapping may be overridden without being rejected as duplicate keys.
+    """
+    topology_str: str = "base: &base {name: A, solver: S}\nparticipant: {<<: *base, name: B}\n"
+    assert topology_loader.load_topology(topology_str=topology_str) == YAML(typ="safe").load(topology_str)
+
+
+def test_json_topology(tmp_path: Path):
+    """
+    Test that a topology given as JSON results in the same case as the same topology given as YAML.
+    """
+    topology_file: Path = examples_directory / "tutorial2" / "topology.yaml"
+    topology: dict = YAML(typ="safe").load(topology_file.read_text())
+    json_file: Path = tmp_path / "topology.json"
+    json_file.write_text(json.dumps(topology))
+
+    assert TopologyReader(json_file).get_topology() == TopologyReader(topology_file).get_topology()
+    assert generate_case_files(json_file.read_text()) == generate_case_files(topology_file.read_text())
+
+
+def test_yaml_flow_mapping():
+    """
+    Test that a string starting like JSON, but only being valid YAML, is parsed as YAML.
+    """
+    assert topology_loader.load_topology(topology_str="{participants: [], exchanges: []}") == {
+        "participants": [], "exchanges": []}
@@ -1,5 +1,13 @@
+import logging
+from pathlib import Path
 from ruamel.yaml import YAML
 
+from precicecasegenerate.input_handler.topology_reader import TopologyReader, get_topology_validator
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+
+
 def test_scientific_notation_parsing():
     """
     Test that YAML scientific notation (e.g., 1e-2) is parsed as a float, not a string.
@@ -9,4 +17,27 @@ def test_scientific_notation_parsing():
     parsed_value = yaml.load("1e-2")
 
     assert isinstance(parsed_value, float), "Scientific notation was parsed as a string."
-    assert parsed_value == 0.01
\ No newline at end of file
+    assert parsed_value == 0.01
+
+def test_topology_validator_is_cached():
+    """
+    Test that the topology schema is compiled only once and reused by all topology readers.
+    """
+    assert get_topology_validator() is get_topology_validator(), "The topology validator is rebuilt on every call."
+
+
+def test_all_schema_errors(caplog):
+    """
+    Test that all schema violations of a topology are reported in one pass if requested.
+    """
+    topology_reader: TopologyReader = TopologyReader(test_directory / "invalid_topology" / "topology.yaml")
+
+    with caplog.at_level(logging.CRITICAL):
+        assert topology_reader.validate_topology() == 1, "The invalid topology was accepted."
+    assert len(caplog.records) == 1, "Expected only the most relevant schema error."
+
+    caplog.clear()
+    with caplog.at_level(logging.CRITICAL):
+        assert topology_reader.validate_topology(all_errors=True) == 1, "The invalid topology was accepted."
+    # B has no solver and the exchange has an unknown type
+    assert len(caplog.records) == 2, f"Expected two schema errors, found {len(caplog.records)}."
@@ -1,9 +1,11 @@
 """
 This file tests that the preprocessing works as expected.
 """
+import tempfile
 from pathlib import Path
 
 from precicecasegenerate.cli import generate_case
+from precicecasegenerate.file_creators.case_writer import LOCK_FILE_NAME, MANIFEST_FILE_NAME
 
 # This directory is the same for all tests in this file.
 test_directory: Path = Path(__file__).parent
@@ -47,3 +49,15 @@ def test_exchange_loop():
     input_file: Path = case_directory / "topology.yaml"
 
     assert 0 != generate_case(input_file, case_directory), "The case generation didn't fail."
+
+
+def test_invalid_topology_leaves_output_untouched():
+    """
+    Test that an invalid topology writes nothing to the output directory, not even the lock file.
+    """
+    input_file: Path = test_directory / "duplicate_exchanges" / "topology.yaml"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_root: Path = Path(temp_dir)
+        assert 0 != generate_case(input_file, output_root), "The case generation didn't fail."
+        assert not (output_root / LOCK_FILE_NAME).exists(), "The lock file was left behind."
+        assert not (output_root / MANIFEST_FILE_NAME).exists(), "A manifest was written."
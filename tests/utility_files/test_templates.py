@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from precicecasegenerate.benchmark.synthetic_topology import generate_topology, topology_to_yaml
+from precicecasegenerate.cli import generate_case_files
+from precicecasegenerate.file_creators import utility_file_creator
+
+test_directory: Path = Path(__file__).parent
+templates_directory: Path = test_directory.parent.parent / "precicecasegenerate" / "templates"
+
+
+def test_templates_are_read_once():
+    """
+    Check that the templates are only read once, no matter how many participants and cases are generated,
+    and that every run.sh and clean.sh has the content of its template.
+    """
+    topology_str: str = topology_to_yaml(generate_topology(50, 100))
+    utility_file_creator.get_template.cache_clear()
+    for _ in range(2):
+        case_files: dict[str, bytes] = generate_case_files(topology_str)
+        assert case_files is not None
+
+        run_files: list[str] = [path for path in case_files if path.endswith("/run.sh")]
+        # Every participant that takes part in an exchange gets a directory with an adapter config and a run file
+        participant_count: int = sum(path.endswith("/adapter-config.json") for path in case_files)
+        assert len(run_files) == participant_count > 1, (f"Found {len(run_files)} run files, "
+                                                         f"expected {participant_count}.")
+        run_template: bytes = (templates_directory / "run.sh").read_bytes()
+        assert all(case_files[path] == run_template for path in run_files)
+        assert case_files["clean.sh"] == (templates_directory / "clean.sh").read_bytes()
+
+    cache_info = utility_file_creator.get_template.cache_info()
+    assert cache_info.misses == 2, f"Templates were read {cache_info.misses} times, expected 2."
@@ -0,0 +1,99 @@
+"""
+This file tests that watch mode detects changes of the topology file and regenerates the case incrementally.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from precicecasegenerate.cli import generate_case
+from precicecasegenerate.file_creators.case_writer import MANIFEST_FILE_NAME, LOCK_FILE_NAME
+from precicecasegenerate.watch import InotifyFileWatcher, PollingFileWatcher, TopologyWatcher
+
+# This directory is the same for all tests in this file.
+test_directory: Path = Path(__file__).parent
+full_topology: Path = test_directory.parent.parent / "examples" / "tutorial2" / "topology.yaml"
+reduced_topology: Path = test_directory.parent / "incremental_generation" / "reduced_topology" / "topology.yaml"
+
+
+def _read_files(directory: Path) -> dict[str, bytes]:
+    """
+    Return the content of all generated files in the given directory.
+    :param directory: The directory to read.
+    :return: A dict mapping relative file paths to their content.
+    """
+    return {path.relative_to(directory).as_posix(): path.read_bytes() for path in directory.rglob("*")
+            if path.is_file() and path.name not in [MANIFEST_FILE_NAME, LOCK_FILE_NAME]}
+
+
+def _replace_file(file_path: Path, content: bytes) -> None:
+    """
+    Replace the given file with the given content, like an editor saving the file.
+    :param file_path: The path to the file.
+    :param content: The new content of the file.
+    :return: None
+    """
+    temp_path: Path = file_path.with_name(file_path.name + ".swp")
+    temp_path.write_bytes(content)
+    os.replace(temp_path, file_path)
+
+
+@pytest.mark.parametrize("watcher_class", [
+    PollingFileWatcher,
+    pytest.param(InotifyFileWatcher, marks=pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                                               reason="inotify is only available on Linux")),
+])
+def test_file_watcher_detects_changes(watcher_class):
+    """
+    Test that a file watcher reports a replaced file, but ignores other files in the same directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        topology_file: Path = Path(temp_dir) / "topology.yaml"
+        topology_file.write_bytes(full_topology.read_bytes())
+        file_watcher = watcher_class(topology_file) if watcher_class is InotifyFileWatcher else watcher_class(
+            topology_file, poll_interval=0.01)
+        try:
+            assert not file_watcher.wait(0.05), "A change was reported without changing the file."
+            (Path(temp_dir) / "other.yaml").write_text("other")
+            assert not file_watcher.wait(0.05), "A change of another file was reported."
+            _replace_file(topology_file, reduced_topology.read_bytes())
+            assert file_watcher.wait(5), "The change of the file was not reported."
+        finally:
+            file_watcher.close()
+
+
+def test_regenerate_only_changed_topologies():
+    """
+    Test that a case is only regenerated if the content of the topology changed, that it then equals a freshly
+    generated case and that an invalid topology keeps the previous case.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        topology_file: Path = Path(temp_dir) / "topology.yaml"
+        output_root: Path = Path(temp_dir) / "watched"
+        reference_root: Path = Path(temp_dir) / "reference"
+        topology_file.write_bytes(full_topology.read_bytes())
+        watcher: TopologyWatcher = TopologyWatcher(topology_file, output_root)
+
+        assert watcher.regenerate() == 0
+        assert generate_case(full_topology, reference_root) == 0
+        assert _read_files(output_root) == _read_files(reference_root)
+
+        # Saving the file without changes does not regenerate the case
+        modification_time: int = (output_root / "precice-config.xml").stat().st_mtime_ns
+        _replace_file(topology_file, full_topology.read_bytes())
+        assert watcher.regenerate() == 0
+        assert watcher.regenerations == 1, "The case was regenerated from an unchanged topology."
+        assert (output_root / "precice-config.xml").stat().st_mtime_ns == modification_time
+
+        _replace_file(topology_file, reduced_topology.read_bytes())
+        assert watcher.regenerate() == 0
+        shutil.rmtree(reference_root)
+        assert generate_case(reduced_topology, reference_root) == 0
+        assert _read_files(output_root) == _read_files(reference_root)
+
+        _replace_file(topology_file, b"participants: [")
+        assert watcher.regenerate() == 1, "An invalid topology was accepted."
+        assert _read_files(output_root) == _read_files(reference_root), "The previous case was not kept."